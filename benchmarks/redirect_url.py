@@ -0,0 +1,97 @@
+"""
+Compare the former SequenceMatcher based URL rewriting of proxied requests
+with stripping the browser workspace from the requested path.
+
+Run with
+
+    python -m benchmarks.redirect_url [--depth 20] [--requests 20000]
+
+The workspace is nested depth directories deep,
+every request asks for a broadway asset within it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from difflib import SequenceMatcher
+from typing import Callable
+
+from ocrdbrowser import OcrdBrowser, OcrdBrowserClient
+from ocrdmonitor.server.workspaces._browsercommunication import _get_redirect_url
+
+WORKSPACE_DIR = "/data/workspaces"
+ASSET = "/static/broadway.js"
+
+RedirectUrl = Callable[[OcrdBrowser, str], str]
+
+
+class WorkspaceBrowser:
+    """A browser that only knows its workspace, all URL rewriting looks at"""
+
+    def __init__(self, workspace: str) -> None:
+        self._workspace = workspace
+
+    def process_id(self) -> str:
+        return "0"
+
+    def address(self) -> str:
+        return "http://localhost:8080"
+
+    def owner(self) -> str:
+        return "owner"
+
+    def workspace(self) -> str:
+        return self._workspace
+
+    def client(self) -> OcrdBrowserClient:
+        raise NotImplementedError("the benchmark does not talk to the browser")
+
+    async def stop(self) -> None:
+        pass
+
+
+def sequence_matcher(browser: OcrdBrowser, partial_workspace: str) -> str:
+    """The URL rewriting as implemented before, given the path below WORKSPACE_DIR"""
+    matcher = SequenceMatcher(None, browser.workspace(), partial_workspace)
+    match = matcher.find_longest_match()
+    return partial_workspace[match.size :]
+
+
+def seconds_per_request(
+    redirect_url: RedirectUrl, browser: OcrdBrowser, path: str, n: int
+) -> float:
+    start = time.perf_counter()
+    for _ in range(n):
+        redirect_url(browser, path)
+
+    return (time.perf_counter() - start) / n
+
+
+def main(depth: int, requests: int) -> None:
+    partial_workspace = "/".join(
+        f"batch {i:03d} of the nightly run" for i in range(depth)
+    )
+    browser = WorkspaceBrowser(f"{WORKSPACE_DIR}/{partial_workspace}")
+    candidates: list[tuple[str, RedirectUrl, str]] = [
+        ("SequenceMatcher", sequence_matcher, partial_workspace + ASSET),
+        ("prefix", _get_redirect_url, browser.workspace() + ASSET),
+    ]
+
+    print(f"workspace path of {len(browser.workspace())} characters")
+    for name, redirect_url, path in candidates:
+        # difflib's autojunk heuristic spoils the former match for paths over 200 chars
+        correct = redirect_url(browser, path) == ASSET
+        seconds = seconds_per_request(redirect_url, browser, path, requests)
+        print(
+            f"{name:>16}: {seconds * 1e6:.2f}us per request, "
+            + ("correct" if correct else "WRONG URL")
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--depth", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+    main(args.depth, args.requests)
@@ -0,0 +1,102 @@
+"""
+Compare the full-duplex WebSocket tunnel against the former 1 ms polling loop.
+
+Run with
+
+    python -m benchmarks.tunnel [--sessions 40] [--seconds 3] [--frames 2000]
+
+For idle sessions the CPU time consumed by the event loop is reported,
+for busy sessions the latency of a frame travelling from browser to client.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Callable, Coroutine
+
+from ocrdbrowser import Channel
+from ocrdmonitor.server.workspaces._browsercommunication import _tunnel
+
+Tunnel = Callable[[Channel, Channel], Coroutine[Any, Any, None]]
+
+
+async def polling_tunnel(source: Channel, target: Channel) -> None:
+    """The tunnel as implemented before, alternating directions every millisecond"""
+
+    async def one_way(source: Channel, target: Channel) -> None:
+        try:
+            data = await asyncio.wait_for(source.receive_bytes(), 0.001)
+            await target.send_bytes(data)
+        except asyncio.TimeoutError:
+            pass
+
+    while True:
+        await one_way(source, target)
+        await one_way(target, source)
+
+
+class QueueChannel:
+    def __init__(self) -> None:
+        self.inbox: asyncio.Queue[bytes] = asyncio.Queue()
+        self.outbox: asyncio.Queue[bytes] = asyncio.Queue()
+
+    async def receive_bytes(self) -> bytes:
+        return await self.inbox.get()
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.outbox.put(data)
+
+
+async def idle_cpu_seconds(tunnel: Tunnel, sessions: int, seconds: float) -> float:
+    tasks = [
+        asyncio.create_task(tunnel(QueueChannel(), QueueChannel()))
+        for _ in range(sessions)
+    ]
+
+    start = time.process_time()
+    await asyncio.sleep(seconds)
+    elapsed = time.process_time() - start
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return elapsed
+
+
+async def frame_latencies(tunnel: Tunnel, frames: int) -> list[float]:
+    browser, client = QueueChannel(), QueueChannel()
+    task = asyncio.create_task(tunnel(browser, client))
+
+    latencies = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        browser.inbox.put_nowait(b"frame")
+        await client.outbox.get()
+        latencies.append(time.perf_counter() - start)
+
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+    return latencies
+
+
+async def main(sessions: int, seconds: float, frames: int) -> None:
+    for name, tunnel in (("polling", polling_tunnel), ("full-duplex", _tunnel)):
+        cpu = await idle_cpu_seconds(tunnel, sessions, seconds)
+        latencies = sorted(await frame_latencies(tunnel, frames))
+        p99 = latencies[int(len(latencies) * 0.99) - 1]
+        print(
+            f"{name:>12}: idle CPU {cpu:.3f}s for {sessions} sessions in {seconds}s, "
+            + f"frame latency mean {statistics.mean(latencies) * 1e6:.0f}us "
+            + f"p99 {p99 * 1e6:.0f}us"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=40)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--frames", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.sessions, args.seconds, args.frames))
@@ -0,0 +1,76 @@
+"""
+Compare the workspace discovery of the former rglob scan with WorkspaceWalker.
+
+Run with
+
+    python -m benchmarks.workspace_walk [--workspaces 50000] [--root DIR]
+
+Without --root a synthetic tree with the given number of workspaces
+(each holding a few file group directories) is generated in a temporary directory.
+Pass --root to benchmark an existing tree instead, e.g. on a network file system.
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable
+
+from ocrdbrowser._walk import WorkspaceWalker
+
+FILE_GROUPS = ("OCR-D-IMG", "OCR-D-SEG-LINE", "OCR-D-OCR")
+
+
+def generate_tree(root: Path, workspaces: int) -> None:
+    for i in range(workspaces):
+        workspace = root / f"batch-{i // 1000:03d}" / f"workspace-{i:06d}"
+        for group in FILE_GROUPS:
+            (workspace / group).mkdir(parents=True)
+            (workspace / group / "page_0001.xml").touch()
+        (workspace / "mets.xml").touch()
+
+        if i % 100 == 0:
+            backup = workspace / ".backup" / "previous"
+            backup.mkdir(parents=True)
+            (backup / "mets.xml").touch()
+
+
+def rglob(root: Path) -> list[str]:
+    return [
+        str(workspace.parent)
+        for workspace in root.rglob("mets.xml")
+        if not workspace.match(".backup/*/mets.xml")
+    ]
+
+
+def measure(name: str, scan: Callable[[], list[str]]) -> None:
+    start = time.perf_counter()
+    found = scan()
+    elapsed = time.perf_counter() - start
+    print(f"{name:>24}: {len(found)} workspaces in {elapsed:.2f}s")
+
+
+def main(root: Path) -> None:
+    measure("rglob", lambda: rglob(root))
+    measure("walker (serial)", lambda: WorkspaceWalker(workers=1).walk(str(root)))
+    for workers in (4, 16):
+        measure(
+            f"walker ({workers} threads)",
+            lambda: WorkspaceWalker(workers=workers).walk(str(root)),
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workspaces", type=int, default=50000)
+    parser.add_argument("--root", type=Path, default=None)
+    args = parser.parse_args()
+
+    if args.root is not None:
+        main(args.root)
+    else:
+        with tempfile.TemporaryDirectory() as tmpdir:
+            print(f"Generating {args.workspaces} workspaces in {tmpdir}")
+            generate_tree(Path(tmpdir), args.workspaces)
+            main(Path(tmpdir))
@@ -1,27 +1,65 @@
 from . import _workspace as workspace
+from ._assets import BroadwayAssetCache, CachedAsset
 from ._browser import (
     Channel,
     ChannelClosed,
+    HibernatingBrowser,
+    LivenessCheckingBrowser,
     OcrdBrowser,
     OcrdBrowserClient,
     OcrdBrowserFactory,
+    OcrdBrowserResponse,
+    PlacedBrowser,
+    PortLeasingBrowserFactory,
+    PrewarmingBrowserFactory,
 )
-from ._client import HttpBrowserClient
+from ._broadwaypool import BroadwayDaemon, BroadwayPool
+from ._client import HttpBrowserClient, HttpClientPool, client_pool
 from ._docker import DockerOcrdBrowser, DockerOcrdBrowserFactory
-from ._port import NoPortsAvailableError
+from ._dockerapi import DockerApiError, DockerEngineClient, docker_engine
+from ._mets import MetsSummary, MetsSummaryCache, summary_cache
+from ._multihost import BrowserHost, MultiHostBrowserFactory
+from ._port import NoPortsAvailableError, PortAllocator
+from ._readiness import BrowserNotReadyError, LaunchTimes, launch_times
 from ._subprocess import SubProcessOcrdBrowser, SubProcessOcrdBrowserFactory
+from ._walk import WorkspaceWalker
 
 __all__ = [
+    "BroadwayAssetCache",
+    "BroadwayDaemon",
+    "BroadwayPool",
+    "BrowserHost",
+    "BrowserNotReadyError",
+    "CachedAsset",
     "Channel",
     "ChannelClosed",
+    "DockerApiError",
+    "DockerEngineClient",
     "DockerOcrdBrowser",
     "DockerOcrdBrowserFactory",
+    "HibernatingBrowser",
     "HttpBrowserClient",
+    "HttpClientPool",
+    "LaunchTimes",
+    "LivenessCheckingBrowser",
+    "MetsSummary",
+    "MetsSummaryCache",
+    "MultiHostBrowserFactory",
     "NoPortsAvailableError",
     "OcrdBrowser",
     "OcrdBrowserClient",
     "OcrdBrowserFactory",
+    "OcrdBrowserResponse",
+    "PlacedBrowser",
+    "PortAllocator",
+    "PortLeasingBrowserFactory",
+    "PrewarmingBrowserFactory",
     "SubProcessOcrdBrowser",
     "SubProcessOcrdBrowserFactory",
+    "WorkspaceWalker",
+    "client_pool",
+    "docker_engine",
+    "launch_times",
+    "summary_cache",
     "workspace",
 ]
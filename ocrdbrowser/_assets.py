@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import hashlib
+from collections import OrderedDict
+from typing import Collection, NamedTuple
+
+# broadwayd serves the same client files for every display,
+# so they can be shared across all browser sessions
+BROADWAY_ASSETS = ("/", "/client.html", "/broadway.js", "/broadway.css")
+
+
+class CachedAsset(NamedTuple):
+    content: bytes
+    media_type: str
+    etag: str
+
+
+class BroadwayAssetCache:
+    """
+    Size-bounded LRU cache for the static broadway client files.
+    Entries are stored by the digest of their content, so identical files
+    requested under different paths or from different browsers are kept once.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 4 * 1024 * 1024,
+        assets: Collection[str] = BROADWAY_ASSETS,
+    ) -> None:
+        self._max_size = max_size
+        self._assets = frozenset(assets)
+        self._paths: dict[str, str] = {}
+        self._blobs: OrderedDict[str, CachedAsset] = OrderedDict()
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def is_cacheable(self, resource: str) -> bool:
+        return _normalize(resource) in self._assets
+
+    def lookup(self, resource: str) -> CachedAsset | None:
+        digest = self._paths.get(_normalize(resource))
+        if digest is None or digest not in self._blobs:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._blobs.move_to_end(digest)
+        return self._blobs[digest]
+
+    def store(self, resource: str, content: bytes, media_type: str) -> CachedAsset:
+        digest = hashlib.sha256(content).hexdigest()
+        asset = self._blobs.get(digest)
+        if asset is None:
+            asset = CachedAsset(content, media_type, f'"{digest}"')
+
+        if len(content) <= self._max_size:
+            self._paths[_normalize(resource)] = digest
+            self._insert(digest, asset)
+
+        return asset
+
+    @property
+    def size(self) -> int:
+        return self._size
+
+    def _insert(self, digest: str, asset: CachedAsset) -> None:
+        if digest in self._blobs:
+            self._blobs.move_to_end(digest)
+            return
+
+        self._blobs[digest] = asset
+        self._size += len(asset.content)
+        while self._size > self._max_size:
+            self._evict_oldest()
+
+    def _evict_oldest(self) -> None:
+        digest, asset = self._blobs.popitem(last=False)
+        self._size -= len(asset.content)
+        self._paths = {
+            path: blob for path, blob in self._paths.items() if blob != digest
+        }
+
+
+def _normalize(resource: str) -> str:
+    resource = resource.split("?", 1)[0]
+    return "/" + resource.lstrip("/")
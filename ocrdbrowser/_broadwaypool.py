@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, NamedTuple
+
+
+class BroadwayDaemon(NamedTuple):
+    process: asyncio.subprocess.Process
+    port: int
+
+    @property
+    def is_running(self) -> bool:
+        return self.process.returncode is None
+
+    def kill(self) -> None:
+        if self.is_running:
+            self.process.kill()
+
+
+DaemonLauncher = Callable[[], Awaitable[BroadwayDaemon]]
+DaemonDisposer = Callable[[BroadwayDaemon], None]
+
+
+def _kill(daemon: BroadwayDaemon) -> None:
+    daemon.kill()
+
+
+class BroadwayPool:
+    """
+    Idle broadway daemons started ahead of time, so that opening a workspace
+    only has to start browse-ocrd on one of them.
+    Daemons taken from the pool are replaced in the background.
+    """
+
+    def __init__(
+        self, size: int, launch: DaemonLauncher, discard: DaemonDisposer = _kill
+    ) -> None:
+        self._size = size
+        self._launch = launch
+        self._discard = discard
+        self._idle: list[BroadwayDaemon] = []
+        self._filling: asyncio.Task[None] | None = None
+
+    def take(self) -> BroadwayDaemon | None:
+        daemon = None
+        while self._idle and daemon is None:
+            candidate = self._idle.pop()
+            if candidate.is_running:
+                daemon = candidate
+            else:
+                self._discard(candidate)
+
+        self.refill()
+        return daemon
+
+    def ports(self) -> set[int]:
+        return {daemon.port for daemon in self._idle}
+
+    def refill(self) -> None:
+        if self._size > 0 and (self._filling is None or self._filling.done()):
+            self._filling = asyncio.create_task(self._fill())
+
+    async def close(self) -> None:
+        # a daemon being launched cannot be tracked once cancelled,
+        # so we let the current launch finish instead
+        self._size = 0
+        if self._filling is not None:
+            await asyncio.gather(self._filling, return_exceptions=True)
+            self._filling = None
+
+        for daemon in self._idle:
+            self._discard(daemon)
+
+        self._idle = []
+
+    def __len__(self) -> int:
+        return len(self._idle)
+
+    async def _fill(self) -> None:
+        for daemon in self._idle:
+            if not daemon.is_running:
+                self._discard(daemon)
+
+        self._idle = [daemon for daemon in self._idle if daemon.is_running]
+        while len(self._idle) < self._size:
+            try:
+                daemon = await self._launch()
+            except Exception as err:
+                # most likely all ports are taken, we try again on the next take
+                logging.warning(f"Could not prewarm broadway daemon: {err!r}")
+                return
+
+            self._idle.append(daemon)
@@ -1,6 +1,13 @@
 from __future__ import annotations
 
-from typing import AsyncContextManager, Protocol
+from typing import (
+    AsyncContextManager,
+    AsyncIterator,
+    Iterable,
+    Mapping,
+    Protocol,
+    runtime_checkable,
+)
 
 
 class OcrdBrowser(Protocol):
@@ -23,6 +30,35 @@ class OcrdBrowser(Protocol):
         ...
 
 
+@runtime_checkable
+class LivenessCheckingBrowser(OcrdBrowser, Protocol):
+    async def is_alive(self) -> bool:
+        """Cheaply check whether the browser process is still running"""
+        ...
+
+
+@runtime_checkable
+class HibernatingBrowser(OcrdBrowser, Protocol):
+    def is_hibernating(self) -> bool:
+        """Whether the browser processes are currently suspended"""
+        ...
+
+    async def hibernate(self) -> None:
+        """Suspend the browser processes, keeping their state in memory"""
+        ...
+
+    async def resume(self) -> None:
+        """Continue the suspended browser processes"""
+        ...
+
+
+@runtime_checkable
+class PlacedBrowser(OcrdBrowser, Protocol):
+    def host(self) -> str | None:
+        """The browser host the browser was placed on, None for the local one"""
+        ...
+
+
 class ChannelClosed(RuntimeError):
     ...
 
@@ -35,8 +71,33 @@ class Channel(Protocol):
         ...
 
 
+class OcrdBrowserResponse(Protocol):
+    @property
+    def status_code(self) -> int:
+        ...
+
+    @property
+    def headers(self) -> Mapping[str, str]:
+        ...
+
+    def aiter_raw(self) -> AsyncIterator[bytes]:
+        ...
+
+    async def aclose(self) -> None:
+        ...
+
+
 class OcrdBrowserClient(Protocol):
-    async def get(self, resource: str) -> bytes:
+    async def get(self, resource: str, timeout: float | None = None) -> bytes:
+        """Raises ConnectionError if the browser cannot be reached in time"""
+        ...
+
+    async def stream(
+        self,
+        resource: str,
+        method: str = "GET",
+        headers: Mapping[str, str] | None = None,
+    ) -> OcrdBrowserResponse:
         ...
 
     def open_channel(self) -> AsyncContextManager[Channel]:
@@ -46,3 +107,21 @@ class OcrdBrowserClient(Protocol):
 class OcrdBrowserFactory(Protocol):
     async def __call__(self, owner: str, workspace_path: str) -> OcrdBrowser:
         ...
+
+
+@runtime_checkable
+class PrewarmingBrowserFactory(OcrdBrowserFactory, Protocol):
+    def prewarm(self) -> None:
+        """Start filling the pool of idle instances in the background"""
+        ...
+
+    async def close(self) -> None:
+        """Stop all idle instances"""
+        ...
+
+
+@runtime_checkable
+class PortLeasingBrowserFactory(OcrdBrowserFactory, Protocol):
+    def restore_leases(self, browsers: Iterable[OcrdBrowser]) -> None:
+        """Mark the ports of already running browsers as leased"""
+        ...
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-import asyncio 
+import asyncio
 import logging
-
+from concurrent.futures import Future
 from types import TracebackType
-from typing import AsyncContextManager, Type, cast
+from typing import AsyncContextManager, Mapping, Type, cast
 
 import httpx
 from websockets import client
@@ -12,7 +12,7 @@ from websockets.exceptions import ConnectionClosed
 from websockets.legacy.client import WebSocketClientProtocol
 from websockets.typing import Subprotocol
 
-from ._browser import Channel, ChannelClosed
+from ._browser import Channel, ChannelClosed, OcrdBrowserResponse
 
 
 class WebSocketChannel:
@@ -64,28 +64,117 @@ class WebSocketChannel:
             raise ChannelClosed()
 
 
+class HttpClientPool:
+    """
+    Keeps one long-lived httpx client (and thus one keep-alive connection pool)
+    per browser address, so that proxied requests reuse open connections.
+    """
+
+    def __init__(
+        self,
+        limits: httpx.Limits = httpx.Limits(
+            max_connections=10, max_keepalive_connections=5, keepalive_expiry=30
+        ),
+        timeout: httpx.Timeout = httpx.Timeout(10),
+    ) -> None:
+        self._limits = limits
+        self._timeout = timeout
+        self._clients: dict[str, tuple[httpx.AsyncClient, asyncio.AbstractEventLoop]] = {}
+
+    def configure(self, limits: httpx.Limits, timeout: httpx.Timeout) -> None:
+        self._limits = limits
+        self._timeout = timeout
+
+    def client(self, address: str) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client, client_loop = self._clients.get(address, (None, None))
+        if client is not None and client_loop is loop and not client.is_closed:
+            return client
+
+        if client is not None and client_loop is not None and client_loop is not loop:
+            _close_in_loop(client, client_loop)
+
+        # httpx clients are bound to the event loop they were first used in
+        client = httpx.AsyncClient(
+            base_url=address, limits=self._limits, timeout=self._timeout
+        )
+        self._clients[address] = client, loop
+        return client
+
+    async def close(self, address: str) -> None:
+        client, client_loop = self._clients.pop(address, (None, None))
+        if client is None or client_loop is None:
+            return
+
+        if client_loop is asyncio.get_running_loop():
+            await client.aclose()
+            return
+
+        closing = _close_in_loop(client, client_loop)
+        if closing is not None:
+            await asyncio.wrap_future(closing)
+
+    async def close_all(self) -> None:
+        for address in list(self._clients):
+            await self.close(address)
+
+    def __contains__(self, address: str) -> bool:
+        return address in self._clients
+
+
+def _close_in_loop(
+    client: httpx.AsyncClient, loop: asyncio.AbstractEventLoop
+) -> Future[None] | None:
+    # a client can only be closed in the event loop it was used in,
+    # the connections of a closed loop have been dropped with it
+    if loop.is_closed():
+        return None
+
+    return asyncio.run_coroutine_threadsafe(client.aclose(), loop)
+
+
+client_pool = HttpClientPool()
+
+
 class HttpBrowserClient:
-    def __init__(self, address: str) -> None:
+    def __init__(self, address: str, pool: HttpClientPool = client_pool) -> None:
         self.address = address
+        self._pool = pool
 
-    async def get(self, resource: str, retry: bool=True) -> bytes:
-        try:
+    async def get(self, resource: str, timeout: float | None = None) -> bytes:
+        return await self._get(resource, timeout, retry=True)
 
-            async with httpx.AsyncClient(
-                base_url=self.address
-            ) as client:
-                response = await client.get(resource)
-                return response.content
+    async def _get(self, resource: str, timeout: float | None, retry: bool) -> bytes:
+        try:
+            response = await self._pool.client(self.address).get(
+                resource,
+                timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+            )
+            return response.content
         except Exception as ex:
-            logging.info(f"is instance is {isinstance(ex, httpx.RemoteProtocolError)}")
-            logging.info(f"retry value is {retry}")
-            if isinstance(ex, httpx.RemoteProtocolError) and retry :    
-                await asyncio.sleep(10)
-                return await self.get(resource, False)
+            # a kept-alive connection may have been closed by the browser meanwhile,
+            # retrying right away picks a fresh connection
+            if isinstance(ex, httpx.RemoteProtocolError) and retry:
+                return await self._get(resource, timeout, retry=False)
 
             logging.error(f"Tried to connect to {self.address}")
             logging.error(f"Requested resource {resource}")
             raise ConnectionError from ex
 
+    async def stream(
+        self,
+        resource: str,
+        method: str = "GET",
+        headers: Mapping[str, str] | None = None,
+    ) -> OcrdBrowserResponse:
+        client = self._pool.client(self.address)
+        request = client.build_request(method, resource, headers=headers)
+        try:
+            return await client.send(request, stream=True)
+        except httpx.HTTPError as ex:
+            logging.error(f"Tried to connect to {self.address}")
+            logging.error(f"Requested resource {resource}")
+            raise ConnectionError from ex
+
     def open_channel(self) -> AsyncContextManager[Channel]:
         return WebSocketChannel(self.address + "/socket")
@@ -4,34 +4,43 @@ import asyncio
 import functools
 import logging
 import os.path as path
-from typing import Any
+from typing import Iterable
 
-from ._browser import OcrdBrowser, OcrdBrowserClient
-from ._client import HttpBrowserClient
-from ._port import PortBindingError, PortBindingResult, try_bind
-
-_docker_run = "docker run --rm -d --name {} -v {}:/data -p {}:8085 ocrd-browser:latest"
-_docker_stop = "docker stop {}"
-_docker_kill = "docker kill {}"
+import httpx
 
+from ._browser import OcrdBrowser, OcrdBrowserClient
+from ._client import HttpBrowserClient, client_pool
+from ._dockerapi import DockerApiError, DockerEngineClient, docker_engine
+from ._port import PortAllocator, PortBindingError, PortBindingResult
+from ._readiness import BrowserNotReadyError, wait_until_ready
 
-async def run_command(cmd: str, *args: Any) -> asyncio.subprocess.Process:
-    command = cmd.format(*args)
-    return await asyncio.create_subprocess_shell(
-        command,
-        stdout=asyncio.subprocess.PIPE,
-        stderr=asyncio.subprocess.PIPE,
-    )
+IMAGE = "ocrd-browser:latest"
+BROWSER_PORT = 8085
+# the browser holds no state worth shutting down gracefully for
+STOP_TIMEOUT = 1
 
 
 class DockerOcrdBrowser:
     def __init__(
-        self, owner: str, workspace: str, address: str, process_id: str
+        self,
+        owner: str,
+        workspace: str,
+        address: str,
+        process_id: str,
+        ports: PortAllocator | None = None,
+        docker: DockerEngineClient = docker_engine,
+        hibernating: bool = False,
+        host: str | None = None,
     ) -> None:
         self._owner = owner
         self._workspace = workspace
         self._address = address
+        self._client = HttpBrowserClient(address)
         self._process_id: str = process_id
+        self._ports = ports
+        self._docker = docker
+        self._hibernating = hibernating
+        self._host = host
 
     def process_id(self) -> str:
         return self._process_id
@@ -45,55 +54,127 @@ class DockerOcrdBrowser:
     def owner(self) -> str:
         return self._owner
 
+    async def is_alive(self) -> bool:
+        try:
+            return await self._docker.is_running(self._process_id)
+        except (DockerApiError, OSError, httpx.HTTPError) as err:
+            logging.warning(f"Could not inspect container {self._process_id}: {err}")
+            return False
+
+    def host(self) -> str | None:
+        return self._host
+
+    def is_hibernating(self) -> bool:
+        return self._hibernating
+
+    async def hibernate(self) -> None:
+        await self._docker.pause(self._process_id)
+        self._hibernating = True
+
+    async def resume(self) -> None:
+        await self._docker.unpause(self._process_id)
+        self._hibernating = False
+
     async def stop(self) -> None:
-        cmd = await run_command(_docker_stop, self._process_id)
+        try:
+            if self._hibernating:
+                # a paused container cannot be stopped gracefully
+                await self.resume()
+
+            await self._docker.stop(self._process_id, STOP_TIMEOUT)
+        except (DockerApiError, OSError, httpx.HTTPError) as err:
+            logging.info(f"Stopping container {self._process_id} failed: {err}")
 
-        if cmd.returncode != 0:
-            logging.info(
-                f"Stopping container {self.process_id} returned exit code {cmd.returncode}"
-            )
+        await client_pool.close(self._address)
+        if self._ports is not None:
+            self._ports.release_address(self._address)
 
     def client(self) -> OcrdBrowserClient:
-        return HttpBrowserClient(self.address())
+        return self._client
 
 
 class DockerOcrdBrowserFactory:
-    def __init__(self, host: str, available_ports: set[int]) -> None:
+    def __init__(
+        self,
+        host: str,
+        available_ports: set[int] | PortAllocator,
+        docker: DockerEngineClient = docker_engine,
+    ) -> None:
         self._host = host
-        self._ports = available_ports
+        self._docker = docker
+        self._ports = (
+            available_ports
+            if isinstance(available_ports, PortAllocator)
+            else PortAllocator(available_ports)
+        )
         self._containers: list[DockerOcrdBrowser] = []
 
     async def __call__(self, owner: str, workspace_path: str) -> OcrdBrowser:
         abs_workspace = path.abspath(workspace_path)
-        port_binding = functools.partial(start_browser, owner, abs_workspace)
-        container, _ = await try_bind(port_binding, self._host, self._ports)
+        port_binding = functools.partial(
+            start_browser,
+            owner,
+            abs_workspace,
+            ports=self._ports,
+            docker=self._docker,
+        )
+        container, _ = await self._ports.bind(port_binding, self._host)
         self._containers.append(container)
         return container
 
-    async def stop_all(self) -> None:
-        running_ids = [c.process_id() for c in self._containers]
-        if running_ids:
-            cmd = await run_command(_docker_kill, " ".join(running_ids))
-            await cmd.wait()
+    def restore_leases(self, browsers: Iterable[OcrdBrowser]) -> None:
+        for browser in browsers:
+            self._ports.reserve_address(browser.address())
 
-        self._containers = []
+    async def stop_all(self) -> None:
+        containers, self._containers = self._containers, []
+        running = await self._docker.running(c.process_id() for c in containers)
+        await asyncio.gather(
+            *(self._docker.kill(container_id) for container_id in running)
+        )
 
 
 async def start_browser(
-    owner: str, workspace: str, host: str, port: int
+    owner: str,
+    workspace: str,
+    host: str,
+    port: int,
+    ports: PortAllocator | None = None,
+    docker: DockerEngineClient = docker_engine,
+    placed_on: str | None = None,
 ) -> PortBindingResult[DockerOcrdBrowser]:
-    cmd = await run_command(
-        _docker_run, container_name(owner, workspace), workspace, port
+    container_id = await docker.create(
+        container_name(owner, workspace),
+        IMAGE,
+        binds={workspace: "/data"},
+        ports={BROWSER_PORT: port},
     )
 
-    return_code = await wait_for(cmd)
-    if return_code != 0:
-        return PortBindingError()
+    try:
+        await docker.start(container_id)
+    except DockerApiError as err:
+        # a container that never started is not removed automatically
+        await docker.remove(container_id)
+        if _is_port_conflict(err):
+            return PortBindingError()
+        raise
 
     container = DockerOcrdBrowser(
-        owner, workspace, f"{host}:{port}", await read_container_id(cmd)
+        owner,
+        workspace,
+        f"{host}:{port}",
+        container_id,
+        ports,
+        docker,
+        host=placed_on,
     )
 
+    try:
+        await wait_until_ready(container.address())
+    except BrowserNotReadyError:
+        await container.stop()
+        raise
+
     return container
 
 
@@ -102,24 +183,6 @@ def container_name(owner: str, workspace: str) -> str:
     return f"ocrd-browser-{owner}-{workspace}"
 
 
-async def wait_for(cmd: asyncio.subprocess.Process) -> int:
-    return_code = await cmd.wait()
-    await log_from_stream(cmd.stderr)
-
-    return return_code
-
-
-async def read_container_id(cmd: asyncio.subprocess.Process) -> str:
-    stdout = cmd.stdout
-    container_id = ""
-    if stdout:
-        container_id = str(await stdout.read()).strip()
-
-    return container_id
-
-
-async def log_from_stream(stream: asyncio.StreamReader | None) -> None:
-    if not stream:
-        return
-
-    logging.info(await stream.read())
+def _is_port_conflict(err: DockerApiError) -> bool:
+    message = err.message.lower()
+    return "port is already allocated" in message or "address already in use" in message
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import Any, Iterable
+from urllib.parse import urlsplit
+
+import httpx
+
+DOCKER_SOCKET = "/var/run/docker.sock"
+API_VERSION = "v1.41"
+
+
+class DockerApiError(RuntimeError):
+    def __init__(self, status_code: int, message: str) -> None:
+        super().__init__(f"Docker API responded with {status_code}: {message}")
+        self.status_code = status_code
+        self.message = message
+
+
+class DockerEngineClient:
+    """
+    Talks to the Docker Engine API over its unix socket (a path or unix:// URL)
+    or over TCP (a tcp:// or http:// URL).
+    One keep-alive connection pool is shared by all requests,
+    so no docker CLI (or shell) has to be spawned per container operation.
+    """
+
+    def __init__(
+        self,
+        endpoint: str = DOCKER_SOCKET,
+        timeout: httpx.Timeout = httpx.Timeout(30),
+    ) -> None:
+        self._endpoint = endpoint
+        self._timeout = timeout
+        self._client: tuple[httpx.AsyncClient, asyncio.AbstractEventLoop] | None = None
+
+    @property
+    def endpoint(self) -> str:
+        return self._endpoint
+
+    def configure(self, endpoint: str) -> None:
+        self._endpoint = endpoint
+
+    async def create(
+        self,
+        name: str,
+        image: str,
+        binds: dict[str, str],
+        ports: dict[int, int],
+        auto_remove: bool = True,
+    ) -> str:
+        """Create a container and return its id, binds map host to container paths"""
+        exposed: dict[str, dict[str, str]] = {f"{c}/tcp": {} for c in ports}
+        config = {
+            "Image": image,
+            "ExposedPorts": exposed,
+            "HostConfig": {
+                "AutoRemove": auto_remove,
+                "Binds": [f"{host}:{container}" for host, container in binds.items()],
+                "PortBindings": {
+                    f"{container}/tcp": [{"HostPort": str(host)}]
+                    for container, host in ports.items()
+                },
+            },
+        }
+        response = await self._request(
+            "POST", "/containers/create", params={"name": name}, json=config
+        )
+        return str(response.json()["Id"])
+
+    async def start(self, container_id: str) -> None:
+        await self._request("POST", f"/containers/{container_id}/start")
+
+    async def stop(self, container_id: str, timeout: int = 10) -> None:
+        """Stop the container, stopping a container that is gone is not an error"""
+        await self._request(
+            "POST",
+            f"/containers/{container_id}/stop",
+            params={"t": str(timeout)},
+            ignore=(404,),
+            # the daemon answers only after the container has stopped
+            timeout=(self._timeout.read or 0.0) + timeout,
+        )
+
+    async def kill(self, container_id: str) -> None:
+        await self._request(
+            "POST", f"/containers/{container_id}/kill", ignore=(404, 409)
+        )
+
+    async def pause(self, container_id: str) -> None:
+        await self._request("POST", f"/containers/{container_id}/pause")
+
+    async def unpause(self, container_id: str) -> None:
+        # unpausing a container that is not paused (anymore) is answered with 409
+        await self._request(
+            "POST", f"/containers/{container_id}/unpause", ignore=(409,)
+        )
+
+    async def remove(self, container_id: str) -> None:
+        await self._request(
+            "DELETE",
+            f"/containers/{container_id}",
+            params={"force": "true"},
+            ignore=(404, 409),
+        )
+
+    async def inspect(self, container_id: str) -> dict[str, Any] | None:
+        response = await self._request(
+            "GET", f"/containers/{container_id}/json", ignore=(404,)
+        )
+        if response.status_code == 404:
+            return None
+
+        return dict(response.json())
+
+    async def is_running(self, container_id: str) -> bool:
+        details = await self.inspect(container_id)
+        return details is not None and bool(details["State"]["Running"])
+
+    async def info(self, timeout: float | None = None) -> dict[str, Any]:
+        response = await self._request("GET", "/info", timeout=timeout)
+        return dict(response.json())
+
+    async def containers(
+        self, filters: dict[str, list[str]] | None = None, all: bool = False
+    ) -> list[dict[str, Any]]:
+        params = {"all": "true" if all else "false"}
+        if filters:
+            params["filters"] = json.dumps(filters)
+
+        response = await self._request("GET", "/containers/json", params=params)
+        return list(response.json())
+
+    async def running(self, container_ids: Iterable[str]) -> set[str]:
+        """The ids out of container_ids whose containers are running, in one request"""
+        ids = list(container_ids)
+        if not ids:
+            return set()
+
+        listed = await self.containers({"id": ids})
+        # the daemon matches id prefixes, so short ids are mapped back
+        full_ids = [str(container["Id"]) for container in listed]
+        return {
+            container_id
+            for container_id in ids
+            if any(full.startswith(container_id) for full in full_ids)
+        }
+
+    async def close(self) -> None:
+        if self._client is None:
+            return
+
+        client, client_loop = self._client
+        self._client = None
+        if client_loop is asyncio.get_running_loop():
+            await client.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        ignore: tuple[int, ...] = (),
+        timeout: float | None = None,
+        **kwargs: Any,
+    ) -> httpx.Response:
+        response = await self._http().request(
+            method,
+            path,
+            timeout=httpx.USE_CLIENT_DEFAULT if timeout is None else timeout,
+            **kwargs,
+        )
+        if response.is_error and response.status_code not in ignore:
+            raise DockerApiError(response.status_code, _error_message(response))
+
+        return response
+
+    def _http(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        if self._client is not None:
+            client, client_loop = self._client
+            if client_loop is loop and not client.is_closed:
+                return client
+
+        # httpx clients are bound to the event loop they were first used in
+        socket = unix_socket(self._endpoint)
+        if socket is not None:
+            transport = httpx.AsyncHTTPTransport(uds=socket)
+            base_url = f"http://docker/{API_VERSION}"
+        else:
+            transport = httpx.AsyncHTTPTransport()
+            base_url = self._endpoint.replace("tcp://", "http://", 1).rstrip("/")
+            base_url = f"{base_url}/{API_VERSION}"
+
+        client = httpx.AsyncClient(
+            transport=transport, base_url=base_url, timeout=self._timeout
+        )
+        self._client = client, loop
+        return client
+
+
+def unix_socket(endpoint: str) -> str | None:
+    if endpoint.startswith("unix://"):
+        return endpoint[len("unix://") :]
+
+    return None if "://" in endpoint else endpoint
+
+
+def published_address(endpoint: str) -> str:
+    """The address under which ports published by the Docker endpoint are reachable"""
+    if unix_socket(endpoint) is not None:
+        return "http://localhost"
+
+    return f"http://{urlsplit(endpoint).hostname}"
+
+
+def _error_message(response: httpx.Response) -> str:
+    try:
+        return str(response.json()["message"])
+    except (ValueError, KeyError, TypeError):
+        return response.text
+
+
+docker_engine = DockerEngineClient()
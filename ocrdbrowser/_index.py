@@ -0,0 +1,336 @@
+from __future__ import annotations
+
+import gzip
+import json
+import logging
+import os
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Iterable
+
+from ._inotify import (
+    IN_CREATE,
+    IN_DELETE,
+    IN_DELETE_SELF,
+    IN_MOVED_FROM,
+    IN_MOVED_TO,
+    IN_Q_OVERFLOW,
+    InotifyEvent,
+    InotifyWatcher,
+)
+from ._walk import METS, WorkspaceWalker
+
+# inotify does not report changes made by other hosts on network file systems,
+# hence the index is reconciled with a full scan from time to time
+RESCAN_INTERVAL = 600.0
+
+SNAPSHOT_VERSION = 1
+
+WatcherFactory = Callable[[], InotifyWatcher | None]
+
+
+class WorkspaceIndex:
+    """
+    Keeps track of all workspaces (directories containing a mets.xml) below root.
+    The index is built by a single scan and then updated incrementally
+    from inotify events, so listing the workspaces only costs O(result).
+
+    If a snapshot path is given, the index is persisted there together with
+    the modification times of all scanned directories. On start the snapshot
+    is served right away while only changed directories are rescanned
+    in the background.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        rescan_interval: float = RESCAN_INTERVAL,
+        watcher_factory: WatcherFactory = InotifyWatcher.create,
+        walker: WorkspaceWalker | None = None,
+        snapshot: Path | None = None,
+    ) -> None:
+        self._root = str(root)
+        self._rescan_interval = rescan_interval
+        self._watcher_factory = watcher_factory
+        self._walker = walker or WorkspaceWalker()
+        self._snapshot = snapshot
+        self._watcher: InotifyWatcher | None = None
+        self._watch_failed = False
+        self._workspaces: set[str] = set()
+        self._mtimes: dict[str, int] = {}
+        self._sorted: list[str] | None = None
+        self._ready = False
+        self._last_scan = 0.0
+        self._lock = threading.Lock()
+        self._background: threading.Thread | None = None
+
+    def start(self) -> None:
+        """
+        Load the snapshot and validate it in a background thread.
+        Without a usable snapshot the initial scan runs in the background instead.
+        """
+        with self._lock:
+            loaded = self._load_snapshot()
+
+        self._background = threading.Thread(
+            target=self._validate if loaded else self.rescan,
+            name=f"workspace-index {self._root}",
+            daemon=True,
+        )
+        self._background.start()
+
+    def wait(self, timeout: float | None = None) -> None:
+        if self._background is not None:
+            self._background.join(timeout)
+
+    def workspaces(self) -> list[str]:
+        with self._lock:
+            if self._needs_rescan():
+                self._rescan()
+            else:
+                self._apply_events()
+
+            if self._sorted is None:
+                self._sorted = sorted(self._workspaces)
+
+            return list(self._sorted)
+
+    def rescan(self) -> None:
+        with self._lock:
+            self._rescan()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._ready:
+                self._save_snapshot()
+
+            if self._watcher is not None:
+                self._watcher.close()
+                self._watcher = None
+
+    def _needs_rescan(self) -> bool:
+        return (
+            not self._ready
+            or time.monotonic() - self._last_scan > self._rescan_interval
+        )
+
+    def _rescan(self) -> None:
+        self._replace_watcher()
+        self._mtimes = {}
+        self._workspaces = set(self._scan(self._root))
+        self._sorted = None
+        self._mark_scanned()
+
+    def _mark_scanned(self) -> None:
+        self._ready = True
+        self._last_scan = time.monotonic()
+        self._save_snapshot()
+
+    def _replace_watcher(self) -> None:
+        if self._watcher is not None:
+            self._watcher.close()
+
+        self._watcher = self._watcher_factory()
+        self._watch_failed = False
+
+    def _scan(self, directory: str) -> list[str]:
+        workspaces = self._walker.walk(directory, on_directory=self._visit)
+        self._drop_watcher_on_failure()
+        return workspaces
+
+    def _visit(self, directory: str) -> None:
+        self._watch(directory)
+        try:
+            self._mtimes[directory] = os.stat(directory).st_mtime_ns
+        except OSError:
+            pass
+
+    def _watch(self, directory: str) -> None:
+        watcher = self._watcher
+        if watcher is not None and not self._watch_failed:
+            self._watch_failed = not watcher.watch(directory)
+
+    def _drop_watcher_on_failure(self) -> None:
+        if self._watch_failed and self._watcher is not None:
+            # the watch limit has been reached, we fall back to periodic rescans only
+            self._watcher.close()
+            self._watcher = None
+
+    def _apply_events(self) -> None:
+        if self._watcher is None:
+            return
+
+        for event in self._watcher.read_events():
+            if event.mask & IN_Q_OVERFLOW:
+                logging.warning("Workspace watcher lost events, rescanning")
+                self._rescan()
+                return
+
+            self._apply(event)
+
+    def _apply(self, event: InotifyEvent) -> None:
+        added = event.mask & (IN_CREATE | IN_MOVED_TO)
+        removed = event.mask & (IN_DELETE | IN_MOVED_FROM | IN_DELETE_SELF)
+
+        if event.mask & IN_DELETE_SELF:
+            self._remove_tree(event.directory)
+        elif event.is_dir and self._skips(event.directory, event.name):
+            return
+        elif event.is_dir and added:
+            self._add_tree(event.path)
+        elif event.is_dir and removed:
+            self._remove_tree(event.path)
+        elif event.name == METS and added:
+            self._add_workspace(event.directory)
+        elif event.name == METS and removed:
+            self._remove_workspace(event.directory)
+
+    def _skips(self, directory: str, name: str) -> bool:
+        # file groups inside a workspace are not walked, so we ignore them here too
+        in_workspace = self._walker.stops_at_workspace and directory in self._workspaces
+        return in_workspace or self._walker.is_ignored(name)
+
+    def _add_workspace(self, directory: str) -> None:
+        self._workspaces.add(directory)
+        self._sorted = None
+        if self._walker.stops_at_workspace:
+            # the walker does not descend into workspaces, so neither do we
+            self._remove_below(directory)
+
+    def _remove_workspace(self, directory: str) -> None:
+        self._workspaces.discard(directory)
+        self._sorted = None
+        if self._walker.stops_at_workspace:
+            # the directories below have not been scanned while it was a workspace
+            self._add_tree(directory)
+
+    def _add_tree(self, directory: str) -> None:
+        self._workspaces.update(self._scan(directory))
+        self._sorted = None
+
+    def _remove_tree(self, directory: str) -> None:
+        if self._watcher is not None:
+            self._watcher.unwatch_tree(directory)
+
+        self._forget(lambda path: _is_within(directory, path))
+
+    def _remove_below(self, directory: str) -> None:
+        if self._watcher is not None:
+            self._watcher.unwatch_below(directory)
+
+        self._forget(lambda path: _is_below(directory, path))
+
+    def _forget(self, removed: Callable[[str], bool]) -> None:
+        self._workspaces = {path for path in self._workspaces if not removed(path)}
+        self._mtimes = {
+            path: mtime for path, mtime in self._mtimes.items() if not removed(path)
+        }
+        self._sorted = None
+
+    def _validate(self) -> None:
+        with self._lock:
+            self._replace_watcher()
+            recorded = dict(self._mtimes)
+
+        # watching and stat'ing is the slow part, so we do it without the lock,
+        # events happening in the meantime are queued by the watcher
+        changed = [
+            directory
+            for directory, mtime in sorted(recorded.items())
+            if self._has_changed(directory, mtime)
+        ]
+
+        with self._lock:
+            self._drop_watcher_on_failure()
+            children = _children(recorded)
+            for directory in changed:
+                self._revalidate(directory, children[directory])
+
+            logging.info(f"Validated workspace index, {len(changed)} directories changed")
+            self._mark_scanned()
+
+    def _has_changed(self, directory: str, mtime: int) -> bool:
+        self._watch(directory)
+        try:
+            return os.stat(directory).st_mtime_ns != mtime
+        except OSError:
+            return True
+
+    def _revalidate(self, directory: str, known_subdirectories: set[str]) -> None:
+        if not os.path.isdir(directory):
+            self._remove_tree(directory)
+            return
+
+        self._mtimes[directory] = os.stat(directory).st_mtime_ns
+        result = self._walker.scan(directory)
+        if result.is_workspace:
+            self._workspaces.add(directory)
+        else:
+            self._workspaces.discard(directory)
+
+        current_subdirectories = set(result.subdirectories)
+        for subdirectory in known_subdirectories - current_subdirectories:
+            self._remove_tree(subdirectory)
+
+        for subdirectory in current_subdirectories - known_subdirectories:
+            self._add_tree(subdirectory)
+
+        self._sorted = None
+
+    def _load_snapshot(self) -> bool:
+        if self._snapshot is None or not self._snapshot.exists():
+            return False
+
+        try:
+            with gzip.open(self._snapshot, "rt", encoding="utf-8") as file:
+                data = json.load(file)
+        except (OSError, ValueError) as err:
+            logging.warning(f"Could not read workspace index {self._snapshot}: {err}")
+            return False
+
+        if data.get("version") != SNAPSHOT_VERSION or data.get("root") != self._root:
+            return False
+
+        self._workspaces = set(data["workspaces"])
+        self._mtimes = data["directories"]
+        self._sorted = None
+        self._ready = True
+        self._last_scan = time.monotonic()
+        return True
+
+    def _save_snapshot(self) -> None:
+        if self._snapshot is None:
+            return
+
+        data = {
+            "version": SNAPSHOT_VERSION,
+            "root": self._root,
+            "workspaces": sorted(self._workspaces),
+            "directories": self._mtimes,
+        }
+
+        temporary = self._snapshot.with_name(self._snapshot.name + ".tmp")
+        try:
+            with gzip.open(temporary, "wt", encoding="utf-8") as file:
+                json.dump(data, file, separators=(",", ":"))
+            os.replace(temporary, self._snapshot)
+        except OSError as err:
+            logging.warning(f"Could not write workspace index {self._snapshot}: {err}")
+
+
+def _is_within(directory: str, path: str) -> bool:
+    return path == directory or _is_below(directory, path)
+
+
+def _is_below(directory: str, path: str) -> bool:
+    return path.startswith(directory.rstrip(os.sep) + os.sep)
+
+
+def _children(directories: Iterable[str]) -> defaultdict[str, set[str]]:
+    children: defaultdict[str, set[str]] = defaultdict(set)
+    for directory in directories:
+        children[os.path.dirname(directory)].add(directory)
+
+    return children
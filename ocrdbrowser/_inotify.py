@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import logging
+import os
+import struct
+from typing import Iterator, NamedTuple
+
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+
+WATCH_MASK = (
+    IN_CREATE | IN_DELETE | IN_MOVED_FROM | IN_MOVED_TO | IN_DELETE_SELF | IN_ONLYDIR
+)
+
+# running out of watches is the only failure that affects more than one directory,
+# any other error (usually a directory that vanished) is reported by its own event
+LIMIT_ERRORS = (errno.ENOSPC, errno.EMFILE)
+
+_EVENT_HEADER = struct.Struct("iIII")
+
+
+class InotifyEvent(NamedTuple):
+    directory: str
+    name: str
+    mask: int
+
+    @property
+    def is_dir(self) -> bool:
+        return bool(self.mask & IN_ISDIR)
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.directory, self.name)
+
+
+class InotifyWatcher:
+    """
+    Minimal non-blocking binding to the Linux inotify API.
+    Events are only read when polled, so no background thread is needed.
+    The directory of an event is looked up when the event is consumed,
+    so events of directories unwatched in the meantime are dropped.
+    """
+
+    @classmethod
+    def create(cls) -> InotifyWatcher | None:
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            return None
+
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            return None
+
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            logging.warning(f"inotify unavailable: {os.strerror(ctypes.get_errno())}")
+            return None
+
+        return cls(libc, fd)
+
+    def __init__(self, libc: ctypes.CDLL, fd: int) -> None:
+        self._libc = libc
+        self._fd = fd
+        self._directories: dict[int, str] = {}
+        self._descriptors: dict[str, int] = {}
+
+    def watch(self, directory: str) -> bool:
+        """Return False if the watch limit has been reached"""
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), WATCH_MASK
+        )
+        if wd < 0:
+            error = ctypes.get_errno()
+            if error in LIMIT_ERRORS:
+                logging.warning(f"Could not watch {directory}: {os.strerror(error)}")
+                return False
+
+            logging.debug(f"Not watching {directory}: {os.strerror(error)}")
+            return True
+
+        # a moved directory keeps its watch, which now belongs to the new path
+        moved = self._directories.get(wd)
+        if moved is not None and moved != directory:
+            self._descriptors.pop(moved, None)
+
+        # a replaced directory keeps its watch until it is deleted
+        replaced = self._descriptors.get(directory)
+        if replaced is not None and replaced != wd:
+            self._unwatch(directory)
+
+        self._directories[wd] = directory
+        self._descriptors[directory] = wd
+        return True
+
+    def unwatch_tree(self, directory: str) -> None:
+        self._unwatch(directory)
+        self.unwatch_below(directory)
+
+    def unwatch_below(self, directory: str) -> None:
+        prefix = directory.rstrip(os.sep) + os.sep
+        for path in [path for path in self._descriptors if path.startswith(prefix)]:
+            self._unwatch(path)
+
+    def _unwatch(self, directory: str) -> None:
+        wd = self._descriptors.pop(directory, None)
+        if wd is None:
+            return
+
+        self._directories.pop(wd, None)
+        self._libc.inotify_rm_watch(self._fd, wd)
+
+    def read_events(self) -> Iterator[InotifyEvent]:
+        buffers = []
+        while True:
+            try:
+                buffers.append(os.read(self._fd, 64 * 1024))
+            except BlockingIOError:
+                break
+
+        for buffer in buffers:
+            yield from self._parse(buffer)
+
+    def close(self) -> None:
+        os.close(self._fd)
+        self._directories.clear()
+        self._descriptors.clear()
+
+    def __len__(self) -> int:
+        return len(self._directories)
+
+    def _parse(self, buffer: bytes) -> Iterator[InotifyEvent]:
+        offset = 0
+        while offset < len(buffer):
+            wd, mask, _, length = _EVENT_HEADER.unpack_from(buffer, offset)
+            offset += _EVENT_HEADER.size
+            name = os.fsdecode(buffer[offset : offset + length].rstrip(b"\0"))
+            offset += length
+
+            if mask & IN_IGNORED:
+                directory = self._directories.pop(wd, None)
+                if directory is not None and self._descriptors.get(directory) == wd:
+                    del self._descriptors[directory]
+                continue
+
+            directory = self._directories.get(wd, "")
+            if directory or mask & IN_Q_OVERFLOW:
+                yield InotifyEvent(directory, name, mask)
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Iterable, NamedTuple
+
+METS_NS = "{http://www.loc.gov/METS/}"
+FILE_GRP = METS_NS + "fileGrp"
+FILE = METS_NS + "file"
+STRUCT_MAP = METS_NS + "structMap"
+DIV = METS_NS + "div"
+
+MAX_ENTRIES = 10000
+WORKERS = 2
+
+
+class MetsSummary(NamedTuple):
+    pages: int
+    file_groups: dict[str, int]
+
+    @property
+    def files(self) -> int:
+        return sum(self.file_groups.values())
+
+
+def summarize(mets: str) -> MetsSummary:
+    """
+    Count the pages of the physical structure map and the files per file group.
+    The METS file is parsed incrementally and elements are discarded once read,
+    so memory stays flat even for huge documents.
+    """
+    pages = 0
+    file_groups: dict[str, int] = {}
+    group: str | None = None
+    in_physical_map = False
+
+    for event, element in ET.iterparse(mets, events=("start", "end")):
+        tag = element.tag
+        if event == "start":
+            if tag == FILE_GRP:
+                group = element.get("USE", "")
+                file_groups.setdefault(group, 0)
+            elif tag == FILE and group is not None:
+                file_groups[group] += 1
+            elif tag == STRUCT_MAP:
+                in_physical_map = element.get("TYPE") == "PHYSICAL"
+            elif tag == DIV and in_physical_map and element.get("TYPE") == "page":
+                pages += 1
+        else:
+            if tag == FILE_GRP:
+                group = None
+            elif tag == STRUCT_MAP:
+                in_physical_map = False
+            element.clear()
+
+    return MetsSummary(pages, file_groups)
+
+
+class MetsSummaryCache:
+    """
+    Summaries of METS files, cached by modification time.
+
+    Parsing runs in a process pool, so neither the event loop nor other
+    threads are held up by the GIL while large documents are read.
+    A summary requested again while it is still being computed
+    is served from the same job.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES, workers: int = WORKERS) -> None:
+        self._max_entries = max_entries
+        self._workers = workers
+        self._entries: OrderedDict[str, tuple[int, MetsSummary | None]] = OrderedDict()
+        self._pending: dict[str, tuple[int, Future[MetsSummary]]] = {}
+        self._executor: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def configure(self, max_entries: int, workers: int) -> None:
+        self._max_entries = max_entries
+        if workers != self._workers:
+            self.close()
+            self._workers = workers
+
+    async def summaries(
+        self, mets_files: Iterable[str], timeout: float | None = None
+    ) -> dict[str, MetsSummary | None]:
+        """
+        Return the summaries for all METS files that are cached or can be computed
+        within timeout. The others are left out and keep being computed
+        in the background, so they are available with one of the next requests.
+        Files that cannot be read or parsed are reported as None.
+        """
+        mtimes = await asyncio.to_thread(_mtimes, mets_files)
+
+        result: dict[str, MetsSummary | None] = {}
+        waiting: dict[asyncio.Future[MetsSummary], str] = {}
+        for mets, mtime in mtimes.items():
+            if mtime is None:
+                result[mets] = None
+                continue
+
+            cached = self._cached(mets, mtime)
+            if cached is not None:
+                result[mets] = cached[1]
+            else:
+                waiting[asyncio.wrap_future(self._submit(mets, mtime))] = mets
+
+        if waiting:
+            done, still_running = await asyncio.wait(waiting, timeout=timeout)
+            for future in done:
+                result[waiting[future]] = (
+                    None if future.exception() is not None else future.result()
+                )
+            for future in still_running:
+                # failures are logged when stored, nobody is waiting for them here
+                future.add_done_callback(_ignore_result)
+
+        return result
+
+    def close(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _cached(
+        self, mets: str, mtime: int
+    ) -> tuple[int, MetsSummary | None] | None:
+        with self._lock:
+            entry = self._entries.get(mets)
+            if entry is None or entry[0] != mtime:
+                return None
+
+            self._entries.move_to_end(mets)
+            return entry
+
+    def _submit(self, mets: str, mtime: int) -> Future[MetsSummary]:
+        with self._lock:
+            pending = self._pending.get(mets)
+            if pending is not None and pending[0] == mtime:
+                return pending[1]
+
+            future = self._pool().submit(summarize, mets)
+            self._pending[mets] = mtime, future
+
+        future.add_done_callback(lambda f: self._store(mets, mtime, f))
+        return future
+
+    def _store(self, mets: str, mtime: int, future: Future[MetsSummary]) -> None:
+        if future.cancelled():
+            return
+
+        error = future.exception()
+        if error is not None:
+            logging.warning(f"Could not summarize {mets}: {error}")
+
+        with self._lock:
+            if self._pending.get(mets, (None, None))[1] is future:
+                del self._pending[mets]
+
+            self._entries[mets] = mtime, None if error is not None else future.result()
+            self._entries.move_to_end(mets)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # forking a multithreaded server is unsafe, so fresh interpreters are used
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context(
+                "forkserver" if "forkserver" in methods else "spawn"
+            )
+            self._executor = ProcessPoolExecutor(self._workers, mp_context=context)
+
+        return self._executor
+
+
+def _mtimes(mets_files: Iterable[str]) -> dict[str, int | None]:
+    mtimes: dict[str, int | None] = {}
+    for mets in mets_files:
+        try:
+            mtimes[mets] = os.stat(mets).st_mtime_ns
+        except OSError:
+            mtimes[mets] = None
+
+    return mtimes
+
+
+def _ignore_result(future: asyncio.Future[MetsSummary]) -> None:
+    if not future.cancelled():
+        future.exception()
+
+
+summary_cache = MetsSummaryCache()
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import logging
+import os.path as path
+import time
+from typing import Callable, Iterable
+
+import httpx
+
+from ._browser import OcrdBrowser, PlacedBrowser
+from ._docker import DockerOcrdBrowser, start_browser
+from ._dockerapi import DockerApiError, DockerEngineClient, published_address
+from ._port import NoPortsAvailableError, PortAllocator
+
+GIB = 1024**3
+# a host that is down must not hold up every launch
+CONNECT_TIMEOUT = 2.0
+QUERY_TIMEOUT = 5.0
+RETRY_AFTER = 5.0
+MAX_RETRY_AFTER = 300.0
+# containers started by others are only noticed when the host is queried again
+REFRESH_INTERVAL = 30.0
+
+
+class BrowserHost:
+    """
+    A Docker endpoint browsers can be placed on.
+    Every host leases its own ports, published under address.
+
+    Its load is the number of running containers per GiB of memory.
+    Both are queried from the Docker API at most every refresh_interval seconds,
+    so containers started by other monitors or users count as well,
+    and browsers launched in between are added to the queried count.
+
+    A host that cannot be reached is left out until its retry time,
+    which backs off exponentially with every further failure.
+    """
+
+    def __init__(
+        self,
+        endpoint: str,
+        ports: Iterable[int],
+        address: str | None = None,
+        docker: DockerEngineClient | None = None,
+        query_timeout: float = QUERY_TIMEOUT,
+        refresh_interval: float = REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.endpoint = endpoint
+        self.address = address or published_address(endpoint)
+        self.docker = docker or DockerEngineClient(
+            endpoint, httpx.Timeout(30, connect=CONNECT_TIMEOUT)
+        )
+        self.ports = PortAllocator(ports)
+        self.memory: int | None = None
+        self.containers = 0
+        self.query_timeout = query_timeout
+        self.refresh_interval = refresh_interval
+        self.refreshed_at: float | None = None
+        self.failures = 0
+        self.retry_at = 0.0
+        self._clock = clock
+        self._leased_at_refresh = 0
+
+    @property
+    def running(self) -> int:
+        """Containers running when last queried plus browsers launched since"""
+        return max(self.containers + self.ports.leased - self._leased_at_refresh, 0)
+
+    @property
+    def load(self) -> float:
+        """Running containers per GiB of memory, or just running ones if unknown"""
+        if not self.memory:
+            return float(self.running)
+
+        return self.running / (self.memory / GIB)
+
+    @property
+    def is_available(self) -> bool:
+        return self._clock() >= self.retry_at
+
+    @property
+    def needs_refresh(self) -> bool:
+        return (
+            self.refreshed_at is None
+            or self._clock() - self.refreshed_at >= self.refresh_interval
+        )
+
+    async def refresh(self) -> None:
+        info = await self.docker.info(timeout=self.query_timeout)
+        self.memory = int(info.get("MemTotal", 0)) or None
+        self.containers = int(info.get("ContainersRunning", 0))
+        self._leased_at_refresh = self.ports.leased
+        self.refreshed_at = self._clock()
+
+    def mark_unreachable(self) -> None:
+        backoff = min(RETRY_AFTER * 2**self.failures, MAX_RETRY_AFTER)
+        self.failures += 1
+        self.retry_at = self._clock() + backoff
+
+    def mark_reachable(self) -> None:
+        self.failures = 0
+        self.retry_at = 0.0
+
+
+class MultiHostBrowserFactory:
+    """
+    Launches browsers as Docker containers spread over several hosts.
+    Each browser is placed on the host with the lowest load that still has free ports,
+    refreshing the load of hosts not queried recently,
+    hosts that cannot be reached are skipped. The host is recorded with the browser,
+    so restored browsers are stopped and hibernated on the right host.
+    """
+
+    def __init__(self, hosts: Iterable[BrowserHost]) -> None:
+        self._hosts = {host.endpoint: host for host in hosts}
+
+    @property
+    def hosts(self) -> list[BrowserHost]:
+        return list(self._hosts.values())
+
+    async def __call__(self, owner: str, workspace_path: str) -> OcrdBrowser:
+        abs_workspace = path.abspath(workspace_path)
+        for host in await self._by_load():
+            try:
+                browser = await self._launch(host, owner, abs_workspace)
+            except NoPortsAvailableError:
+                continue
+            except (DockerApiError, OSError, httpx.HTTPError) as err:
+                logging.warning(f"Could not launch browser on {host.endpoint}: {err}")
+                # an API error is an answer, anything else means the host is down
+                if not isinstance(err, DockerApiError):
+                    host.mark_unreachable()
+                continue
+
+            host.mark_reachable()
+            return browser
+
+        raise NoPortsAvailableError()
+
+    def restore(
+        self,
+        owner: str,
+        workspace: str,
+        address: str,
+        process_id: str,
+        hibernating: bool = False,
+        host: str | None = None,
+    ) -> OcrdBrowser:
+        placed_on = self._hosts.get(host or "")
+        if placed_on is None:
+            # a host that was removed from the configuration, the browser
+            # cannot be reached anymore and is cleaned up by the health sweep
+            logging.warning(f"Unknown browser host {host} for {workspace}")
+            return DockerOcrdBrowser(
+                owner, workspace, address, process_id, hibernating=hibernating
+            )
+
+        return DockerOcrdBrowser(
+            owner,
+            workspace,
+            address,
+            process_id,
+            placed_on.ports,
+            placed_on.docker,
+            hibernating,
+            placed_on.endpoint,
+        )
+
+    def restore_leases(self, browsers: Iterable[OcrdBrowser]) -> None:
+        for browser in browsers:
+            if not isinstance(browser, PlacedBrowser):
+                continue
+
+            host = self._hosts.get(browser.host() or "")
+            if host is not None:
+                host.ports.reserve_address(browser.address())
+
+    async def _launch(
+        self, host: BrowserHost, owner: str, workspace: str
+    ) -> OcrdBrowser:
+        port_binding = functools.partial(
+            start_browser,
+            owner,
+            workspace,
+            ports=host.ports,
+            docker=host.docker,
+            placed_on=host.endpoint,
+        )
+        container, _ = await host.ports.bind(port_binding, host.address)
+        return container
+
+    async def _by_load(self) -> list[BrowserHost]:
+        candidates = [
+            host
+            for host in self._hosts.values()
+            if host.ports.free > 0 and host.is_available
+        ]
+        stale = [host for host in candidates if host.needs_refresh]
+        refreshed = await asyncio.gather(*(self._refresh(host) for host in stale))
+        unreachable = {host for host, ok in zip(stale, refreshed) if not ok}
+
+        available = [host for host in candidates if host not in unreachable]
+        # sorted is stable, so equally loaded hosts are used in configuration order
+        return sorted(available, key=lambda host: host.load)
+
+    @staticmethod
+    async def _refresh(host: BrowserHost) -> bool:
+        try:
+            await host.refresh()
+        except (DockerApiError, OSError, httpx.HTTPError) as err:
+            logging.warning(f"Could not query browser host {host.endpoint}: {err}")
+            host.mark_unreachable()
+            return False
+
+        host.mark_reachable()
+        return True
@@ -1,6 +1,17 @@
 from __future__ import annotations
+
 import logging
-from typing import Awaitable, Callable, Generic, Iterable, NamedTuple, TypeVar, Union
+from collections import deque
+from typing import (
+    Awaitable,
+    Callable,
+    Generic,
+    Iterable,
+    NamedTuple,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urlsplit
 
 
 class NoPortsAvailableError(RuntimeError):
@@ -23,15 +34,85 @@ class BoundPort(NamedTuple, Generic[T]):
     port: int
 
 
-async def try_bind(
-    binding: PortBinding[T], host: str, ports: Iterable[int]
-) -> BoundPort[T]:
-    for port in ports:
-        result = await binding(host, port)
-        if isinstance(result, PortBindingError):
-            logging.info(f"Port {port} already in use, continuing to next port")
-            continue
+class PortAllocator:
+    """
+    Keeps track of the ports leased to browsers and hands out free ones in O(1).
+
+    Leases are released when a browser stops and can be reserved for browsers
+    restored from the repository. Ports occupied by foreign processes are only
+    detected when binding to them fails, they are put at the end of the queue
+    so they are tried last.
+    """
+
+    def __init__(self, ports: Iterable[int]) -> None:
+        self._ports = frozenset(ports)
+        self._free = deque(sorted(self._ports))
+        self._leased: set[int] = set()
+
+    def lease(self) -> int:
+        while self._free:
+            port = self._free.popleft()
+            # reserved ports stay queued until they come up here
+            if port not in self._leased:
+                self._leased.add(port)
+                return port
+
+        raise NoPortsAvailableError()
+
+    def reserve(self, port: int) -> None:
+        if port in self._ports:
+            self._leased.add(port)
+
+    def release(self, port: int) -> None:
+        if port in self._leased:
+            self._leased.remove(port)
+            self._free.append(port)
+
+    def reserve_address(self, address: str) -> None:
+        port = port_of(address)
+        if port is not None:
+            self.reserve(port)
+
+    def release_address(self, address: str) -> None:
+        port = port_of(address)
+        if port is not None:
+            self.release(port)
+
+    def is_leased(self, port: int) -> bool:
+        return port in self._leased
+
+    @property
+    def free(self) -> int:
+        return len(self._ports) - len(self._leased)
+
+    @property
+    def leased(self) -> int:
+        return len(self._leased)
+
+    async def bind(self, binding: PortBinding[T], host: str) -> BoundPort[T]:
+        """
+        Lease ports until the binding succeeds on one of them.
+        Every free port is tried at most once.
+        """
+        for _ in range(self.free):
+            port = self.lease()
+            try:
+                result = await binding(host, port)
+            except BaseException:
+                self.release(port)
+                raise
+
+            if not isinstance(result, PortBindingError):
+                return BoundPort(result, port)
+
+            logging.info(f"Port {port} is used by another process, trying next port")
+            self.release(port)
+
+        raise NoPortsAvailableError()
 
-        return BoundPort(result, port)
 
-    raise NoPortsAvailableError()
+def port_of(address: str) -> int | None:
+    try:
+        return urlsplit(address if "://" in address else f"//{address}").port
+    except ValueError:
+        return None
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from urllib.parse import urlsplit
+
+import httpx
+
+READY_TIMEOUT = 15.0
+PROBE_TIMEOUT = 1.0
+FIRST_DELAY = 0.02
+MAX_DELAY = 0.5
+
+
+class BrowserNotReadyError(RuntimeError):
+    pass
+
+
+class LaunchTimes:
+    """Launch-to-ready durations of all browsers started by this process"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.last = 0.0
+        self.slowest = 0.0
+
+    def record(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.last = seconds
+        self.slowest = max(self.slowest, seconds)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+launch_times = LaunchTimes()
+
+
+async def wait_until_ready(
+    address: str,
+    process: asyncio.subprocess.Process | None = None,
+    timeout: float = READY_TIMEOUT,
+) -> float:
+    """
+    Poll address with exponential backoff until it answers an HTTP request
+    (with any status) and return the seconds it took.
+    Raises BrowserNotReadyError once the timeout has passed
+    or the given process has exited.
+    """
+    start = time.monotonic()
+    delay = FIRST_DELAY
+    async with httpx.AsyncClient(base_url=address, timeout=PROBE_TIMEOUT) as client:
+        while True:
+            _raise_if_exited(address, process)
+            try:
+                await client.get("/")
+                # the process may have lost the race for the port to another server
+                _raise_if_exited(address, process)
+                elapsed = time.monotonic() - start
+                launch_times.record(elapsed)
+                logging.info(f"Browser at {address} ready after {elapsed:.3f}s")
+                return elapsed
+            except httpx.HTTPError:
+                pass
+
+            remaining = start + timeout - time.monotonic()
+            if remaining <= 0:
+                raise BrowserNotReadyError(f"{address} not ready after {timeout}s")
+
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, MAX_DELAY)
+
+
+async def is_listening(address: str, timeout: float = PROBE_TIMEOUT) -> bool:
+    """Whether something already accepts TCP connections at address"""
+    url = urlsplit(address if "://" in address else f"http://{address}")
+    try:
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(url.hostname, url.port), timeout
+        )
+    except (OSError, asyncio.TimeoutError):
+        return False
+
+    writer.close()
+    return True
+
+
+def _raise_if_exited(
+    address: str, process: asyncio.subprocess.Process | None
+) -> None:
+    if process is not None and process.returncode is not None:
+        raise BrowserNotReadyError(
+            f"Process for {address} exited with code {process.returncode}"
+        )
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
 import asyncio
-import functools
 import logging
 import os
 import signal
 from shutil import which
-from typing import NamedTuple, Type, cast
+from typing import Iterable, NamedTuple, Type, cast
 
+from ._broadwaypool import BroadwayDaemon, BroadwayPool
 from ._browser import OcrdBrowser, OcrdBrowserClient
-from ._client import HttpBrowserClient
-from ._port import PortBindingError, PortBindingResult, try_bind
+from ._client import HttpBrowserClient, client_pool
+from ._port import PortAllocator, PortBindingError, PortBindingResult
+from ._readiness import BrowserNotReadyError, is_listening, wait_until_ready
 
 BROADWAY_BASE_PORT = 8080
 
@@ -30,12 +31,21 @@ class BroadwayBrowserId(NamedTuple):
 
 class SubProcessOcrdBrowser:
     def __init__(
-        self, owner: str, workspace: str, address: str, process_id: str
+        self,
+        owner: str,
+        workspace: str,
+        address: str,
+        process_id: str,
+        ports: PortAllocator | None = None,
+        hibernating: bool = False,
     ) -> None:
         self._owner = owner
         self._workspace = workspace
         self._address = address
+        self._client = HttpBrowserClient(address)
         self._process_id = BroadwayBrowserId.from_str(process_id)
+        self._ports = ports
+        self._hibernating = hibernating
 
     def process_id(self) -> str:
         return str(self._process_id)
@@ -49,19 +59,107 @@ class SubProcessOcrdBrowser:
     def owner(self) -> str:
         return self._owner
 
+    async def is_alive(self) -> bool:
+        return _runs(self._process_id.broadway_pid, b"broadwayd")
+
+    def is_hibernating(self) -> bool:
+        return self._hibernating
+
+    async def hibernate(self) -> None:
+        self._signal(self._process_id.browser_pid, b"browse-ocrd", signal.SIGSTOP)
+        self._signal(self._process_id.broadway_pid, b"broadwayd", signal.SIGSTOP)
+        self._hibernating = True
+
+    async def resume(self) -> None:
+        self._signal(self._process_id.broadway_pid, b"broadwayd", signal.SIGCONT)
+        self._signal(self._process_id.browser_pid, b"browse-ocrd", signal.SIGCONT)
+        self._hibernating = False
+
     async def stop(self) -> None:
-        self._try_kill(self._process_id.broadway_pid)
-        self._try_kill(self._process_id.browser_pid)
+        if self._hibernating:
+            # a stopped browse-ocrd would outlive its killed shell forever
+            await self.resume()
+
+        self._try_kill(self._process_id.broadway_pid, b"broadwayd")
+        self._try_kill(self._process_id.browser_pid, b"browse-ocrd")
+        await client_pool.close(self._address)
+        if self._ports is not None:
+            self._ports.release_address(self._address)
 
     @staticmethod
-    def _try_kill(pid: int) -> None:
+    def _try_kill(pid: int, executable: bytes) -> None:
+        if not _runs(pid, executable):
+            logging.warning(f"Could not find {executable.decode()} with ID {pid}")
+            return
+
         try:
             os.kill(pid, signal.SIGKILL)
         except ProcessLookupError:
             logging.warning(f"Could not find process with ID {pid}")
 
+    @staticmethod
+    def _signal(pid: int, executable: bytes, signum: signal.Signals) -> None:
+        if not _runs(pid, executable):
+            return
+
+        # browse-ocrd runs as a child of the shell we started
+        for member in _process_tree(pid):
+            try:
+                os.kill(member, signum)
+            except ProcessLookupError:
+                pass
+
     def client(self) -> OcrdBrowserClient:
-        return HttpBrowserClient(self.address())
+        return self._client
+
+
+def _process_tree(pid: int) -> list[int]:
+    """pid and all of its descendants, or just pid if /proc cannot be read"""
+    children: dict[int, list[int]] = {}
+    try:
+        entries = os.listdir("/proc")
+    except OSError:
+        return [pid]
+
+    for entry in entries:
+        if not entry.isdigit():
+            continue
+
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as stat:
+                # the command name may contain spaces, the parent pid follows it
+                parent = int(stat.read().rpartition(b")")[2].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+
+        children.setdefault(parent, []).append(int(entry))
+
+    tree = [pid]
+    for member in tree:
+        tree.extend(children.get(member, []))
+
+    return tree
+
+
+def _runs(pid: int, executable: bytes) -> bool:
+    # pids are reused, e.g. after a reboot, so we check the command line if we can
+    if os.path.isdir("/proc"):
+        try:
+            with open(f"/proc/{pid}/cmdline", "rb") as cmdline:
+                return executable in cmdline.read()
+        except FileNotFoundError:
+            return False
+        except OSError:
+            pass
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+
+    return True
 
 
 class ProcessLaunchFailedError(RuntimeError):
@@ -69,49 +167,81 @@ class ProcessLaunchFailedError(RuntimeError):
 
 
 class SubProcessOcrdBrowserFactory:
-    def __init__(self, available_ports: set[int]) -> None:
-        self._available_ports = available_ports
+    """
+    Launches a broadwayd daemon and a browse-ocrd process per browser.
+    With a pool size above zero, idle daemons are started ahead of time
+    and browse-ocrd is attached to one of them when a workspace is opened.
+    """
+
+    def __init__(
+        self, available_ports: set[int] | PortAllocator, pool_size: int = 0
+    ) -> None:
+        self._ports = (
+            available_ports
+            if isinstance(available_ports, PortAllocator)
+            else PortAllocator(available_ports)
+        )
+        self._pool = BroadwayPool(pool_size, self._launch_daemon, self._discard)
 
     async def __call__(self, owner: str, workspace_path: str) -> OcrdBrowser:
-        port_binding = functools.partial(start_browser, workspace_path)
-        pid, port = await try_bind(
-            port_binding, "http://localhost", self._available_ports
+        daemon = self._pool.take() or await self._launch_daemon()
+        try:
+            pid = await attach_browser(workspace_path, daemon)
+        except Exception:
+            self._discard(daemon)
+            raise
+
+        address = f"http://localhost:{daemon.port}"
+        return SubProcessOcrdBrowser(
+            owner, workspace_path, address, str(pid), self._ports
         )
 
-        address = f"http://localhost:{port}"
-        return SubProcessOcrdBrowser(owner, workspace_path, address, str(pid))
+    def restore_leases(self, browsers: Iterable[OcrdBrowser]) -> None:
+        for browser in browsers:
+            self._ports.reserve_address(browser.address())
+
+    def prewarm(self) -> None:
+        self._pool.refill()
+
+    async def close(self) -> None:
+        await self._pool.close()
 
+    async def _launch_daemon(self) -> BroadwayDaemon:
+        find_executables_or_raise()
+        daemon, _ = await self._ports.bind(start_broadway, "http://localhost")
+        return daemon
 
-async def start_browser(
-    workspace: str, host: str, port: int
-) -> PortBindingResult[BroadwayBrowserId]:
-    find_executables_or_raise()
+    def _discard(self, daemon: BroadwayDaemon) -> None:
+        daemon.kill()
+        self._ports.release(daemon.port)
 
+
+async def start_broadway(host: str, port: int) -> PortBindingResult[BroadwayDaemon]:
     # broadwayd (which uses WebSockets) only allows a single client at a time
     # (disconnecting concurrent connections), hence we must start a new daemon
     # for each new browser session
-    # broadwayd starts counting virtual X displays from port 8080 as :0
-    displayport = str(port - BROADWAY_BASE_PORT)
-
     try:
-        broadway_process = await launch_broadway(displayport)
+        broadway_process = await launch_broadway(port)
 
         if broadway_process is None:
             return PortBindingError()
 
-        environment = prepare_env(displayport)
-        full_cmd = browser_command(workspace, broadway_process.pid)
-        browser_process = await asyncio.create_subprocess_shell(
-            full_cmd, env=environment
-        )
-
-        return BroadwayBrowserId(broadway_process.pid, browser_process.pid)
+        return BroadwayDaemon(broadway_process, port)
     except Exception as err:
         logging.error(f"Failed to launch broadway at (real port {port})")
         logging.error(repr(err))
         return PortBindingError()
 
 
+async def attach_browser(workspace: str, daemon: BroadwayDaemon) -> BroadwayBrowserId:
+    displayport = str(daemon.port - BROADWAY_BASE_PORT)
+    environment = prepare_env(displayport)
+    full_cmd = browser_command(workspace, daemon.process.pid)
+    browser_process = await asyncio.create_subprocess_shell(full_cmd, env=environment)
+
+    return BroadwayBrowserId(daemon.process.pid, browser_process.pid)
+
+
 def find_executables_or_raise() -> None:
     if not which("broadwayd"):
         raise FileNotFoundError("Could not find broadwayd executable")
@@ -120,24 +250,25 @@ def find_executables_or_raise() -> None:
         raise FileNotFoundError("Could not find browse-ocrd executable")
 
 
-async def launch_broadway(
-    displayport: str,
-) -> asyncio.subprocess.Process | None:
+async def launch_broadway(port: int) -> asyncio.subprocess.Process | None:
+    # broadwayd starts counting virtual X displays from port 8080 as :0
+    displayport = str(port - BROADWAY_BASE_PORT)
+    address = f"http://localhost:{port}"
+    if await is_listening(address):
+        return None
+
     broadway = cast(str, which("broadwayd"))
     broadway_process = await asyncio.create_subprocess_exec(
-        broadway, f":{displayport}", stderr=asyncio.subprocess.PIPE
+        broadway, f":{displayport}", stderr=asyncio.subprocess.DEVNULL
     )
 
     try:
-        stderr = cast(asyncio.StreamReader, broadway_process.stderr)
-        err_output = await asyncio.wait_for(stderr.readline(), 5)
-        if b"Address already in use" in err_output:
-            return None
-    except asyncio.TimeoutError:
-        logging.info(
-            "The process didn't exit within the given timeout."
-            + f"Assuming broadway on port {displayport} launched successfully"
-        )
+        await wait_until_ready(address, broadway_process)
+    except BrowserNotReadyError as err:
+        logging.info(f"Broadway on port {port} did not come up: {err}")
+        if broadway_process.returncode is None:
+            broadway_process.kill()
+        return None
 
     return broadway_process
 
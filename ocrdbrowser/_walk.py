@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import fnmatch
+import logging
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Collection, NamedTuple
+
+METS = "mets.xml"
+IGNORE_PATTERNS = (".backup",)
+WORKERS = 8
+
+
+class ScanResult(NamedTuple):
+    is_workspace: bool
+    subdirectories: list[str]
+
+
+class WorkspaceWalker:
+    """
+    Find workspaces below a root directory using os.scandir.
+
+    Directories matching one of the ignore patterns are never entered and,
+    unless disabled, the walker does not descend into a workspace once its
+    mets.xml has been found (skipping the file group directories inside).
+    Directories are listed concurrently by a thread pool,
+    which hides the latency of network file systems.
+    """
+
+    def __init__(
+        self,
+        ignore: Collection[str] = IGNORE_PATTERNS,
+        stop_at_workspace: bool = True,
+        workers: int = WORKERS,
+    ) -> None:
+        self._ignore = _compile(ignore)
+        self._stop_at_workspace = stop_at_workspace
+        self._workers = workers
+
+    @property
+    def stops_at_workspace(self) -> bool:
+        return self._stop_at_workspace
+
+    def is_ignored(self, name: str) -> bool:
+        return self._ignore is not None and self._ignore.match(name) is not None
+
+    def walk(
+        self, root: str, on_directory: Callable[[str], None] | None = None
+    ) -> list[str]:
+        """
+        Return all workspaces below root (including root itself).
+        on_directory is called for every directory before it is listed.
+        """
+        if self._workers <= 1:
+            return self._walk_serial(root, on_directory)
+
+        workspaces = []
+        with ThreadPoolExecutor(self._workers) as pool:
+            pending: dict[Future[ScanResult], str] = {
+                pool.submit(self._scan, root, on_directory): root
+            }
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory = pending.pop(future)
+                    result = future.result()
+                    if result.is_workspace:
+                        workspaces.append(directory)
+
+                    for subdirectory in result.subdirectories:
+                        future = pool.submit(self._scan, subdirectory, on_directory)
+                        pending[future] = subdirectory
+
+        return workspaces
+
+    def _walk_serial(
+        self, root: str, on_directory: Callable[[str], None] | None
+    ) -> list[str]:
+        workspaces = []
+        stack = [root]
+        while stack:
+            directory = stack.pop()
+            result = self._scan(directory, on_directory)
+            if result.is_workspace:
+                workspaces.append(directory)
+            stack.extend(result.subdirectories)
+
+        return workspaces
+
+    def scan(self, directory: str) -> ScanResult:
+        """List a single directory, applying the ignore and pruning rules"""
+        return self._scan(directory, None)
+
+    def _scan(
+        self, directory: str, on_directory: Callable[[str], None] | None
+    ) -> ScanResult:
+        if on_directory is not None:
+            on_directory(directory)
+
+        is_workspace = False
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name == METS:
+                        is_workspace = entry.is_file()
+                    elif entry.is_dir(follow_symlinks=False) and not self.is_ignored(
+                        entry.name
+                    ):
+                        subdirectories.append(entry.path)
+        except OSError as err:
+            logging.warning(f"Could not scan {directory}: {err}")
+
+        if is_workspace and self._stop_at_workspace:
+            subdirectories = []
+
+        return ScanResult(is_workspace, subdirectories)
+
+
+def _compile(patterns: Collection[str]) -> re.Pattern[str] | None:
+    if not patterns:
+        return None
+
+    return re.compile("|".join(fnmatch.translate(pattern) for pattern in patterns))
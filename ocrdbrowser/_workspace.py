@@ -3,18 +3,45 @@ from __future__ import annotations
 from pathlib import Path
 from typing import List
 
-from ._cache import path_cache
+from ._index import WorkspaceIndex
+from ._walk import WorkspaceWalker
+
+_indexes: dict[Path, WorkspaceIndex] = {}
 
 
 def is_valid(workspace: str) -> bool:
     return (Path(workspace) / "mets.xml").exists()
 
 
-@path_cache
+def index(path: Path) -> WorkspaceIndex:
+    if path not in _indexes:
+        _indexes[path] = WorkspaceIndex(path)
+
+    return _indexes[path]
+
+
+def open_index(
+    path: Path,
+    snapshot: Path | None = None,
+    walker: WorkspaceWalker | None = None,
+) -> WorkspaceIndex:
+    """
+    Replace the index for path with one persisted to the given snapshot
+    and discovering workspaces with the given walker,
+    and start loading it in the background.
+    """
+    close_index(path)
+    _indexes[path] = WorkspaceIndex(path, walker=walker, snapshot=snapshot)
+    _indexes[path].start()
+    return _indexes[path]
+
+
+def close_index(path: Path) -> None:
+    workspace_index = _indexes.pop(path, None)
+    if workspace_index is not None:
+        workspace_index.close()
+
+
 def list_all(path: Path) -> List[str]:
-    # recursively enumerate METS file paths (excluding .backup subdirs)
-    return [
-        str(workspace.parent)
-        for workspace in path.rglob("mets.xml")
-        if not workspace.match(".backup/*/mets.xml")
-    ]
+    # enumerate METS file paths (excluding .backup subdirs) from the index
+    return index(path).workspaces()
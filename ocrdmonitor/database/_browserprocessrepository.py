@@ -1,9 +1,13 @@
+import logging
+from pathlib import PurePosixPath
 from beanie.odm.queries.find import FindMany
 from typing import Any, Collection, Mapping
 import pymongo
 from beanie import Document
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import DuplicateKeyError
 
-from ocrdbrowser import OcrdBrowser
+from ocrdbrowser import OcrdBrowser, PlacedBrowser
 from ocrdmonitor.protocols import BrowserRestoringFactory
 
 
@@ -12,6 +16,8 @@ class BrowserProcess(Document):
     owner: str
     process_id: str
     workspace: str
+    hibernating: bool = False
+    host: str | None = None
 
     class Settings:
         indexes = [
@@ -19,36 +25,146 @@ class BrowserProcess(Document):
                 [
                     ("owner", pymongo.ASCENDING),
                     ("workspace", pymongo.ASCENDING),
-                ]
+                ],
+                unique=True,
             )
         ]
 
 
+LEGACY_INDEX = "owner_1_workspace_1"
+
+
+async def migrate_browser_index(
+    collection: AsyncIOMotorCollection,
+    restoring_factory: BrowserRestoringFactory | None = None,
+) -> None:
+    """
+    Earlier versions allowed several browsers per owner and workspace.
+    Their index is dropped, so that the unique one can be built,
+    after stopping and dropping all but the first browser of each duplicate.
+    Without a restoring factory the dropped browsers are only logged.
+    """
+    index = (await collection.index_information()).get(LEGACY_INDEX)
+    if index is None or index.get("unique"):
+        return
+
+    duplicates = collection.aggregate(
+        [
+            {
+                "$group": {
+                    "_id": {"owner": "$owner", "workspace": "$workspace"},
+                    "ids": {"$push": "$_id"},
+                }
+            },
+            {"$match": {"ids.1": {"$exists": True}}},
+        ]
+    )
+    async for duplicate in duplicates:
+        logging.warning(f"Removing duplicate browser records for {duplicate['_id']}")
+        dropped = {"_id": {"$in": duplicate["ids"][1:]}}
+        async for record in collection.find(dropped):
+            await _stop_duplicate(record, restoring_factory)
+
+        await collection.delete_many(dropped)
+
+    await collection.drop_index(LEGACY_INDEX)
+
+
+async def _stop_duplicate(
+    record: Mapping[str, Any], restoring_factory: BrowserRestoringFactory | None
+) -> None:
+    logging.warning(
+        f"Stopping duplicate browser at {record['address']} "
+        f"(process {record['process_id']}, host {record.get('host')})"
+    )
+    if restoring_factory is None:
+        return
+
+    browser = restoring_factory(
+        record["owner"],
+        record["workspace"],
+        record["address"],
+        record["process_id"],
+        record.get("hibernating", False),
+        record.get("host"),
+    )
+    try:
+        await browser.stop()
+    except Exception as err:
+        logging.error(f"Could not stop duplicate browser {record['address']}: {err!r}")
+
+
+def containing_workspaces(path: str) -> list[str]:
+    """The path and all its parent directories, the deepest first"""
+    pure_path = PurePosixPath(path)
+    return [str(pure_path), *(str(parent) for parent in pure_path.parents)]
+
+
 class MongoBrowserProcessRepository:
+    """
+    Browser processes are cached per owner and workspace and written through,
+    so that lookups of a workspace are answered without a database round trip.
+    Misses, and workspaces nested deeper than a cached one, are looked up in the database,
+    so browsers recorded by other worker processes are still found.
+    Listing all browsers (as the periodic sweeps do) refreshes the cache.
+    """
+
     def __init__(self, restoring_factory: BrowserRestoringFactory) -> None:
         self._restoring_factory = restoring_factory
+        self._cache: dict[str, dict[str, BrowserProcess]] = {}
 
-    async def insert(self, browser: OcrdBrowser) -> None:
-        await BrowserProcess(
+    async def insert(self, browser: OcrdBrowser) -> bool:
+        process = BrowserProcess(
             address=browser.address(),
             owner=browser.owner(),
             process_id=browser.process_id(),
             workspace=browser.workspace(),
-        ).insert()
+            host=browser.host() if isinstance(browser, PlacedBrowser) else None,
+        )
+        # an upsert is atomic, other worker processes may insert concurrently
+        try:
+            result = await BrowserProcess.get_motor_collection().update_one(
+                {"owner": process.owner, "workspace": process.workspace},
+                {"$setOnInsert": process.model_dump(exclude={"id", "revision_id"})},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+
+        if result.upserted_id is None:
+            return False
+
+        process.id = result.upserted_id
+        self._remember(process)
+        return True
 
     async def delete(self, browser: OcrdBrowser) -> None:
-        result = await BrowserProcess.find_one(
+        self._forget(browser.owner(), browser.workspace())
+        result = await self._find_process(browser)
+        if not result:
+            return
+
+        await result.delete()
+
+    async def set_hibernating(self, browser: OcrdBrowser, hibernating: bool) -> None:
+        cached = self._cache.get(browser.owner(), {}).get(browser.workspace())
+        if cached is not None:
+            cached.hibernating = hibernating
+
+        result = await self._find_process(browser)
+        if not result:
+            return
+
+        await result.set({"hibernating": hibernating})
+
+    async def _find_process(self, browser: OcrdBrowser) -> BrowserProcess | None:
+        return await BrowserProcess.find_one(
             BrowserProcess.owner == browser.owner(),
             BrowserProcess.workspace == browser.workspace(),
             BrowserProcess.address == browser.address(),
             BrowserProcess.process_id == browser.process_id(),
         )
 
-        if not result:
-            return
-
-        await result.delete()
-
     async def find(
         self,
         *,
@@ -75,17 +191,20 @@ class MongoBrowserProcessRepository:
         if results is None:
             results = BrowserProcess.find_all()
 
-        return [
-            self._restoring_factory(
-                browser.owner,
-                browser.workspace,
-                browser.address,
-                browser.process_id,
-            )
-            for browser in await results.to_list()
-        ]
+        processes = await results.to_list()
+        if owner is None and workspace is None:
+            self._cache.clear()
+
+        for process in processes:
+            self._remember(process)
+
+        return [self._restore(process) for process in processes]
+
+    async def first(self, *, owner: str, workspace: str) -> OcrdBrowser | None:
+        cached = self._cache.get(owner, {}).get(workspace)
+        if cached is not None:
+            return self._restore(cached)
 
-    async def first(self, owner: str, workspace: str) -> OcrdBrowser | None:
         result = await BrowserProcess.find_one(
             BrowserProcess.owner == owner,
             BrowserProcess.workspace == workspace,
@@ -94,15 +213,60 @@ class MongoBrowserProcessRepository:
         if result is None:
             return None
 
-        return self._restoring_factory(
-            result.owner,
-            result.workspace,
-            result.address,
-            result.process_id,
+        self._remember(result)
+        return self._restore(result)
+
+    async def find_containing(self, *, owner: str, path: str) -> OcrdBrowser | None:
+        candidates = containing_workspaces(path)
+        owned = self._cache.get(owner, {})
+        cached = next(
+            (i for i, workspace in enumerate(candidates) if workspace in owned), None
         )
+        if cached == 0:
+            return self._restore(owned[candidates[0]])
+
+        # another worker process may have recorded a deeper workspace,
+        # so only the candidates deeper than a cached one are looked up,
+        # served by the unique index on owner and workspace
+        deeper = candidates if cached is None else candidates[:cached]
+        results = await BrowserProcess.find(
+            BrowserProcess.owner == owner,
+            {"workspace": {"$in": deeper}},
+        ).to_list()
+        for result in results:
+            self._remember(result)
+
+        if results:
+            deepest = max(results, key=lambda process: len(process.workspace))
+            return self._restore(deepest)
+
+        if cached is not None:
+            return self._restore(owned[candidates[cached]])
+
+        return None
 
     async def count(self) -> int:
         return await BrowserProcess.count()
 
     async def clean(self) -> None:
+        self._cache.clear()
         await BrowserProcess.delete_all()
+
+    def _remember(self, process: BrowserProcess) -> None:
+        self._cache.setdefault(process.owner, {})[process.workspace] = process
+
+    def _forget(self, owner: str, workspace: str) -> None:
+        owned = self._cache.get(owner, {})
+        owned.pop(workspace, None)
+        if not owned:
+            self._cache.pop(owner, None)
+
+    def _restore(self, process: BrowserProcess) -> OcrdBrowser:
+        return self._restoring_factory(
+            process.owner,
+            process.workspace,
+            process.address,
+            process.process_id,
+            process.hibernating,
+            process.host,
+        )
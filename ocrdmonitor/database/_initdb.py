@@ -1,11 +1,13 @@
 import asyncio
 import urllib
-from typing import Protocol
+from typing import Any, Protocol
 
 from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 
-from ._browserprocessrepository import BrowserProcess
+from ocrdmonitor.protocols import BrowserRestoringFactory
+
+from ._browserprocessrepository import BrowserProcess, migrate_browser_index
 from ._ocrdjobrepository import MongoOcrdJob
 
 
@@ -19,8 +21,12 @@ def rebuild_connection_string(connection_str: str) -> str:
 
 class InitDatabase(Protocol):
     async def __call__(
-        self, connection_str: str, force_initialize: bool = False
-    ) -> None:
+        self,
+        connection_str: str,
+        force_initialize: bool = False,
+        restoring_factory: BrowserRestoringFactory | None = None,
+        **client_options: Any,
+    ) -> AsyncIOMotorClient:
         ...
 
 
@@ -28,23 +34,34 @@ def __beanie_initializer() -> InitDatabase:
     """
     We use this as a workaround to prevent beanie from being initialized
     multiple times when requesting the repository from OcrdBrowserSettings
-    unless stated explicitly (e.g. for testing purposes)
+    unless stated explicitly (e.g. for testing purposes).
+    The client_options (e.g. maxPoolSize) are passed on to the Motor client.
+    The restoring_factory is used to stop duplicate browsers while migrating.
     """
-    __initialized = False
+    __client: AsyncIOMotorClient | None = None
 
-    async def init(connection_str: str, force_initialize: bool = False) -> None:
-        nonlocal __initialized
-        if __initialized and not force_initialize:
-            return
+    async def init(
+        connection_str: str,
+        force_initialize: bool = False,
+        restoring_factory: BrowserRestoringFactory | None = None,
+        **client_options: Any,
+    ) -> AsyncIOMotorClient:
+        nonlocal __client
+        if __client is not None and not force_initialize:
+            return __client
 
-        __initialized = True
         connection_str = rebuild_connection_string(connection_str)
-        client = AsyncIOMotorClient(connection_str) # type: ignore[var-annotated]
+        client = AsyncIOMotorClient(connection_str, **client_options) # type: ignore[var-annotated]
+        __client = client
         client.get_io_loop = asyncio.get_event_loop # type: ignore[method-assign]
+        await migrate_browser_index(
+            client.ocrd[BrowserProcess.__name__], restoring_factory
+        )
         await init_beanie(
             database=client.ocrd,
             document_models=[BrowserProcess, MongoOcrdJob],
         )
+        return client
 
     return init
 
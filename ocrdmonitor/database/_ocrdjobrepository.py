@@ -1,12 +1,16 @@
 from dataclasses import asdict
+from typing import Any
 import pymongo
 from beanie import Document
+from beanie.odm.enums import SortDirection
+from bson import ObjectId
+from bson.errors import InvalidId
 
 
 from datetime import datetime
 from pathlib import Path
 
-from ocrdmonitor.protocols import OcrdJob
+from ocrdmonitor.protocols import JobPage, OcrdJob
 
 
 class MongoOcrdJob(Document):
@@ -29,13 +33,106 @@ class MongoOcrdJob(Document):
                     ("process_dir", pymongo.ASCENDING),
                     ("time_created", pymongo.DESCENDING),
                 ]
-            )
+            ),
+            # running jobs are few, $ne: null is answered by the index bounds
+            pymongo.IndexModel([("pid", pymongo.ASCENDING)]),
+            # completed jobs are walked in sort order,
+            # the return code is filtered on the index keys before fetching
+            pymongo.IndexModel(
+                [
+                    ("time_terminated", pymongo.DESCENDING),
+                    ("_id", pymongo.DESCENDING),
+                    ("return_code", pymongo.ASCENDING),
+                ]
+            ),
         ]
 
 
 class MongoJobRepository:
+    """
+    Pages of jobs are sorted by a time and the id as tie breaker,
+    the cursor is the sort key of the last job on the page (keyset pagination),
+    so deep pages cost as much as the first one.
+    """
+
     async def insert(self, job: OcrdJob) -> None:
         await MongoOcrdJob(**asdict(job)).insert()
 
     async def find_all(self) -> list[OcrdJob]:
-        return [OcrdJob(**j.dict(exclude={"id"})) for j in await MongoOcrdJob.find_all().to_list()]
+        return [_to_job(j) for j in await MongoOcrdJob.find_all().to_list()]
+
+    async def find_running(
+        self, *, cursor: str | None = None, limit: int = 100
+    ) -> JobPage:
+        return await _page(
+            {"pid": {"$ne": None}}, "time_created", False, cursor, limit
+        )
+
+    async def find_completed(
+        self, *, cursor: str | None = None, limit: int = 100
+    ) -> JobPage:
+        return await _page(
+            {"return_code": {"$ne": None}}, "time_terminated", True, cursor, limit
+        )
+
+
+async def _page(
+    query: dict[str, Any],
+    field: str,
+    descending: bool,
+    cursor: str | None,
+    limit: int,
+) -> JobPage:
+    if cursor:
+        query = {"$and": [query, _after(field, *_parse_cursor(cursor), descending)]}
+
+    direction = SortDirection.DESCENDING if descending else SortDirection.ASCENDING
+    results = (
+        await MongoOcrdJob.find(query)
+        .sort([(field, direction), ("_id", direction)])
+        .limit(limit + 1)
+        .to_list()
+    )
+
+    jobs = results[:limit]
+    next_cursor = None
+    if len(results) > limit:
+        last = jobs[-1]
+        next_cursor = _cursor(getattr(last, field), last.id)
+
+    return JobPage([_to_job(j) for j in jobs], next_cursor)
+
+
+def _after(
+    field: str, value: datetime | None, id: ObjectId, descending: bool
+) -> dict[str, Any]:
+    """Everything sorted after (value, id), MongoDB sorts null before any datetime"""
+    op = "$lt" if descending else "$gt"
+    if value is None:
+        same_value = {field: None, "_id": {op: id}}
+        if descending:
+            return same_value
+
+        return {"$or": [same_value, {field: {"$ne": None}}]}
+
+    later = [{field: {op: value}}, {field: value, "_id": {op: id}}]
+    if descending:
+        later.append({field: None})
+
+    return {"$or": later}
+
+
+def _cursor(value: datetime | None, id: Any) -> str:
+    return f"{value.isoformat() if value else ''}|{id}"
+
+
+def _parse_cursor(cursor: str) -> tuple[datetime | None, ObjectId]:
+    value, _, id = cursor.partition("|")
+    try:
+        return (datetime.fromisoformat(value) if value else None, ObjectId(id))
+    except (InvalidId, TypeError) as err:
+        raise ValueError(f"Invalid cursor {cursor}") from err
+
+
+def _to_job(job: MongoOcrdJob) -> OcrdJob:
+    return OcrdJob(**job.dict(exclude={"id"}))
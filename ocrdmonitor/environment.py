@@ -1,19 +1,25 @@
 import functools
 from typing import Callable, Type
 
+from motor.motor_asyncio import AsyncIOMotorClient
+
 from ocrdbrowser import (
+    BrowserHost,
     DockerOcrdBrowser,
     DockerOcrdBrowserFactory,
+    MultiHostBrowserFactory,
+    OcrdBrowser,
     OcrdBrowserFactory,
+    PortAllocator,
     SubProcessOcrdBrowser,
     SubProcessOcrdBrowserFactory,
 )
 from ocrdmonitor import database
-from ocrdmonitor.protocols import Repositories
+from ocrdmonitor.protocols import BrowserRestoringFactory, Repositories
 from ocrdmonitor.server.settings import Settings
 
 BrowserType = Type[SubProcessOcrdBrowser] | Type[DockerOcrdBrowser]
-CreatingFactories: dict[str, Callable[[set[int]], OcrdBrowserFactory]] = {
+CreatingFactories: dict[str, Callable[[PortAllocator], OcrdBrowserFactory]] = {
     "native": SubProcessOcrdBrowserFactory,
     "docker": functools.partial(DockerOcrdBrowserFactory, "http://localhost"),
 }
@@ -27,15 +33,75 @@ RestoringFactories: dict[str, BrowserType] = {
 class ProductionEnvironment:
     def __init__(self, settings: Settings) -> None:
         self.settings = settings
+        # created and restored browsers share the port leases
+        self._ports = PortAllocator(range(*settings.ocrd_browser.port_range))
+        # the factory keeps state (e.g. prewarmed browsers) across requests
+        self._browser_factory = create_browser_factory(settings, self._ports)
+        self._client: AsyncIOMotorClient | None = None
 
     async def repositories(self) -> Repositories:
-        await database.init(self.settings.monitor_db_connection_string)
-        restoring_factory = RestoringFactories[self.settings.ocrd_browser.mode]
+        self._client = await database.init(
+            self.settings.monitor_db_connection_string,
+            restoring_factory=self._restoring_factory(),
+            maxPoolSize=self.settings.monitor_db_max_pool_size,
+            minPoolSize=self.settings.monitor_db_min_pool_size,
+            connectTimeoutMS=int(self.settings.monitor_db_connect_timeout * 1000),
+            serverSelectionTimeoutMS=int(
+                self.settings.monitor_db_server_selection_timeout * 1000
+            ),
+        )
         return Repositories(
-            database.MongoBrowserProcessRepository(restoring_factory),
+            database.MongoBrowserProcessRepository(self._restoring_factory()),
             database.MongoJobRepository(),
         )
 
+    async def close(self) -> None:
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
     def browser_factory(self) -> OcrdBrowserFactory:
-        port_range_set = set(range(*self.settings.ocrd_browser.port_range))
-        return CreatingFactories[self.settings.ocrd_browser.mode](port_range_set)
+        return self._browser_factory
+
+    def _restoring_factory(self) -> BrowserRestoringFactory:
+        if isinstance(self._browser_factory, MultiHostBrowserFactory):
+            return self._browser_factory.restore
+
+        browser_type = RestoringFactories[self.settings.ocrd_browser.mode]
+
+        def restore(
+            owner: str,
+            workspace: str,
+            address: str,
+            process_id: str,
+            hibernating: bool = False,
+            host: str | None = None,
+        ) -> OcrdBrowser:
+            # browsers of a single host factory all run on the monitor's host
+            return browser_type(
+                owner,
+                workspace,
+                address,
+                process_id,
+                ports=self._ports,
+                hibernating=hibernating,
+            )
+
+        return restore
+
+
+def create_browser_factory(
+    settings: Settings, ports: PortAllocator
+) -> OcrdBrowserFactory:
+    browser_settings = settings.ocrd_browser
+    if browser_settings.mode == "native":
+        return SubProcessOcrdBrowserFactory(ports, browser_settings.pool_size)
+
+    if browser_settings.browser_hosts:
+        # every host has ports of its own
+        return MultiHostBrowserFactory(
+            BrowserHost(endpoint, range(*browser_settings.port_range))
+            for endpoint in browser_settings.browser_hosts
+        )
+
+    return CreatingFactories[browser_settings.mode](ports)
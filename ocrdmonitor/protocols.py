@@ -9,18 +9,31 @@ from ocrdmonitor.server.settings import Settings
 
 class BrowserRestoringFactory(Protocol):
     def __call__(
-        self, owner: str, workspace: str, address: str, process_id: str
+        self,
+        owner: str,
+        workspace: str,
+        address: str,
+        process_id: str,
+        hibernating: bool = False,
+        host: str | None = None,
     ) -> OcrdBrowser:
         ...
 
 
 class BrowserProcessRepository(Protocol):
-    async def insert(self, browser: OcrdBrowser) -> None:
+    async def insert(self, browser: OcrdBrowser) -> bool:
+        """
+        Record the browser unless one for the same owner and workspace is recorded,
+        return whether it was recorded
+        """
         ...
 
     async def delete(self, browser: OcrdBrowser) -> None:
         ...
 
+    async def set_hibernating(self, browser: OcrdBrowser, hibernating: bool) -> None:
+        ...
+
     async def find(
         self,
         *,
@@ -32,6 +45,10 @@ class BrowserProcessRepository(Protocol):
     async def first(self, *, owner: str, workspace: str) -> OcrdBrowser | None:
         ...
 
+    async def find_containing(self, *, owner: str, path: str) -> OcrdBrowser | None:
+        """The owner's browser for the (deepest) workspace containing the path"""
+        ...
+
     async def count(self) -> int:
         ...
 
@@ -62,6 +79,11 @@ class OcrdJob:
         return Path(self.workflow_file).name
 
 
+class JobPage(NamedTuple):
+    jobs: list[OcrdJob]
+    next_cursor: str | None
+
+
 class JobRepository(Protocol):
     async def insert(self, job: OcrdJob) -> None:
         ...
@@ -69,6 +91,18 @@ class JobRepository(Protocol):
     async def find_all(self) -> list[OcrdJob]:
         ...
 
+    async def find_running(
+        self, *, cursor: str | None = None, limit: int = 100
+    ) -> JobPage:
+        """Running jobs, the oldest first, beginning after cursor"""
+        ...
+
+    async def find_completed(
+        self, *, cursor: str | None = None, limit: int = 100
+    ) -> JobPage:
+        """Completed jobs, the most recently terminated first, beginning after cursor"""
+        ...
+
 
 class Repositories(NamedTuple):
     browser_processes: BrowserProcessRepository
@@ -79,6 +113,10 @@ class Environment(Protocol):
     settings: Settings
 
     async def repositories(self) -> Repositories:
+        """Connect to the database, called once on startup"""
+        ...
+
+    async def close(self) -> None:
         ...
 
     def browser_factory(self) -> OcrdBrowserFactory:
@@ -10,12 +10,19 @@ from fastapi.templating import Jinja2Templates
 
 from ocrdmonitor.protocols import Environment
 from ocrdmonitor.server.index import create_index
+from ocrdmonitor.server.jobfeed import JobFeed
 from ocrdmonitor.server.jobs import create_jobs
 from ocrdmonitor.server.lifespan import lifespan
 from ocrdmonitor.server.logs import create_logs
 from ocrdmonitor.server.logview import create_logview
 from ocrdmonitor.server.workflows import create_workflows
-from ocrdmonitor.server.workspaces import create_workspaces
+from ocrdmonitor.server.workspaces import (
+    ActivityTracker,
+    HealthSweep,
+    Hibernator,
+    IdleReaper,
+    create_workspaces,
+)
 
 PKG_DIR = Path(__file__).parent
 STATIC_DIR = PKG_DIR / "static"
@@ -23,7 +30,24 @@ TEMPLATE_DIR = PKG_DIR / "templates"
 
 
 def create_app(environment: Environment) -> FastAPI:
-    app = FastAPI(lifespan=lifespan(environment))
+    browser_settings = environment.settings.ocrd_browser
+    activity = ActivityTracker()
+    hibernator = Hibernator(activity, browser_settings.hibernate_after)
+    reaper = IdleReaper(
+        activity,
+        browser_settings.idle_timeout,
+        browser_settings.idle_check_interval,
+        browser_settings.idle_dry_run,
+        hibernator,
+    )
+    health = HealthSweep(
+        browser_settings.health_check_interval,
+        browser_settings.health_check_concurrency,
+        browser_settings.health_check_timeout,
+        browser_settings.health_check_failures,
+    )
+    jobfeed = JobFeed(environment.settings.job_updates_interval)
+    app = FastAPI(lifespan=lifespan(environment, reaper, health, jobfeed))
     templates = Jinja2Templates(TEMPLATE_DIR)
     app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
@@ -46,8 +70,12 @@ def create_app(environment: Environment) -> FastAPI:
         )
 
     app.include_router(create_index(templates))
-    app.include_router(create_jobs(templates, environment))
-    app.include_router(create_workspaces(templates, environment))
+    app.include_router(create_jobs(templates, environment, jobfeed))
+    app.include_router(
+        create_workspaces(
+            templates, environment, activity, reaper, health, hibernator
+        )
+    )
     app.include_router(
         create_logs(templates, environment.settings.ocrd_browser.workspace_dir)
     )
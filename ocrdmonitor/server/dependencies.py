@@ -0,0 +1,21 @@
+"""
+Request dependencies for objects built once in the lifespan and kept on the app state.
+They are coroutines, so that FastAPI does not dispatch them to its thread pool.
+"""
+
+from fastapi.requests import HTTPConnection
+
+from ocrdmonitor.protocols import BrowserProcessRepository, JobRepository, Repositories
+
+
+async def repositories(connection: HTTPConnection) -> Repositories:
+    app_repositories: Repositories = connection.app.state.repositories
+    return app_repositories
+
+
+async def browser_processes(connection: HTTPConnection) -> BrowserProcessRepository:
+    return (await repositories(connection)).browser_processes
+
+
+async def ocrd_jobs(connection: HTTPConnection) -> JobRepository:
+    return (await repositories(connection)).ocrd_jobs
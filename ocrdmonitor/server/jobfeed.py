@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Literal, NamedTuple
+
+from ocrdmonitor.protocols import JobRepository, OcrdJob
+
+JobEventKind = Literal["started", "terminated"]
+JobKey = tuple[str, str]
+
+RUNNING_LIMIT = 1000
+COMPLETED_LIMIT = 100
+
+
+class JobEvent(NamedTuple):
+    kind: JobEventKind
+    job: OcrdJob
+
+
+def job_key(job: OcrdJob) -> JobKey:
+    return job.task_id, job.process_id
+
+
+class JobFeed:
+    """
+    Polls the job repository every interval seconds while anybody is subscribed
+    and publishes jobs that started or terminated since the previous poll,
+    which may be long ago when nobody was subscribed in between.
+    There is a single poller per process however many clients are subscribed.
+    Subscribers that do not keep up lose events instead of slowing down the others.
+    """
+
+    def __init__(self, interval: float, queue_size: int = 100) -> None:
+        self._interval = interval
+        self._queue_size = queue_size
+        self._subscribers: set[asyncio.Queue[JobEvent]] = set()
+        self._subscribed = asyncio.Event()
+        self._running: dict[JobKey, OcrdJob] | None = None
+        self._completed: set[JobKey] = set()
+        self._task: asyncio.Task[None] | None = None
+        self.polls = 0
+        self.dropped = 0
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscribers)
+
+    def start(self, repository: JobRepository) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(repository))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    @asynccontextmanager
+    async def subscribe(self) -> AsyncIterator[asyncio.Queue[JobEvent]]:
+        queue: asyncio.Queue[JobEvent] = asyncio.Queue(self._queue_size)
+        self._subscribers.add(queue)
+        self._subscribed.set()
+        try:
+            yield queue
+        finally:
+            self._subscribers.discard(queue)
+            if not self._subscribers:
+                self._subscribed.clear()
+
+    async def poll(self, repository: JobRepository) -> list[JobEvent]:
+        running = {
+            job_key(job): job
+            for job in (await repository.find_running(limit=RUNNING_LIMIT)).jobs
+        }
+        completed = (await repository.find_completed(limit=COMPLETED_LIMIT)).jobs
+
+        events: list[JobEvent] = []
+        # the first poll only takes a snapshot to compare the next one with
+        if self._running is not None:
+            events.extend(
+                JobEvent("started", job)
+                for key, job in running.items()
+                if key not in self._running
+            )
+            events.extend(
+                JobEvent("terminated", job)
+                for job in reversed(completed)
+                if job_key(job) not in self._completed
+            )
+
+        self._running = running
+        self._completed = {job_key(job) for job in completed}
+        self.polls += 1
+        self._publish(events)
+        return events
+
+    def _publish(self, events: list[JobEvent]) -> None:
+        for queue in self._subscribers:
+            for event in events:
+                try:
+                    queue.put_nowait(event)
+                except asyncio.QueueFull:
+                    self.dropped += 1
+
+    async def _run(self, repository: JobRepository) -> None:
+        # the first snapshot is taken before any page is rendered and kept
+        # while nobody is subscribed, so that changes after rendering a page
+        # are published by the first poll after its subscription
+        await self._poll(repository)
+        while True:
+            await self._subscribed.wait()
+            await asyncio.sleep(self._interval)
+            await self._poll(repository)
+
+    async def _poll(self, repository: JobRepository) -> None:
+        try:
+            await self.poll(repository)
+        except Exception as err:
+            logging.error(f"Polling jobs failed: {err!r}")
@@ -1,57 +1,101 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import datetime, timezone
-from typing import Iterable
+import asyncio
+import json
+from typing import Any, AsyncIterator, Literal
 
-from fastapi import APIRouter, Depends, Request, Response, status
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.templating import Jinja2Templates
 
-from ocrdmonitor.protocols import Environment, OcrdJob, Repositories
+from ocrdmonitor.protocols import Environment, JobPage, JobRepository, OcrdJob
+from ocrdmonitor.server.dependencies import ocrd_jobs
+from ocrdmonitor.server.jobfeed import JobFeed
 
 import httpx
 import logging
 
 
-def split_into_running_and_completed(
-    jobs: Iterable[OcrdJob],
-) -> tuple[list[OcrdJob], list[OcrdJob]]:
-    running_ocrd_jobs = [job for job in jobs if job.is_running]
-    completed_ocrd_jobs = [job for job in jobs if job.is_completed]
-    return running_ocrd_jobs, completed_ocrd_jobs
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# comments sent on idle streams, so that proxies do not close them
+KEEPALIVE_INTERVAL = 15.0
+
+JobState = Literal["running", "completed"]
 
 
 def create_jobs(
     templates: Jinja2Templates,
     environment: Environment,
+    jobfeed: JobFeed,
 ) -> APIRouter:
     router = APIRouter(prefix="/jobs")
 
     @router.get("/", name="jobs")
     async def jobs(
-        request: Request, repositories: Repositories = Depends(environment.repositories)
+        request: Request, job_repository: JobRepository = Depends(ocrd_jobs)
     ) -> Response:
-        job_repository = repositories.ocrd_jobs
-        jobs = await job_repository.find_all()
-        running, completed = split_into_running_and_completed(jobs)
+        running = await job_repository.find_running(limit=PAGE_SIZE)
+        completed = await job_repository.find_completed(limit=PAGE_SIZE)
 
-        now = datetime.now(timezone.utc)
         return templates.TemplateResponse(
             "jobs.html.j2",
             {
                 "request": request,
-                "running_jobs": sorted(
-                    running,
-                    key=lambda x: x.time_created or now,
-                ),
-                "completed_jobs": sorted(
-                    completed,
-                    key=lambda x: x.time_terminated or now,
-                ),
+                "running_jobs": running.jobs,
+                "running_cursor": running.next_cursor,
+                "completed_jobs": completed.jobs,
+                "completed_cursor": completed.next_cursor,
             },
         )
 
+    @router.get("/api", name="jobs.api")
+    async def jobs_api(
+        request: Request,
+        state: JobState = "completed",
+        cursor: str | None = None,
+        limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        job_repository: JobRepository = Depends(ocrd_jobs),
+    ) -> Response:
+        """
+        A page of running (the oldest first) or completed jobs
+        (the most recently terminated first), beginning after cursor.
+        """
+        try:
+            if state == "running":
+                page = await job_repository.find_running(cursor=cursor, limit=limit)
+            else:
+                page = await job_repository.find_completed(cursor=cursor, limit=limit)
+        except ValueError as err:
+            return JSONResponse(
+                status_code=status.HTTP_400_BAD_REQUEST, content={"detail": str(err)}
+            )
+
+        return JSONResponse(_page(request, page))
+
+    @router.get("/events", name="jobs.events")
+    async def job_events(request: Request) -> Response:
+        """Server-sent events for jobs that started or terminated"""
+
+        async def stream() -> AsyncIterator[str]:
+            async with jobfeed.subscribe() as events:
+                yield ": connected\n\n"
+                while True:
+                    try:
+                        event = await asyncio.wait_for(events.get(), KEEPALIVE_INTERVAL)
+                    except asyncio.TimeoutError:
+                        yield ": keepalive\n\n"
+                        continue
+
+                    data = json.dumps(_job(request, event.job))
+                    yield f"event: {event.kind}\ndata: {data}\n\n"
+
+        return StreamingResponse(
+            stream(),
+            media_type="text/event-stream",
+            headers={"cache-control": "no-cache", "x-accel-buffering": "no"},
+        )
+
     @router.get("/kill/{job_pid}", name="jobs.kill")
     async def kill(job_pid: int) -> Response:
         status_code = status.HTTP_200_OK
@@ -72,3 +116,30 @@ def create_jobs(
         return JSONResponse(status_code=status_code, content=dict(message=message))
 
     return router
+
+
+def _page(request: Request, page: JobPage) -> dict[str, Any]:
+    return {
+        "jobs": [_job(request, job) for job in page.jobs],
+        "next_cursor": page.next_cursor,
+    }
+
+
+def _job(request: Request, job: OcrdJob) -> dict[str, Any]:
+    return {
+        "pid": job.pid,
+        "return_code": job.return_code,
+        "time_created": job.time_created and str(job.time_created),
+        "time_terminated": job.time_terminated and str(job.time_terminated),
+        "process_id": job.process_id,
+        "task_id": job.task_id,
+        "process_dir": str(job.process_dir),
+        "workdir": str(job.workdir),
+        "remotedir": job.remotedir,
+        "workflow": job.workflow,
+        "workflow_url": str(
+            request.url_for("workflows.detail", path=job.workflow_file)
+        ),
+        "workspace_url": str(request.url_for("workspaces.open", workspace=job.workdir)),
+        "log_url": str(request.url_for("logs.view", path=job.workdir / "ocrd.log")),
+    }
@@ -1,34 +1,86 @@
-import asyncio
 from contextlib import asynccontextmanager
 from typing import AsyncContextManager, AsyncIterator, Callable
 
+import httpx
 from fastapi import FastAPI
 
-from ocrdbrowser import OcrdBrowser
-from ocrdmonitor.protocols import BrowserProcessRepository, Environment
+from ocrdbrowser import (
+    PortLeasingBrowserFactory,
+    PrewarmingBrowserFactory,
+    WorkspaceWalker,
+    client_pool,
+    docker_engine,
+    summary_cache,
+    workspace,
+)
+from ocrdmonitor.protocols import Environment
+from ocrdmonitor.server.jobfeed import JobFeed
+from ocrdmonitor.server.settings import OcrdBrowserSettings
+from ocrdmonitor.server.workspaces import HealthSweep, IdleReaper
 
 Lifespan = Callable[[FastAPI], AsyncContextManager[None]]
 
 
-def lifespan(environment: Environment) -> Lifespan:
+def lifespan(
+    environment: Environment, reaper: IdleReaper, health: HealthSweep, jobfeed: JobFeed
+) -> Lifespan:
     @asynccontextmanager
-    async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+        browser_settings = environment.settings.ocrd_browser
+        configure_client_pool(browser_settings)
+        docker_engine.configure(browser_settings.docker_socket)
+        summary_cache.configure(
+            browser_settings.mets_summary_cache_size,
+            browser_settings.mets_summary_workers,
+        )
+        workspace.open_index(
+            browser_settings.workspace_dir,
+            browser_settings.index_snapshot,
+            WorkspaceWalker(
+                browser_settings.index_ignore, browser_settings.index_stop_at_workspace
+            ),
+        )
+        # connecting and building the repositories once, requests use the app state
         repositories = await environment.repositories()
-        await clean_unreachable_browsers(repositories.browser_processes)
+        app.state.repositories = repositories
+        browser_factory = environment.browser_factory()
+        if isinstance(browser_factory, PortLeasingBrowserFactory):
+            running = await repositories.browser_processes.find()
+            browser_factory.restore_leases(running)
+
+        # stale browsers are removed (releasing their ports) in the background
+        health.start(repositories.browser_processes)
+
+        if isinstance(browser_factory, PrewarmingBrowserFactory):
+            browser_factory.prewarm()
+
+        reaper.start(repositories.browser_processes)
+        jobfeed.start(repositories.ocrd_jobs)
+
         yield
 
-    return _lifespan
+        await jobfeed.stop()
+        await reaper.stop()
+        await health.stop()
+
+        if isinstance(browser_factory, PrewarmingBrowserFactory):
+            await browser_factory.close()
 
+        workspace.close_index(browser_settings.workspace_dir)
+        await client_pool.close_all()
+        await docker_engine.close()
+        summary_cache.close()
+        await environment.close()
 
-async def clean_unreachable_browsers(repo: BrowserProcessRepository) -> None:
-    all_browsers = await repo.find()
-    async with asyncio.TaskGroup() as group:
-        for browser in all_browsers:
-            group.create_task(ping_or_delete(repo, browser))
+    return _lifespan
 
 
-async def ping_or_delete(repo: BrowserProcessRepository, browser: OcrdBrowser) -> None:
-    try:
-        await browser.client().get("/")
-    except ConnectionError:
-        await repo.delete(browser)
+def configure_client_pool(settings: OcrdBrowserSettings) -> None:
+    client_pool.configure(
+        limits=httpx.Limits(
+            max_connections=settings.client_max_connections,
+            max_keepalive_connections=settings.client_max_keepalive_connections,
+            keepalive_expiry=settings.client_keepalive_expiry,
+        ),
+        timeout=httpx.Timeout(settings.client_timeout),
+    )
@@ -43,7 +43,33 @@ class OcrdLogViewSettings(BaseSettings):
 class OcrdBrowserSettings(BaseSettings):
     workspace_dir: Path
     mode: Literal["native", "docker"] = "native"
+    docker_socket: str = "/var/run/docker.sock"
+    browser_hosts: list[str] = []
     port_range: tuple[int, int]
+    pool_size: int = 0
+    eviction_min_idle_age: float = 600.0
+    idle_timeout: float = 4 * 60 * 60
+    idle_check_interval: float = 300.0
+    idle_dry_run: bool = False
+    hibernate_after: float | None = None
+    health_check_interval: float = 60.0
+    health_check_concurrency: int = 10
+    health_check_timeout: float = 2.0
+    health_check_failures: int = 3
+
+    client_max_connections: int = 10
+    client_max_keepalive_connections: int = 5
+    client_keepalive_expiry: float = 30.0
+    client_timeout: float = 10.0
+    asset_cache_size: int = 4 * 1024 * 1024
+    index_snapshot: Path | None = None
+    # workspaces nested inside other workspaces are only found without stopping
+    index_stop_at_workspace: bool = True
+    index_ignore: list[str] = [".backup"]
+    workspace_list_ttl: float = 30.0
+    mets_summary_workers: int = 2
+    mets_summary_cache_size: int = 10000
+    mets_summary_timeout: float = 2.0
 
     @field_validator("port_range", mode="before")
     @classmethod
@@ -65,11 +91,28 @@ class OcrdBrowserSettings(BaseSettings):
 
         return int_pair
 
+    @field_validator("browser_hosts", "index_ignore", mode="before")
+    @classmethod
+    def split_list(cls, value: str | list[str]) -> list[str]:
+        if isinstance(value, str):
+            value = [
+                item.strip(" '\"")
+                for item in value.strip("[]").split(",")
+                if item.strip(" '\"")
+            ]
+
+        return value
+
 
 class Settings(BaseSettings):
     model_config = SettingsConfigDict(env_nested_delimiter="__")
 
     monitor_db_connection_string: str
+    monitor_db_max_pool_size: int = 100
+    monitor_db_min_pool_size: int = 0
+    monitor_db_connect_timeout: float = 20.0
+    monitor_db_server_selection_timeout: float = 30.0
+    job_updates_interval: float = 5.0
 
     ocrd_browser: OcrdBrowserSettings
     ocrd_logview: OcrdLogViewSettings
@@ -96,7 +139,9 @@ def getargs(field_name: str, model_type: Type[BaseModel]) -> dict[str, str]:
         for model_field_name in model_type.model_fields
     }
     return {
-        field: os.environ.get(var, "") for field, var in fields_to_env.items()
+        field: os.environ[var]
+        for field, var in fields_to_env.items()
+        if var in os.environ
     }
 
 
@@ -5,15 +5,37 @@ from pathlib import Path
 from fastapi import APIRouter, Depends
 from fastapi.templating import Jinja2Templates
 
-from ocrdmonitor.protocols import BrowserProcessRepository, Environment
+from ocrdbrowser import BroadwayAssetCache
+from ocrdmonitor.protocols import Environment
+from ocrdmonitor.server.dependencies import browser_processes
 
+from ._activity import ActivityTracker
+from ._capacity import CapacityManager
+from ._health import HealthSweep
+from ._hibernation import Hibernator
 from ._launchroutes import register_launchroutes
 from ._listroutes import register_listroutes
+from ._metricsroutes import register_metricsroutes
 from ._proxyroutes import register_proxyroutes
+from ._reaper import IdleReaper
+
+__all__ = [
+    "ActivityTracker",
+    "CapacityManager",
+    "HealthSweep",
+    "Hibernator",
+    "IdleReaper",
+    "create_workspaces",
+]
 
 
 def create_workspaces(
-    templates: Jinja2Templates, environment: Environment
+    templates: Jinja2Templates,
+    environment: Environment,
+    activity: ActivityTracker,
+    reaper: IdleReaper,
+    health: HealthSweep,
+    hibernator: Hibernator,
 ) -> APIRouter:
     router = APIRouter(prefix="/workspaces")
 
@@ -23,16 +45,30 @@ def create_workspaces(
     def full_workspace(workspace: Path | str) -> str:
         return str(WORKSPACE_DIR / workspace)
 
-    async def get_browser_repository() -> BrowserProcessRepository:
-        return (await environment.repositories()).browser_processes
-
-    browser_repository = Depends(get_browser_repository)
+    browser_repository = Depends(browser_processes)
     browser_factory = Depends(environment.browser_factory)
 
+    capacity = CapacityManager(activity, browser_settings.eviction_min_idle_age)
+
     register_listroutes(router, templates, browser_settings)
     register_launchroutes(
-        router, templates, browser_factory, browser_repository, full_workspace
+        router,
+        templates,
+        browser_factory,
+        browser_repository,
+        full_workspace,
+        capacity,
+    )
+    asset_cache = BroadwayAssetCache(browser_settings.asset_cache_size)
+    register_proxyroutes(
+        router,
+        templates,
+        browser_repository,
+        full_workspace,
+        asset_cache,
+        activity,
+        hibernator,
     )
-    register_proxyroutes(router, templates, browser_repository, full_workspace)
+    register_metricsroutes(router, capacity, reaper, health, hibernator, asset_cache)
 
     return router
@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import time
+from typing import Callable, Iterable
+
+from ocrdbrowser import OcrdBrowser
+
+Clock = Callable[[], float]
+
+
+class ActivityTracker:
+    """
+    Remembers when each browser (identified by its address) last had traffic.
+    Browsers without recorded activity count as active when the tracker was created,
+    which gives browsers restored after a restart a grace period.
+    """
+
+    def __init__(self, clock: Clock = time.monotonic) -> None:
+        self._clock = clock
+        self._created = clock()
+        self._last_activity: dict[str, float] = {}
+
+    def touch(self, browser: OcrdBrowser) -> None:
+        self._last_activity[browser.address()] = self._clock()
+
+    def forget(self, browser: OcrdBrowser) -> None:
+        self._last_activity.pop(browser.address(), None)
+
+    def last_activity(self, browser: OcrdBrowser) -> float:
+        return self._last_activity.get(browser.address(), self._created)
+
+    def idle_for(self, browser: OcrdBrowser) -> float:
+        return self._clock() - self.last_activity(browser)
+
+    def idle_browsers(
+        self, browsers: Iterable[OcrdBrowser], min_idle: float
+    ) -> list[OcrdBrowser]:
+        """Browsers idle for at least min_idle seconds, least recently used first"""
+        now = self._clock()
+        idle = [
+            browser
+            for browser in browsers
+            if now - self.last_activity(browser) >= min_idle
+        ]
+        return sorted(idle, key=self.last_activity)
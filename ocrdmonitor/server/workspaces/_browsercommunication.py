@@ -2,38 +2,169 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from difflib import SequenceMatcher
 from typing import Awaitable, Callable
 
-from fastapi import Response
+from fastapi import Request, Response, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
-from ocrdbrowser import Channel, ChannelClosed, OcrdBrowser
+from ocrdbrowser import (
+    BroadwayAssetCache,
+    Channel,
+    ChannelClosed,
+    OcrdBrowser,
+    OcrdBrowserResponse,
+)
 
+FORWARDED_REQUEST_HEADERS = (
+    "accept",
+    "accept-language",
+    "cache-control",
+    "if-match",
+    "if-modified-since",
+    "if-none-match",
+    "if-range",
+    "if-unmodified-since",
+    "range",
+    "user-agent",
+)
 
-async def forward(browser: OcrdBrowser, partial_workspace: str) -> Response:
-    url = _get_redirect_url(browser, partial_workspace)
-    resource = await browser.client().get(url)
-    return Response(content=resource)
+# hop-by-hop headers only apply to a single connection and must not be proxied
+HOP_BY_HOP_HEADERS = frozenset(
+    (
+        "connection",
+        "keep-alive",
+        "proxy-authenticate",
+        "proxy-authorization",
+        "te",
+        "trailer",
+        "transfer-encoding",
+        "upgrade",
+    )
+)
 
 
-def _get_redirect_url(browser: OcrdBrowser, partial_workspace: str) -> str:
-    matcher = SequenceMatcher(None, browser.workspace(), partial_workspace)
-    match = matcher.find_longest_match()
-    return partial_workspace[match.size :]
+async def forward(
+    browser: OcrdBrowser,
+    request: Request,
+    path: str,
+    asset_cache: BroadwayAssetCache,
+) -> Response:
+    url = _get_redirect_url(browser, path)
+    if asset_cache.is_cacheable(url):
+        return await _forward_asset(browser, request, url, asset_cache)
+
+    upstream = await browser.client().stream(
+        url, method=request.method, headers=_request_headers(request)
+    )
+    headers = _response_headers(upstream)
+    if request.method == "HEAD" or upstream.status_code in (204, 304):
+        await upstream.aclose()
+        return Response(status_code=upstream.status_code, headers=headers)
+
+    return StreamingResponse(
+        upstream.aiter_raw(),
+        status_code=upstream.status_code,
+        headers=headers,
+        background=BackgroundTask(upstream.aclose),
+    )
+
+
+async def _forward_asset(
+    browser: OcrdBrowser,
+    request: Request,
+    url: str,
+    asset_cache: BroadwayAssetCache,
+) -> Response:
+    asset = asset_cache.lookup(url)
+    if asset is None:
+        upstream = await browser.client().stream(
+            url, headers={"accept-encoding": "identity"}
+        )
+        try:
+            content = b"".join([chunk async for chunk in upstream.aiter_raw()])
+        finally:
+            await upstream.aclose()
+
+        if upstream.status_code != 200:
+            return Response(
+                content,
+                status_code=upstream.status_code,
+                headers=_response_headers(upstream),
+            )
+
+        asset = asset_cache.store(
+            url, content, upstream.headers.get("content-type", "text/html")
+        )
+
+    # clients have to revalidate, but a matching ETag is answered by the monitor
+    headers = {"etag": asset.etag, "cache-control": "no-cache"}
+    if _etag_matches(asset.etag, request.headers.get("if-none-match", "")):
+        return Response(status_code=304, headers=headers)
+
+    return Response(asset.content, media_type=asset.media_type, headers=headers)
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+async def ping(browser: OcrdBrowser, path: str) -> None:
+    url = _get_redirect_url(browser, path)
+    await browser.client().get(url)
+
+
+def _response_headers(upstream: OcrdBrowserResponse) -> dict[str, str]:
+    return {
+        key: value
+        for key, value in upstream.headers.items()
+        if key.lower() not in HOP_BY_HOP_HEADERS
+    }
+
+
+def _request_headers(request: Request) -> dict[str, str]:
+    headers = {
+        key: request.headers[key]
+        for key in FORWARDED_REQUEST_HEADERS
+        if key in request.headers
+    }
+
+    # the body is passed through as is, so the browser may only
+    # compress it in a way the requesting client understands
+    headers["accept-encoding"] = request.headers.get("accept-encoding", "identity")
+    return headers
+
+
+def _get_redirect_url(browser: OcrdBrowser, path: str) -> str:
+    """
+    The URL of the requested path relative to the browser, i.e. without its workspace.
+    The path is a full path as returned by full_workspace for the route parameter.
+    """
+    workspace = browser.workspace()
+    if path != workspace and not path.startswith(workspace + "/"):
+        raise ValueError(f"{path} is not in the workspace {workspace}")
+
+    return path[len(workspace) :]
 
 
 CloseCallback = Callable[[OcrdBrowser], Awaitable[None]]
 
 
 async def communicate_until_closed(
-    websocket: Channel, browser: OcrdBrowser, close_callback: CloseCallback
+    websocket: Channel,
+    browser: OcrdBrowser,
+    close_callback: CloseCallback,
+    on_activity: Callable[[], None] | None = None,
 ) -> None:
     async with browser.client().open_channel() as channel:
         try:
-            while True:
-                await _tunnel(channel, websocket)
+            await _tunnel(channel, websocket, on_activity)
         except ChannelClosed:
             await close_callback(browser)
+        except WebSocketDisconnect:
+            logging.info(f"Client disconnected from browser {browser.workspace()}")
         except Exception as err:
             logging.error(
                 f"""
@@ -44,23 +175,36 @@ async def communicate_until_closed(
 
 
 async def _tunnel(
-    source: Channel,
-    target: Channel,
-    timeout: float = 0.001,
+    first: Channel, second: Channel, on_activity: Callable[[], None] | None = None
 ) -> None:
-    await _tunnel_one_way(source, target, timeout)
-    await _tunnel_one_way(target, source, timeout)
+    """
+    Pump data in both directions concurrently until one side closes or fails.
+    The remaining pump is cancelled and the error of the failing side is re-raised,
+    so that closing one end of the tunnel tears down the other one as well.
+    on_activity is called for every message passed through.
+    """
+    pumps = [
+        asyncio.create_task(_pump(first, second, on_activity)),
+        asyncio.create_task(_pump(second, first, on_activity)),
+    ]
+
+    try:
+        done, _ = await asyncio.wait(pumps, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for pump in pumps:
+            pump.cancel()
+        await asyncio.gather(*pumps, return_exceptions=True)
+
+    for pump in pumps:
+        if pump in done:
+            pump.result()
 
 
-async def _tunnel_one_way(
-    source: Channel,
-    target: Channel,
-    timeout: float,
+async def _pump(
+    source: Channel, target: Channel, on_activity: Callable[[], None] | None
 ) -> None:
-    try:
-        source_data = await asyncio.wait_for(source.receive_bytes(), timeout)
-        await target.send_bytes(source_data)
-    except asyncio.exceptions.TimeoutError:
-        # a timeout is rather common if no data is being sent,
-        # so we are simply ignoring this exception
-        pass
+    while True:
+        data = await source.receive_bytes()
+        await target.send_bytes(data)
+        if on_activity is not None:
+            on_activity()
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import logging
+
+from ocrdbrowser import NoPortsAvailableError, OcrdBrowser, OcrdBrowserFactory
+from ocrdmonitor.protocols import BrowserProcessRepository
+
+from ._activity import ActivityTracker
+from ._proxyroutes import stop_and_remove_browser
+
+
+class CapacityManager:
+    """
+    Launches browsers and, when no ports are left, makes room by stopping
+    the least recently used browser that has been idle for at least min_idle_age.
+    """
+
+    def __init__(self, activity: ActivityTracker, min_idle_age: float) -> None:
+        self._activity = activity
+        self._min_idle_age = min_idle_age
+        self.evictions = 0
+        self.exhausted = 0
+
+    async def launch(
+        self,
+        factory: OcrdBrowserFactory,
+        repository: BrowserProcessRepository,
+        owner: str,
+        workspace: str,
+    ) -> OcrdBrowser:
+        try:
+            browser = await factory(owner, workspace)
+        except NoPortsAvailableError:
+            if not await self.evict(repository):
+                self.exhausted += 1
+                raise
+
+            browser = await factory(owner, workspace)
+
+        self._activity.touch(browser)
+        return browser
+
+    async def evict(self, repository: BrowserProcessRepository) -> OcrdBrowser | None:
+        candidates = self._activity.idle_browsers(
+            await repository.find(), self._min_idle_age
+        )
+        if not candidates:
+            logging.warning("No ports left and no browser idle long enough to evict")
+            return None
+
+        victim = candidates[0]
+        logging.info(
+            f"Evicting browser {victim.workspace()} of {victim.owner()}, "
+            + f"idle for {self._activity.idle_for(victim):.0f}s"
+        )
+        await stop_and_remove_browser(repository, victim)
+        self._activity.forget(victim)
+        self.evictions += 1
+        return victim
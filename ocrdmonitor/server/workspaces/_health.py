@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from ocrdbrowser import HibernatingBrowser, LivenessCheckingBrowser, OcrdBrowser
+from ocrdmonitor.protocols import BrowserProcessRepository
+
+from ._proxyroutes import stop_and_remove_browser
+
+FAILURES = 3
+
+
+class HealthSweep:
+    """
+    Periodically removes browsers that are no longer running or reachable.
+
+    Browsers that can tell cheaply whether their process is still alive
+    (pid or container state) are checked that way first, only the survivors
+    are pinged, except hibernating ones which cannot answer. At most
+    `concurrency` browsers are checked at once and every check is cut off
+    after `timeout` seconds.
+
+    A browser whose process is gone is removed right away, while one that
+    does not answer is only removed after `failures` consecutive
+    sweeps, so that a briefly busy browser does not lose its session.
+    Only the first sweep, which cleans up after a previous run,
+    removes browsers on their first failure.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        concurrency: int,
+        timeout: float,
+        failures: int = FAILURES,
+    ) -> None:
+        self._interval = interval
+        self._concurrency = concurrency
+        self._timeout = timeout
+        self._failures = failures
+        self._failed: dict[str, int] = {}
+        self._task: asyncio.Task[None] | None = None
+        self.sweeps = 0
+        self.removed = 0
+
+    def start(self, repository: BrowserProcessRepository) -> None:
+        """Run the first sweep right away and then every interval in the background"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(repository))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def sweep(
+        self, repository: BrowserProcessRepository, failures: int | None = None
+    ) -> list[OcrdBrowser]:
+        """Remove unhealthy browsers, failures overrides the configured number"""
+        limit = asyncio.Semaphore(self._concurrency)
+        # only failures of the previous sweep count, so recovered browsers
+        # and browsers removed in the meantime are forgotten
+        failed = self._failed
+        self._failed = {}
+
+        async def check(browser: OcrdBrowser) -> OcrdBrowser | None:
+            async with limit:
+                if await self._is_healthy(browser, failed, failures or self._failures):
+                    return None
+
+                logging.info(f"Removing unhealthy browser {browser.workspace()}")
+                try:
+                    await stop_and_remove_browser(repository, browser)
+                except Exception as err:
+                    logging.error(f"Could not remove {browser.workspace()}: {err!r}")
+                    return None
+
+                return browser
+
+        results = await asyncio.gather(
+            *(check(browser) for browser in await repository.find())
+        )
+        removed = [browser for browser in results if browser is not None]
+        self.removed += len(removed)
+        self.sweeps += 1
+        return removed
+
+    async def _is_healthy(
+        self, browser: OcrdBrowser, failed: dict[str, int], failures: int
+    ) -> bool:
+        try:
+            if isinstance(browser, LivenessCheckingBrowser):
+                if not await asyncio.wait_for(browser.is_alive(), self._timeout):
+                    return False
+
+            if isinstance(browser, HibernatingBrowser) and browser.is_hibernating():
+                return True
+
+            await asyncio.wait_for(
+                browser.client().get("/", timeout=self._timeout), self._timeout
+            )
+            return True
+        except (ConnectionError, asyncio.TimeoutError) as err:
+            failed_in_a_row = failed.get(browser.address(), 0) + 1
+            self._failed[browser.address()] = failed_in_a_row
+            if failed_in_a_row >= failures:
+                return False
+
+            logging.warning(
+                f"Browser {browser.workspace()} failed health check "
+                f"{failed_in_a_row} of {failures}: {err!r}"
+            )
+            return True
+
+    async def _run(self, repository: BrowserProcessRepository) -> None:
+        # browsers left unreachable by a previous run are removed right away
+        failures: int | None = 1
+        while True:
+            try:
+                await self.sweep(repository, failures)
+                failures = None
+            except Exception as err:
+                logging.error(f"Browser health sweep failed: {err!r}")
+
+            await asyncio.sleep(self._interval)
@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Iterable
+
+from ocrdbrowser import HibernatingBrowser, OcrdBrowser
+from ocrdmonitor.protocols import BrowserProcessRepository
+
+from ._activity import ActivityTracker
+
+
+class Hibernator:
+    """
+    Suspends browsers without traffic for hibernate_after seconds
+    and resumes them as soon as they are requested again.
+    Suspended browsers keep their memory but use no CPU,
+    and resuming takes milliseconds instead of the seconds a relaunch costs.
+    Without hibernate_after browsers are only resumed, never suspended.
+    """
+
+    def __init__(
+        self, activity: ActivityTracker, hibernate_after: float | None = None
+    ) -> None:
+        self._activity = activity
+        self._hibernate_after = hibernate_after
+        # process ids hibernated by this process, so that open connections
+        # (which hold a browser restored before the hibernation) can wake them
+        self._asleep: set[str] = set()
+        self._waking: dict[str, asyncio.Task[None]] = {}
+        self.hibernated = 0
+        self.resumed = 0
+        self.failed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self._hibernate_after is not None
+
+    def is_asleep(self, browser: OcrdBrowser) -> bool:
+        return browser.process_id() in self._asleep or (
+            isinstance(browser, HibernatingBrowser) and browser.is_hibernating()
+        )
+
+    async def hibernate_idle(
+        self, repository: BrowserProcessRepository, browsers: Iterable[OcrdBrowser]
+    ) -> list[OcrdBrowser]:
+        if self._hibernate_after is None:
+            return []
+
+        idle = [
+            browser
+            for browser in self._activity.idle_browsers(browsers, self._hibernate_after)
+            if isinstance(browser, HibernatingBrowser) and not self.is_asleep(browser)
+        ]
+
+        hibernated: list[OcrdBrowser] = []
+        for browser in idle:
+            try:
+                await browser.hibernate()
+                await repository.set_hibernating(browser, True)
+            except Exception as err:
+                logging.error(f"Could not hibernate {browser.workspace()}: {err!r}")
+                self.failed += 1
+                continue
+
+            logging.info(f"Hibernated browser {browser.workspace()}")
+            self._asleep.add(browser.process_id())
+            hibernated.append(browser)
+            self.hibernated += 1
+
+        return hibernated
+
+    async def wake(
+        self, repository: BrowserProcessRepository, browser: OcrdBrowser
+    ) -> None:
+        """Resume the browser if it is hibernating, concurrent calls share one resume"""
+        if self.is_asleep(browser):
+            await asyncio.shield(self._resume(repository, browser))
+
+    def wake_soon(
+        self, repository: BrowserProcessRepository, browser: OcrdBrowser
+    ) -> None:
+        """Like wake, but without waiting, cheap enough to call for every message"""
+        if browser.process_id() in self._asleep:
+            self._resume(repository, browser)
+
+    def _resume(
+        self, repository: BrowserProcessRepository, browser: OcrdBrowser
+    ) -> asyncio.Task[None]:
+        process_id = browser.process_id()
+        task = self._waking.get(process_id)
+        if task is None:
+            task = asyncio.create_task(self._do_resume(repository, browser))
+            self._waking[process_id] = task
+            task.add_done_callback(lambda _: self._waking.pop(process_id, None))
+
+        return task
+
+    async def _do_resume(
+        self, repository: BrowserProcessRepository, browser: OcrdBrowser
+    ) -> None:
+        self._asleep.discard(browser.process_id())
+        if not isinstance(browser, HibernatingBrowser):
+            return
+
+        try:
+            await browser.resume()
+            await repository.set_hibernating(browser, False)
+        except Exception as err:
+            logging.error(f"Could not resume {browser.workspace()}: {err!r}")
+            self.failed += 1
+            return
+
+        logging.info(f"Resumed browser {browser.workspace()}")
+        self._activity.touch(browser)
+        self.resumed += 1
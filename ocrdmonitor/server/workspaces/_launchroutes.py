@@ -1,3 +1,4 @@
+import logging
 import uuid
 from pathlib import Path
 from typing import Callable
@@ -8,6 +9,9 @@ from fastapi.templating import Jinja2Templates
 from ocrdbrowser import OcrdBrowserFactory
 from ocrdmonitor.protocols import BrowserProcessRepository
 
+from ._capacity import CapacityManager
+from ._singleflight import SingleFlight
+
 
 def session_response(session_id: str) -> Response:
     response = Response()
@@ -21,7 +25,11 @@ def register_launchroutes(
     browser_factory: Callable[[], OcrdBrowserFactory],
     browser_repository: Callable[[], BrowserProcessRepository],
     full_workspace: Callable[[str | Path], str],
+    capacity: CapacityManager,
 ) -> None:
+    # a double page load or two tabs must not start two browsers
+    launches: SingleFlight[None] = SingleFlight()
+
     @router.get("/open/{workspace:path}", name="workspaces.open")
     def open_workspace(request: Request, workspace: str) -> Response:
         session_id = request.cookies.setdefault("session_id", str(uuid.uuid4()))
@@ -40,10 +48,16 @@ def register_launchroutes(
         session_id: str = Cookie(),
     ) -> Response:
         full_path = full_workspace(workspace)
-        existing_browsers = await repository.find(owner=session_id, workspace=full_path)
 
-        if not existing_browsers:
-            browser = await factory(session_id, full_path)
-            await repository.insert(browser)
+        async def launch_unless_running() -> None:
+            if await repository.find(owner=session_id, workspace=full_path):
+                return
+
+            browser = await capacity.launch(factory, repository, session_id, full_path)
+            if not await repository.insert(browser):
+                # another worker process has launched a browser in the meantime
+                logging.info(f"Discarding duplicate browser for {full_path}")
+                await browser.stop()
 
+        await launches.run((session_id, full_path), launch_unless_running)
         return session_response(session_id)
@@ -1,23 +1,110 @@
-from pathlib import Path
+from typing import Any
 
-from fastapi import APIRouter, Request, Response
+from fastapi import APIRouter, Query, Request, Response
 from fastapi.templating import Jinja2Templates
 
-from ocrdbrowser import workspace
+from ocrdbrowser import MetsSummary, summary_cache
 from ocrdmonitor.server.settings import OcrdBrowserSettings
 
+from ._workspacelist import BackgroundWorkspaceLister, WorkspacePage
+
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
 
 def register_listroutes(
     router: APIRouter, templates: Jinja2Templates, browser_settings: OcrdBrowserSettings
 ) -> None:
+    workspace_dir = browser_settings.workspace_dir
+    lister = BackgroundWorkspaceLister(
+        workspace_dir, browser_settings.workspace_list_ttl
+    )
+
+    async def summarize(page: WorkspacePage) -> dict[str, MetsSummary | None]:
+        mets_files = {
+            str(workspace_dir / entry.path / "mets.xml"): entry.path
+            for entry in page.entries
+            if entry.is_workspace
+        }
+        summaries = await summary_cache.summaries(
+            mets_files, browser_settings.mets_summary_timeout
+        )
+        return {mets_files[mets]: summary for mets, summary in summaries.items()}
+
     @router.get("/", name="workspaces.list")
-    def list_workspaces(request: Request) -> Response:
-        spaces = [
-            Path(space).relative_to(browser_settings.workspace_dir)
-            for space in workspace.list_all(browser_settings.workspace_dir)
-        ]
+    async def list_workspaces(request: Request, refresh: bool = False) -> Response:
+        listing = await lister.get(refresh)
+        page = listing.find(limit=PAGE_SIZE)
+        summaries = await summarize(page)
 
         return templates.TemplateResponse(
             "list_workspaces.html.j2",
-            {"request": request, "workspaces": spaces},
+            {
+                "request": request,
+                "workspaces": [entry.path for entry in page.entries],
+                "summaries": summaries,
+                "next_cursor": page.next_cursor,
+                "total": len(listing.workspaces),
+                "age": int(listing.age),
+                "refreshing": lister.is_refreshing,
+            },
         )
+
+    @router.get("/api", name="workspaces.api")
+    async def workspaces_api(
+        request: Request,
+        parent: str | None = None,
+        prefix: str = "",
+        search: str = "",
+        cursor: str | None = None,
+        limit: int = Query(PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+        refresh: bool = False,
+    ) -> dict[str, Any]:
+        """
+        Without parent, all workspaces matching prefix and search are listed.
+        With parent (use an empty value for the workspace root), the workspaces
+        and directories directly inside parent are listed for lazy tree views.
+        """
+        listing = await lister.get(refresh)
+        if parent is None:
+            page = listing.find(prefix, search, cursor, limit)
+        else:
+            page = listing.children(parent, cursor, limit)
+
+        summaries = await summarize(page)
+
+        return {
+            "entries": _entries(request, page, summaries),
+            "next_cursor": page.next_cursor,
+            "total": len(listing.workspaces),
+            "age": int(listing.age),
+        }
+
+
+def _entries(
+    request: Request, page: WorkspacePage, summaries: dict[str, MetsSummary | None]
+) -> list[dict[str, Any]]:
+    return [
+        {
+            "path": entry.path,
+            "name": entry.name,
+            "type": "workspace" if entry.is_workspace else "directory",
+            "workspaces": entry.workspaces,
+            "url": str(request.url_for("workspaces.open", workspace=entry.path))
+            if entry.is_workspace
+            else None,
+            "summary": _summary(summaries.get(entry.path)),
+        }
+        for entry in page.entries
+    ]
+
+
+def _summary(summary: MetsSummary | None) -> dict[str, Any] | None:
+    if summary is None:
+        return None
+
+    return {
+        "pages": summary.pages,
+        "files": summary.files,
+        "file_groups": summary.file_groups,
+    }
@@ -0,0 +1,56 @@
+from typing import Any
+
+from fastapi import APIRouter
+
+from ocrdbrowser import BroadwayAssetCache, launch_times
+
+from ._capacity import CapacityManager
+from ._health import HealthSweep
+from ._hibernation import Hibernator
+from ._reaper import IdleReaper
+
+
+def register_metricsroutes(
+    router: APIRouter,
+    capacity: CapacityManager,
+    reaper: IdleReaper,
+    health: HealthSweep,
+    hibernator: Hibernator,
+    asset_cache: BroadwayAssetCache,
+) -> None:
+    @router.get("/metrics", name="workspaces.metrics")
+    async def metrics() -> dict[str, Any]:
+        return {
+            "launches": {
+                "count": launch_times.count,
+                "mean_seconds": launch_times.mean,
+                "last_seconds": launch_times.last,
+                "slowest_seconds": launch_times.slowest,
+            },
+            "evictions": {
+                "count": capacity.evictions,
+                "exhausted": capacity.exhausted,
+            },
+            "idle_reaper": {
+                "dry_run": reaper.dry_run,
+                "sweeps": reaper.sweeps,
+                "reaped": reaper.reaped,
+                "would_reap": reaper.would_reap,
+                "failed": reaper.failed,
+            },
+            "health": {
+                "sweeps": health.sweeps,
+                "removed": health.removed,
+            },
+            "hibernation": {
+                "enabled": hibernator.enabled,
+                "hibernated": hibernator.hibernated,
+                "resumed": hibernator.resumed,
+                "failed": hibernator.failed,
+            },
+            "assets": {
+                "hits": asset_cache.hits,
+                "misses": asset_cache.misses,
+                "size": asset_cache.size,
+            },
+        }
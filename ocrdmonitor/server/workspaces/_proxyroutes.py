@@ -8,10 +8,17 @@ from typing import Callable
 from fastapi import APIRouter, Cookie, Request, Response, WebSocket
 from fastapi.templating import Jinja2Templates
 
-from ocrdbrowser import OcrdBrowser
+from ocrdbrowser import BroadwayAssetCache, OcrdBrowser
 from ocrdmonitor.protocols import BrowserProcessRepository
 
-from ._browsercommunication import CloseCallback, communicate_until_closed, forward
+from ._activity import ActivityTracker
+from ._hibernation import Hibernator
+from ._browsercommunication import (
+    CloseCallback,
+    communicate_until_closed,
+    forward,
+    ping,
+)
 
 
 async def stop_and_remove_browser(
@@ -23,18 +30,6 @@ async def stop_and_remove_browser(
         logging.info(f"Stopping browser {browser.workspace()}")
 
 
-async def first_owned_browser_in_workspace(
-    session_id: str, workspace: str, repository: BrowserProcessRepository
-) -> OcrdBrowser | None:
-    def in_workspace(browser: OcrdBrowser) -> bool:
-        return workspace.startswith(browser.workspace())
-
-    browsers_in_workspace = filter(
-        in_workspace, await repository.find(owner=session_id)
-    )
-    return next(browsers_in_workspace, None)
-
-
 def browser_closed_callback(repository: BrowserProcessRepository) -> CloseCallback:
     async def _callback(browser: OcrdBrowser) -> None:
         await stop_and_remove_browser(repository, browser)
@@ -51,6 +46,9 @@ def register_proxyroutes(
     templates: Jinja2Templates,
     browser_repository: Callable[[], BrowserProcessRepository],
     full_workspace: Callable[[str | Path], str],
+    asset_cache: BroadwayAssetCache,
+    activity: ActivityTracker,
+    hibernator: Hibernator,
 ) -> None:
     @router.get("/ping/{workspace:path}", name="workspaces.ping")
     async def ping_workspace(
@@ -58,15 +56,15 @@ def register_proxyroutes(
         repository: BrowserProcessRepository = browser_repository,  # type: ignore[assignment]
         session_id: str = Cookie(),
     ) -> Response:
-        browser = await repository.first(
-            owner=session_id, workspace=full_workspace(workspace)
-        )
+        path = full_workspace(workspace)
+        browser = await repository.first(owner=session_id, workspace=path)
 
         if not browser:
             return Response(status_code=404)
 
+        await hibernator.wake(repository, browser)
         try:
-            await forward(browser, str(workspace))
+            await ping(browser, path)
             return Response(status_code=200)
         except ConnectionError:
             return Response(status_code=502)
@@ -74,7 +72,9 @@ def register_proxyroutes(
     # NOTE: It is important that the route path here ends with a slash, otherwise
     #       the reverse routing will not work as broadway.js uses window.location
     #       which points to the last component with a trailing slash.
-    @router.get("/view/{workspace:path}/", name="workspaces.view")
+    @router.api_route(
+        "/view/{workspace:path}/", methods=["GET", "HEAD"], name="workspaces.view"
+    )
     async def workspace_reverse_proxy(
         request: Request,
         workspace: Path,
@@ -85,17 +85,18 @@ def register_proxyroutes(
         # Therefore we try to get it from the request if it is None
         session_id = get_session_id(request, session_id)
 
-        browser = await first_owned_browser_in_workspace(
-            session_id, full_workspace(workspace), repository
-        )
+        path = full_workspace(workspace)
+        browser = await repository.find_containing(owner=session_id, path=path)
 
         if not browser:
             return Response(
                 content=f"No browser found for {workspace} and session ID {session_id}",
                 status_code=404,
             )
+        activity.touch(browser)
+        await hibernator.wake(repository, browser)
         try:
-            return await forward(browser, str(workspace))
+            return await forward(browser, request, path, asset_cache)
         except ConnectionError:
             await stop_and_remove_browser(repository, browser)
             return templates.TemplateResponse(
@@ -118,9 +119,17 @@ def register_proxyroutes(
             await websocket.close(reason="No browser found")
             return
 
+        await hibernator.wake(repository, browser)
         await websocket.accept(subprotocol="broadway")
+
+        def on_activity() -> None:
+            activity.touch(browser)
+            # the browser may have been hibernated while the socket was open
+            hibernator.wake_soon(repository, browser)
+
         await communicate_until_closed(
             websocket,
             browser,
             close_callback=browser_closed_callback(repository),
+            on_activity=on_activity,
         )
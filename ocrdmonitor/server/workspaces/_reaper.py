@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+
+from ocrdbrowser import OcrdBrowser
+from ocrdmonitor.protocols import BrowserProcessRepository
+
+from ._activity import ActivityTracker
+from ._hibernation import Hibernator
+from ._proxyroutes import stop_and_remove_browser
+
+
+class IdleReaper:
+    """
+    Periodically stops browsers without traffic for idle_timeout seconds
+    and removes them from the repository. With a hibernator, the remaining
+    browsers that have been idle long enough are hibernated on the same sweep.
+    In dry-run mode the browsers are only logged (and counted on every sweep)
+    and nothing is hibernated.
+    """
+
+    def __init__(
+        self,
+        activity: ActivityTracker,
+        idle_timeout: float,
+        interval: float,
+        dry_run: bool = False,
+        hibernator: Hibernator | None = None,
+    ) -> None:
+        self._activity = activity
+        self._hibernator = hibernator
+        self._idle_timeout = idle_timeout
+        self._interval = interval
+        self._dry_run = dry_run
+        self._task: asyncio.Task[None] | None = None
+        self.sweeps = 0
+        self.reaped = 0
+        self.would_reap = 0
+        self.failed = 0
+
+    @property
+    def dry_run(self) -> bool:
+        return self._dry_run
+
+    def start(self, repository: BrowserProcessRepository) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(repository))
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def reap(self, repository: BrowserProcessRepository) -> list[OcrdBrowser]:
+        browsers = await repository.find()
+        idle = self._activity.idle_browsers(browsers, self._idle_timeout)
+        for browser in idle:
+            await self._reap(repository, browser)
+
+        if self._hibernator is not None and not self._dry_run:
+            remaining = [browser for browser in browsers if browser not in idle]
+            await self._hibernator.hibernate_idle(repository, remaining)
+
+        self.sweeps += 1
+        return idle
+
+    async def _reap(
+        self, repository: BrowserProcessRepository, browser: OcrdBrowser
+    ) -> None:
+        idle_for = self._activity.idle_for(browser)
+        if self._dry_run:
+            logging.info(
+                f"Would stop browser {browser.workspace()} idle for {idle_for:.0f}s"
+            )
+            self.would_reap += 1
+            return
+
+        logging.info(f"Stopping browser {browser.workspace()} idle for {idle_for:.0f}s")
+        try:
+            await stop_and_remove_browser(repository, browser)
+        except Exception as err:
+            logging.error(f"Could not stop idle browser {browser.workspace()}: {err!r}")
+            self.failed += 1
+            return
+
+        self._activity.forget(browser)
+        self.reaped += 1
+
+    async def _run(self, repository: BrowserProcessRepository) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.reap(repository)
+            except Exception as err:
+                logging.error(f"Reaping idle browsers failed: {err!r}")
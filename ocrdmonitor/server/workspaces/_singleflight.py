@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    Runs at most one call per key at a time, concurrent callers for the same key
+    wait for the call in flight and share its result (or exception).
+    The call is not cancelled when a waiting caller is, e.g. on a closed connection.
+    """
+
+    def __init__(self) -> None:
+        self._in_flight: dict[Hashable, asyncio.Task[T]] = {}
+
+    async def run(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(_await(call))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+
+        return await asyncio.shield(task)
+
+    def __len__(self) -> int:
+        return len(self._in_flight)
+
+
+async def _await(call: Callable[[], Awaitable[T]]) -> T:
+    return await call()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from bisect import bisect_left, bisect_right
+from itertools import islice
+from pathlib import Path
+from typing import Callable, NamedTuple
+
+from ocrdbrowser import workspace
+
+
+class WorkspaceEntry(NamedTuple):
+    path: str
+    is_workspace: bool
+    workspaces: int
+
+    @property
+    def name(self) -> str:
+        return self.path.rpartition("/")[2]
+
+    @property
+    def cursor(self) -> str:
+        # directories get a trailing slash, so a workspace and a directory
+        # of the same name can be told apart when resuming
+        return self.path if self.is_workspace else self.path + "/"
+
+
+class WorkspacePage(NamedTuple):
+    entries: list[WorkspaceEntry]
+    next_cursor: str | None
+
+
+class WorkspaceList(NamedTuple):
+    """
+    Workspace paths relative to the workspace directory, sorted as strings.
+    The sort order keeps every directory's contents in one contiguous range,
+    so prefix lookups and directory listings are binary searches.
+    """
+
+    workspaces: list[str]
+    updated_at: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.updated_at
+
+    def find(
+        self,
+        prefix: str = "",
+        search: str = "",
+        cursor: str | None = None,
+        limit: int = 100,
+    ) -> WorkspacePage:
+        """
+        Workspaces starting with prefix and containing search (ignoring case),
+        beginning after cursor
+        """
+        start = bisect_left(self.workspaces, prefix)
+        if cursor:
+            start = max(start, bisect_right(self.workspaces, cursor))
+
+        needle = search.lower()
+        entries: list[WorkspaceEntry] = []
+        for path in islice(self.workspaces, start, None):
+            if not path.startswith(prefix) or len(entries) > limit:
+                break
+
+            if needle in path.lower():
+                entries.append(WorkspaceEntry(path, True, 1))
+
+        return _page(entries, limit)
+
+    def children(
+        self, parent: str = "", cursor: str | None = None, limit: int = 100
+    ) -> WorkspacePage:
+        """
+        The workspaces and directories directly inside parent, beginning after cursor.
+        Directories are reported with the number of workspaces they contain.
+        """
+        parent = parent.strip("/")
+        prefix = parent + "/" if parent else ""
+        index = bisect_left(self.workspaces, prefix)
+        if cursor:
+            index = max(index, self._resume(cursor))
+
+        entries: list[WorkspaceEntry] = []
+        while index < len(self.workspaces) and len(entries) <= limit:
+            path = self.workspaces[index]
+            if not path.startswith(prefix):
+                break
+
+            name, separator, _ = path[len(prefix) :].partition("/")
+            if not separator:
+                entries.append(WorkspaceEntry(path, True, 1))
+                index += 1
+            else:
+                end = self._end_of_directory(prefix + name)
+                entries.append(WorkspaceEntry(prefix + name, False, end - index))
+                index = end
+
+        return _page(entries, limit)
+
+    def _resume(self, cursor: str) -> int:
+        if cursor.endswith("/"):
+            return self._end_of_directory(cursor.rstrip("/"))
+
+        return bisect_right(self.workspaces, cursor)
+
+    def _end_of_directory(self, directory: str) -> int:
+        # "0" directly follows "/", hence every path below directory
+        # sorts before directory + "0"
+        return bisect_left(self.workspaces, directory + "0")
+
+
+def _page(entries: list[WorkspaceEntry], limit: int) -> WorkspacePage:
+    if len(entries) > limit:
+        return WorkspacePage(entries[:limit], entries[limit - 1].cursor)
+
+    return WorkspacePage(entries, None)
+
+
+class BackgroundWorkspaceLister:
+    """
+    Serves the last known workspace list immediately and refreshes it
+    in the background once it is older than the TTL or a refresh is requested.
+    At most one refresh runs at a time, concurrent requests share it.
+    """
+
+    def __init__(
+        self,
+        workspace_dir: Path,
+        ttl: float,
+        list_workspaces: Callable[[Path], list[str]] = workspace.list_all,
+    ) -> None:
+        self._workspace_dir = workspace_dir
+        self._ttl = ttl
+        self._list_workspaces = list_workspaces
+        self._current: WorkspaceList | None = None
+        self._refreshing: asyncio.Task[WorkspaceList] | None = None
+
+    async def get(self, refresh: bool = False) -> WorkspaceList:
+        if self._current is None:
+            # nothing to serve yet, so we have to wait for the first listing
+            return await asyncio.shield(self._refresh())
+
+        if refresh or self._current.age > self._ttl:
+            self._refresh()
+
+        return self._current
+
+    @property
+    def is_refreshing(self) -> bool:
+        return self._refreshing is not None and not self._refreshing.done()
+
+    def _refresh(self) -> asyncio.Task[WorkspaceList]:
+        if self._refreshing is None or self._refreshing.done():
+            self._refreshing = asyncio.create_task(self._list())
+            self._refreshing.add_done_callback(_log_failure)
+
+        return self._refreshing
+
+    async def _list(self) -> WorkspaceList:
+        spaces = await asyncio.to_thread(self._list_workspaces, self._workspace_dir)
+        self._current = WorkspaceList(
+            sorted(
+                Path(space).relative_to(self._workspace_dir).as_posix()
+                for space in spaces
+            ),
+            time.time(),
+        )
+        return self._current
+
+
+def _log_failure(task: asyncio.Task[WorkspaceList]) -> None:
+    if not task.cancelled() and task.exception() is not None:
+        logging.error(f"Listing workspaces failed: {task.exception()!r}")
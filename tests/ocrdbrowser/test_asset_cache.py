@@ -0,0 +1,44 @@
+from ocrdbrowser import BroadwayAssetCache
+
+
+def test__only_broadway_client_files_are_cacheable() -> None:
+    sut = BroadwayAssetCache()
+
+    assert sut.is_cacheable("")
+    assert sut.is_cacheable("/broadway.js")
+    assert sut.is_cacheable("broadway.js?version=1")
+    assert not sut.is_cacheable("/some/image.png")
+
+
+def test__stored_asset__is_found_and_counted_as_hit() -> None:
+    sut = BroadwayAssetCache()
+
+    assert sut.lookup("/broadway.js") is None
+    stored = sut.store("/broadway.js", b"content", "text/javascript")
+    found = sut.lookup("/broadway.js")
+
+    assert found == stored
+    assert (sut.hits, sut.misses) == (1, 1)
+
+
+def test__identical_content_under_different_paths__is_stored_once() -> None:
+    sut = BroadwayAssetCache()
+
+    first = sut.store("/", b"<html></html>", "text/html")
+    second = sut.store("/client.html", b"<html></html>", "text/html")
+
+    assert first.etag == second.etag
+    assert sut.size == len(b"<html></html>")
+
+
+def test__exceeding_max_size__evicts_least_recently_used_asset() -> None:
+    sut = BroadwayAssetCache(max_size=10)
+    sut.store("/", b"12345", "text/html")
+    sut.store("/broadway.js", b"abcde", "text/javascript")
+    sut.lookup("/")
+
+    sut.store("/broadway.css", b"vwxyz", "text/css")
+
+    assert sut.lookup("/broadway.js") is None
+    assert sut.lookup("/") is not None
+    assert sut.size == 10
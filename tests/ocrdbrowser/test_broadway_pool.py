@@ -0,0 +1,99 @@
+import asyncio
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+from ocrdbrowser import BroadwayDaemon, BroadwayPool, NoPortsAvailableError
+
+
+class SleepingDaemonLauncher:
+    def __init__(self, ports: int = 100) -> None:
+        self.ports = list(range(9000, 9000 + ports))
+        self.launched: list[BroadwayDaemon] = []
+
+    async def __call__(self) -> BroadwayDaemon:
+        if not self.ports:
+            raise NoPortsAvailableError()
+
+        process = await asyncio.create_subprocess_exec("sleep", "60")
+        daemon = BroadwayDaemon(process, self.ports.pop(0))
+        self.launched.append(daemon)
+        return daemon
+
+
+async def filled(pool: BroadwayPool, size: int) -> BroadwayPool:
+    async with asyncio.timeout(5):
+        while len(pool) < size:
+            await asyncio.sleep(0.01)
+
+    return pool
+
+
+@pytest_asyncio.fixture
+async def launcher() -> AsyncIterator[SleepingDaemonLauncher]:
+    launcher = SleepingDaemonLauncher()
+    yield launcher
+    for daemon in launcher.launched:
+        daemon.kill()
+        await daemon.process.wait()
+
+
+@pytest.mark.asyncio
+async def test__taking_a_daemon__refills_the_pool(
+    launcher: SleepingDaemonLauncher,
+) -> None:
+    sut = BroadwayPool(2, launcher)
+    sut.refill()
+    await filled(sut, 2)
+
+    daemon = sut.take()
+
+    assert daemon is not None and daemon.is_running
+    assert daemon.port not in sut.ports()
+    await filled(sut, 2)
+    assert len(launcher.launched) == 3
+    await sut.close()
+
+
+@pytest.mark.asyncio
+async def test__pool__skips_daemons_that_exited_while_idle(
+    launcher: SleepingDaemonLauncher,
+) -> None:
+    sut = BroadwayPool(1, launcher)
+    sut.refill()
+    await filled(sut, 1)
+    launcher.launched[0].kill()
+    await launcher.launched[0].process.wait()
+
+    assert sut.take() is None
+    await sut.close()
+
+
+@pytest.mark.asyncio
+async def test__pool_without_free_ports__stops_filling() -> None:
+    launcher = SleepingDaemonLauncher(ports=1)
+    sut = BroadwayPool(3, launcher)
+
+    sut.refill()
+    await filled(sut, 1)
+    await asyncio.sleep(0.05)
+
+    assert len(sut) == 1
+    await sut.close()
+    await launcher.launched[0].process.wait()
+
+
+@pytest.mark.asyncio
+async def test__closing_the_pool__kills_idle_daemons(
+    launcher: SleepingDaemonLauncher,
+) -> None:
+    sut = BroadwayPool(2, launcher)
+    sut.refill()
+    await filled(sut, 2)
+
+    await sut.close()
+
+    codes = [await daemon.process.wait() for daemon in launcher.launched]
+    assert all(code != 0 for code in codes)
+    assert len(sut) == 0
@@ -0,0 +1,84 @@
+import asyncio
+import threading
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+
+from ocrdbrowser import HttpBrowserClient, HttpClientPool
+
+ADDRESS = "http://browser.example.com:9000"
+
+
+@pytest.mark.asyncio
+async def test__requesting_client_for_same_address__reuses_the_client() -> None:
+    sut = HttpClientPool()
+
+    first = sut.client(ADDRESS)
+    second = sut.client(ADDRESS)
+
+    assert first is second
+    await sut.close_all()
+
+
+@pytest.mark.asyncio
+async def test__closing_address__closes_and_forgets_its_client() -> None:
+    sut = HttpClientPool()
+    client = sut.client(ADDRESS)
+
+    await sut.close(ADDRESS)
+
+    assert client.is_closed
+    assert ADDRESS not in sut
+    assert sut.client(ADDRESS) is not client
+    await sut.close_all()
+
+
+def test__closing_all__closes_clients_bound_to_other_event_loops() -> None:
+    sut = HttpClientPool()
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+
+    async def create_client() -> httpx.AsyncClient:
+        return sut.client(ADDRESS)
+
+    try:
+        client = asyncio.run_coroutine_threadsafe(create_client(), other_loop).result()
+        asyncio.run(sut.close_all())
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
+
+    assert client.is_closed
+    assert ADDRESS not in sut
+
+
+@pytest.mark.asyncio
+async def test__browser_clients_for_same_address__share_pooled_connection(
+    httpx_mock: HTTPXMock,
+) -> None:
+    httpx_mock.add_response(url=ADDRESS + "/", content=b"content")
+    pool = HttpClientPool()
+
+    await HttpBrowserClient(ADDRESS, pool).get("/")
+    content = await HttpBrowserClient(ADDRESS, pool).get("/")
+
+    assert content == b"content"
+    assert len(httpx_mock.get_requests()) == 2
+    assert pool.client(ADDRESS) is pool.client(ADDRESS)
+    await pool.close_all()
+
+
+@pytest.mark.asyncio
+async def test__request_timing_out__raises_connection_error(
+    httpx_mock: HTTPXMock,
+) -> None:
+    httpx_mock.add_exception(httpx.ReadTimeout("timed out"))
+    pool = HttpClientPool()
+
+    with pytest.raises(ConnectionError):
+        await HttpBrowserClient(ADDRESS, pool).get("/", timeout=0.1)
+
+    await pool.close_all()
@@ -0,0 +1,146 @@
+import asyncio
+import socket
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+from ocrdbrowser import (
+    DockerApiError,
+    DockerEngineClient,
+    DockerOcrdBrowser,
+    DockerOcrdBrowserFactory,
+    PortAllocator,
+)
+from tests.testdoubles import DockerDaemonFake
+
+HOST = "http://127.0.0.1"
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+@pytest_asyncio.fixture
+async def daemon(tmp_path: Path) -> AsyncIterator[DockerDaemonFake]:
+    async with DockerDaemonFake(tmp_path / "docker.sock") as daemon:
+        yield daemon
+
+
+@pytest_asyncio.fixture
+async def docker(daemon: DockerDaemonFake) -> AsyncIterator[DockerEngineClient]:
+    docker = DockerEngineClient(daemon.socket)
+    yield docker
+    await docker.close()
+
+
+@pytest.mark.asyncio
+async def test__launching__creates_and_starts_a_container_with_the_workspace_mounted(
+    daemon: DockerDaemonFake, docker: DockerEngineClient
+) -> None:
+    port = free_port()
+    sut = DockerOcrdBrowserFactory(HOST, {port}, docker)
+
+    browser = await sut("the-owner", "/data/the-workspace")
+
+    container = daemon.running()[0]
+    assert browser.process_id() == container.id
+    assert browser.address() == f"{HOST}:{port}"
+    assert container.name == "ocrd-browser-the-owner-the-workspace"
+    assert container.config["HostConfig"]["Binds"] == ["/data/the-workspace:/data"]
+
+
+@pytest.mark.asyncio
+async def test__launching__skips_ports_that_are_already_allocated(
+    daemon: DockerDaemonFake, docker: DockerEngineClient
+) -> None:
+    taken, free = free_port(), free_port()
+    blocker = await asyncio.start_server(lambda r, w: None, "127.0.0.1", taken)
+    ports = PortAllocator([taken, free])
+    sut = DockerOcrdBrowserFactory(HOST, ports, docker)
+
+    try:
+        browser = await sut("the-owner", "/data/the-workspace")
+    finally:
+        blocker.close()
+        await blocker.wait_closed()
+
+    assert browser.address() == f"{HOST}:{free}"
+    assert [c.host_port for c in daemon.containers.values()] == [free]
+
+
+@pytest.mark.asyncio
+async def test__launching__reports_other_daemon_errors(
+    daemon: DockerDaemonFake, docker: DockerEngineClient
+) -> None:
+    sut = DockerOcrdBrowserFactory(HOST, {free_port(), free_port()}, docker)
+    await sut("the-owner", "/data/the-workspace")
+
+    with pytest.raises(DockerApiError) as err:
+        await sut("the-owner", "/data/the-workspace")
+
+    assert err.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test__stopping__removes_the_container_and_releases_the_port(
+    daemon: DockerDaemonFake, docker: DockerEngineClient
+) -> None:
+    port = free_port()
+    ports = PortAllocator([port])
+    sut = DockerOcrdBrowserFactory(HOST, ports, docker)
+    browser = await sut("the-owner", "/data/the-workspace")
+    assert isinstance(browser, DockerOcrdBrowser)
+    assert await browser.is_alive()
+
+    await browser.stop()
+
+    assert not await browser.is_alive()
+    assert daemon.containers == {}
+    assert not ports.is_leased(port)
+
+
+@pytest.mark.asyncio
+async def test__stopping__a_vanished_container_is_not_an_error(
+    docker: DockerEngineClient,
+) -> None:
+    browser = DockerOcrdBrowser(
+        "the-owner", "/data/the-workspace", f"{HOST}:9000", "gone", docker=docker
+    )
+
+    await browser.stop()
+
+    assert not await browser.is_alive()
+
+
+@pytest.mark.asyncio
+async def test__stop_all__kills_running_containers_after_one_bulk_query(
+    daemon: DockerDaemonFake, docker: DockerEngineClient
+) -> None:
+    sut = DockerOcrdBrowserFactory(HOST, {free_port(), free_port()}, docker)
+    first = await sut("the-owner", "/data/first")
+    await sut("the-owner", "/data/second")
+    await first.stop()
+    daemon.requests.clear()
+
+    await sut.stop_all()
+
+    assert daemon.running() == []
+    assert daemon.requests.count("GET /v1.41/containers/json") == 1
+    assert len([r for r in daemon.requests if r.endswith("/kill")]) == 1
+
+
+@pytest.mark.asyncio
+async def test__running__maps_short_ids_to_running_containers(
+    daemon: DockerDaemonFake, docker: DockerEngineClient
+) -> None:
+    sut = DockerOcrdBrowserFactory(HOST, {free_port()}, docker)
+    browser = await sut("the-owner", "/data/the-workspace")
+    short_id = browser.process_id()[:12]
+
+    running = await docker.running([short_id, "0123456789ab"])
+
+    assert running == {short_id}
@@ -0,0 +1,91 @@
+import asyncio
+import os
+import signal
+import sys
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+from ocrdbrowser import (
+    DockerEngineClient,
+    DockerOcrdBrowser,
+    HibernatingBrowser,
+    SubProcessOcrdBrowser,
+)
+from ocrdbrowser._subprocess import _process_tree
+from tests.ocrdbrowser.test_docker_api import free_port
+from tests.testdoubles import DockerDaemonFake
+
+SLEEP = f"{sys.executable} -c 'import time; time.sleep(60)'"
+
+
+def process_state(pid: int) -> str:
+    with open(f"/proc/{pid}/stat") as stat:
+        return stat.read().rpartition(")")[2].split()[0]
+
+
+async def wait_for_state(pids: list[int], state: str) -> None:
+    async with asyncio.timeout(5):
+        while any(process_state(pid) != state for pid in pids):
+            await asyncio.sleep(0.01)
+
+
+@pytest_asyncio.fixture
+async def processes() -> AsyncIterator[tuple[int, int]]:
+    broadway = await asyncio.create_subprocess_shell(f"exec {SLEEP} broadwayd")
+    # like browse-ocrd, the browser runs as a child of a shell
+    browser = await asyncio.create_subprocess_shell(f"{SLEEP} browse-ocrd; true")
+    yield broadway.pid, browser.pid
+    for process in (broadway, browser):
+        for pid in _process_tree(process.pid):
+            os.kill(pid, signal.SIGCONT)
+            os.kill(pid, signal.SIGKILL)
+        await process.wait()
+
+
+@pytest.mark.asyncio
+async def test__subprocess_browser__stops_and_continues_its_process_tree(
+    processes: tuple[int, int],
+) -> None:
+    broadway_pid, shell_pid = processes
+    async with asyncio.timeout(5):
+        while len(_process_tree(shell_pid)) < 2:
+            await asyncio.sleep(0.01)
+    tree = [broadway_pid, *_process_tree(shell_pid)]
+    sut = SubProcessOcrdBrowser(
+        "owner", "/ws", "http://localhost:9000", f"{broadway_pid}-{shell_pid}"
+    )
+    assert isinstance(sut, HibernatingBrowser)
+
+    await sut.hibernate()
+    await wait_for_state(tree, "T")
+    assert sut.is_hibernating()
+
+    await sut.resume()
+    await wait_for_state(tree, "S")
+    assert not sut.is_hibernating()
+
+
+@pytest.mark.asyncio
+async def test__docker_browser__pauses_and_unpauses_its_container(
+    tmp_path: Path,
+) -> None:
+    async with DockerDaemonFake(tmp_path / "docker.sock") as daemon:
+        docker = DockerEngineClient(daemon.socket)
+        container_id = await docker.create("browser", "image", {}, {8085: free_port()})
+        await docker.start(container_id)
+        sut = DockerOcrdBrowser(
+            "owner", "/ws", "http://localhost:9000", container_id, docker=docker
+        )
+
+        await sut.hibernate()
+        paused = daemon.containers[container_id].paused
+        await sut.resume()
+        await sut.resume()
+
+        assert paused
+        assert not daemon.containers[container_id].paused
+        assert not sut.is_hibernating()
+        await docker.close()
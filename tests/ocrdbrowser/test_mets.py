@@ -0,0 +1,79 @@
+import os
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+from ocrdbrowser import MetsSummary, MetsSummaryCache
+from ocrdbrowser._mets import summarize
+
+METS = """<?xml version="1.0" encoding="UTF-8"?>
+<mets:mets xmlns:mets="http://www.loc.gov/METS/">
+  <mets:fileSec>
+    <mets:fileGrp USE="OCR-D-IMG">
+      <mets:file ID="IMG_1"/>
+      <mets:file ID="IMG_2"/>
+    </mets:fileGrp>
+    <mets:fileGrp USE="OCR-D-OCR">
+      <mets:file ID="OCR_1"/>
+    </mets:fileGrp>
+  </mets:fileSec>
+  <mets:structMap TYPE="LOGICAL">
+    <mets:div TYPE="page"/>
+  </mets:structMap>
+  <mets:structMap TYPE="PHYSICAL">
+    <mets:div TYPE="physSequence">
+      <mets:div TYPE="page"/>
+      <mets:div TYPE="page"/>
+    </mets:div>
+  </mets:structMap>
+</mets:mets>
+"""
+
+
+def write_mets(path: Path, content: str = METS) -> str:
+    path.write_text(content)
+    return str(path)
+
+
+@pytest_asyncio.fixture
+async def cache() -> AsyncIterator[MetsSummaryCache]:
+    cache = MetsSummaryCache(workers=1)
+    yield cache
+    cache.close()
+
+
+def test__summarize__counts_physical_pages_and_files_per_group(tmp_path: Path) -> None:
+    mets = write_mets(tmp_path / "mets.xml")
+
+    assert summarize(mets) == MetsSummary(
+        pages=2, file_groups={"OCR-D-IMG": 2, "OCR-D-OCR": 1}
+    )
+
+
+@pytest.mark.asyncio
+async def test__summary_cache__recomputes_only_modified_files(
+    tmp_path: Path, cache: MetsSummaryCache
+) -> None:
+    mets = write_mets(tmp_path / "mets.xml")
+    first = await cache.summaries([mets])
+
+    assert (await cache.summaries([mets]))[mets] is first[mets]
+
+    write_mets(tmp_path / "mets.xml", METS.replace('<mets:file ID="OCR_1"/>', ""))
+    stat = os.stat(mets)
+    os.utime(mets, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    changed = await cache.summaries([mets])
+
+    assert changed[mets] == MetsSummary(2, {"OCR-D-IMG": 2, "OCR-D-OCR": 0})
+
+
+@pytest.mark.asyncio
+async def test__summary_cache__reports_unreadable_files_as_none(
+    tmp_path: Path, cache: MetsSummaryCache
+) -> None:
+    broken = write_mets(tmp_path / "broken.xml", "<mets")
+    missing = str(tmp_path / "missing.xml")
+
+    assert await cache.summaries([broken, missing]) == {broken: None, missing: None}
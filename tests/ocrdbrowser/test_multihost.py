@@ -0,0 +1,199 @@
+import asyncio
+import time
+from contextlib import AsyncExitStack
+from pathlib import Path
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+from ocrdbrowser import (
+    BrowserHost,
+    MultiHostBrowserFactory,
+    NoPortsAvailableError,
+    PlacedBrowser,
+)
+from tests.ocrdbrowser.test_docker_api import free_port
+from tests.testdoubles import DockerDaemonFake
+
+GIB = 1024**3
+
+
+@pytest_asyncio.fixture
+async def daemons(tmp_path: Path) -> AsyncIterator[tuple[DockerDaemonFake, ...]]:
+    async with AsyncExitStack() as stack:
+        small = DockerDaemonFake(tmp_path / "small.sock", memory=1 * GIB)
+        large = DockerDaemonFake(tmp_path / "large.sock", memory=4 * GIB)
+        yield (
+            await stack.enter_async_context(small),
+            await stack.enter_async_context(large),
+        )
+
+
+def host_on(daemon: DockerDaemonFake, ports: int = 5) -> BrowserHost:
+    # the fake containers all listen on localhost, so hosts differ by their ports
+    return BrowserHost(
+        daemon.socket, [free_port() for _ in range(ports)], "http://127.0.0.1"
+    )
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test__launching__places_browsers_on_the_host_with_the_lowest_load(
+    daemons: tuple[DockerDaemonFake, DockerDaemonFake],
+) -> None:
+    small, large = daemons
+    sut = MultiHostBrowserFactory([host_on(small), host_on(large)])
+
+    for i in range(5):
+        await sut("owner", f"/data/workspace-{i}")
+
+    # one browser per GiB on the small host matches four on the large one
+    assert (len(small.running()), len(large.running())) == (1, 4)
+
+
+@pytest.mark.asyncio
+async def test__launching__counts_containers_started_by_others(
+    daemons: tuple[DockerDaemonFake, DockerDaemonFake],
+) -> None:
+    small, large = daemons
+    other_monitor = MultiHostBrowserFactory([host_on(large)])
+    for i in range(4):
+        await other_monitor("other", f"/data/other-{i}")
+    sut = MultiHostBrowserFactory([host_on(large), host_on(small)])
+
+    await sut("owner", "/data/workspace")
+
+    assert (len(small.running()), len(large.running())) == (1, 4)
+
+
+@pytest.mark.asyncio
+async def test__launching__refreshes_the_load_after_the_refresh_interval(
+    daemons: tuple[DockerDaemonFake, DockerDaemonFake],
+) -> None:
+    small, large = daemons
+    clock = FakeClock()
+    sut = MultiHostBrowserFactory(
+        BrowserHost(
+            daemon.socket,
+            [free_port() for _ in range(5)],
+            "http://127.0.0.1",
+            clock=clock,
+        )
+        for daemon in (large, small)
+    )
+    await sut("owner", "/data/first")
+
+    other_monitor = MultiHostBrowserFactory([host_on(large, ports=8)])
+    for i in range(8):
+        await other_monitor("other", f"/data/other-{i}")
+    clock.now += sut.hosts[0].refresh_interval
+    for i in range(3):
+        await sut("owner", f"/data/workspace-{i}")
+
+    assert (len(small.running()), len(large.running())) == (3, 9)
+
+
+@pytest.mark.asyncio
+async def test__launched_browsers__remember_their_host(
+    daemons: tuple[DockerDaemonFake, DockerDaemonFake],
+) -> None:
+    small, _ = daemons
+    sut = MultiHostBrowserFactory([host_on(small)])
+
+    browser = await sut("owner", "/data/workspace")
+
+    assert isinstance(browser, PlacedBrowser)
+    assert browser.host() == small.socket
+
+
+@pytest.mark.asyncio
+async def test__launching__skips_unreachable_and_full_hosts(
+    tmp_path: Path, daemons: tuple[DockerDaemonFake, DockerDaemonFake]
+) -> None:
+    small, large = daemons
+    unreachable = BrowserHost(str(tmp_path / "missing.sock"), [free_port()])
+    sut = MultiHostBrowserFactory([unreachable, host_on(small, ports=1)])
+
+    await sut("owner", "/data/first")
+    with pytest.raises(NoPortsAvailableError):
+        await sut("owner", "/data/second")
+
+    assert len(small.running()) == 1
+
+
+@pytest.mark.asyncio
+async def test__restored_browsers__lease_and_stop_on_their_host(
+    daemons: tuple[DockerDaemonFake, DockerDaemonFake],
+) -> None:
+    ports = {daemon.socket: [free_port()] for daemon in daemons}
+    launching = MultiHostBrowserFactory(
+        BrowserHost(socket, host_ports, "http://127.0.0.1")
+        for socket, host_ports in ports.items()
+    )
+    launched = [await launching("owner", f"/data/workspace-{i}") for i in range(2)]
+    restarted = MultiHostBrowserFactory(
+        BrowserHost(socket, host_ports, "http://127.0.0.1")
+        for socket, host_ports in ports.items()
+    )
+
+    restored = []
+    for browser in launched:
+        assert isinstance(browser, PlacedBrowser)
+        restored.append(
+            restarted.restore(
+                browser.owner(),
+                browser.workspace(),
+                browser.address(),
+                browser.process_id(),
+                host=browser.host(),
+            )
+        )
+    restarted.restore_leases(restored)
+
+    assert all(host.ports.free == 0 for host in restarted.hosts)
+    for browser in restored:
+        await browser.stop()
+    assert all(not daemon.running() for daemon in daemons)
+    assert all(host.ports.free == 1 for host in restarted.hosts)
+
+
+@pytest.mark.asyncio
+async def test__unreachable_host__is_left_out_until_its_retry_time(
+    daemons: tuple[DockerDaemonFake, DockerDaemonFake],
+) -> None:
+    small, _ = daemons
+    # accepts connections, but never answers
+    silent = await asyncio.start_server(
+        lambda reader, writer: None, "127.0.0.1", free_port()
+    )
+    port = silent.sockets[0].getsockname()[1]
+    clock = FakeClock()
+    unreachable = BrowserHost(
+        f"tcp://127.0.0.1:{port}", [free_port()], query_timeout=0.2, clock=clock
+    )
+    sut = MultiHostBrowserFactory([unreachable, host_on(small)])
+
+    try:
+        await sut("owner", "/data/first")
+        retry_at = unreachable.retry_at
+        start = time.monotonic()
+        await sut("owner", "/data/second")
+        skipped_in = time.monotonic() - start
+        clock.now = retry_at
+        await sut("owner", "/data/third")
+    finally:
+        silent.close()
+
+    assert len(small.running()) == 3
+    assert skipped_in < 0.2
+    # the failed retry doubles the backoff
+    assert (retry_at, unreachable.retry_at) == (5.0, 5.0 + 10.0)
+    assert unreachable.failures == 2
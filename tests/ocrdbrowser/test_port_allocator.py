@@ -0,0 +1,89 @@
+import pytest
+
+from ocrdbrowser import NoPortsAvailableError, PortAllocator
+from ocrdbrowser._port import PortBindingError, PortBindingResult
+
+
+class Binding:
+    def __init__(self, *taken: int) -> None:
+        self.taken = set(taken)
+        self.attempts: list[int] = []
+
+    async def __call__(self, host: str, port: int) -> PortBindingResult[str]:
+        self.attempts.append(port)
+        if port in self.taken:
+            return PortBindingError()
+
+        return f"{host}:{port}"
+
+
+def test__lease__hands_out_each_port_once() -> None:
+    sut = PortAllocator({9000, 9001})
+
+    leased = {sut.lease(), sut.lease()}
+
+    assert leased == {9000, 9001}
+    with pytest.raises(NoPortsAvailableError):
+        sut.lease()
+
+
+def test__released_port__can_be_leased_again() -> None:
+    sut = PortAllocator({9000})
+    port = sut.lease()
+
+    sut.release(port)
+
+    assert sut.lease() == 9000
+
+
+def test__reserved_addresses__are_not_handed_out() -> None:
+    sut = PortAllocator({9000, 9001})
+
+    sut.reserve_address("http://localhost:9000")
+
+    assert sut.lease() == 9001
+    assert sut.free == 0
+
+
+def test__reserving_ports_outside_the_range__is_ignored() -> None:
+    sut = PortAllocator({9000})
+
+    sut.reserve(8000)
+
+    assert sut.free == 1
+
+
+@pytest.mark.asyncio
+async def test__bind__skips_ports_used_by_foreign_processes() -> None:
+    binding = Binding(9000)
+    sut = PortAllocator({9000, 9001})
+
+    result = await sut.bind(binding, "localhost")
+
+    assert result.port == 9001
+    assert not sut.is_leased(9000)
+    assert sut.is_leased(9001)
+
+
+@pytest.mark.asyncio
+async def test__bind__tries_every_free_port_only_once() -> None:
+    binding = Binding(9000, 9001)
+    sut = PortAllocator({9000, 9001})
+
+    with pytest.raises(NoPortsAvailableError):
+        await sut.bind(binding, "localhost")
+
+    assert binding.attempts == [9000, 9001]
+    assert sut.free == 2
+
+
+@pytest.mark.asyncio
+async def test__bind__tries_foreign_ports_last() -> None:
+    binding = Binding(9000)
+    sut = PortAllocator({9000, 9001, 9002})
+    await sut.bind(binding, "localhost")
+
+    binding.attempts.clear()
+    await sut.bind(binding, "localhost")
+
+    assert binding.attempts == [9002]
@@ -0,0 +1,79 @@
+import asyncio
+import socket
+import time
+
+import pytest
+
+from ocrdbrowser import BrowserNotReadyError, launch_times
+from ocrdbrowser._readiness import is_listening, wait_until_ready
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return int(sock.getsockname()[1])
+
+
+async def answer(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        writer.close()
+        return
+
+    writer.write(b"HTTP/1.1 404 Not Found\r\ncontent-length: 0\r\n\r\n")
+    await writer.drain()
+    writer.close()
+
+
+async def serve_after(port: int, delay: float) -> asyncio.Server:
+    await asyncio.sleep(delay)
+    return await asyncio.start_server(answer, "127.0.0.1", port)
+
+
+@pytest.fixture
+def port() -> int:
+    return free_port()
+
+
+@pytest.mark.asyncio
+async def test__wait_until_ready__returns_once_the_server_answers(port: int) -> None:
+    launched = launch_times.count
+    server = asyncio.create_task(serve_after(port, 0.2))
+
+    elapsed = await wait_until_ready(f"http://127.0.0.1:{port}", timeout=5)
+
+    assert 0.2 <= elapsed < 2
+    assert launch_times.count == launched + 1
+    (await server).close()
+
+
+@pytest.mark.asyncio
+async def test__wait_until_ready__gives_up_after_the_timeout(port: int) -> None:
+    start = time.monotonic()
+
+    with pytest.raises(BrowserNotReadyError):
+        await wait_until_ready(f"http://127.0.0.1:{port}", timeout=0.3)
+
+    assert time.monotonic() - start < 1.5
+
+
+@pytest.mark.asyncio
+async def test__wait_until_ready__fails_fast_when_the_process_exits(port: int) -> None:
+    process = await asyncio.create_subprocess_exec("false")
+    await process.wait()
+
+    with pytest.raises(BrowserNotReadyError):
+        await wait_until_ready(f"http://127.0.0.1:{port}", process, timeout=10)
+
+
+@pytest.mark.asyncio
+async def test__is_listening__detects_occupied_ports(port: int) -> None:
+    assert not await is_listening(f"http://127.0.0.1:{port}")
+
+    server = await serve_after(port, 0)
+
+    assert await is_listening(f"127.0.0.1:{port}")
+    server.close()
+    await server.wait_closed()
+    await asyncio.sleep(0.05)
@@ -1,6 +1,6 @@
 from pathlib import Path
 
-from ocrdbrowser import workspace
+from ocrdbrowser import WorkspaceWalker, workspace
 
 WORKSPACES = Path(__file__).parent.parent / "workspaces"
 
@@ -23,3 +23,19 @@ def test__list_workspaces__returns_valid_workspaces() -> None:
         str(WORKSPACES / "another workspace"),
         str(WORKSPACES / "nested" / "workspace"),
     }
+
+
+def test__opened_index_with_walker__lists_workspaces_nested_in_workspaces(
+    tmp_path: Path,
+) -> None:
+    for path in (tmp_path / "outer", tmp_path / "outer" / "inner"):
+        path.mkdir()
+        (path / "mets.xml").touch()
+
+    workspace.open_index(tmp_path, walker=WorkspaceWalker(stop_at_workspace=False))
+    try:
+        listed = workspace.list_all(tmp_path)
+    finally:
+        workspace.close_index(tmp_path)
+
+    assert set(listed) == {str(tmp_path / "outer"), str(tmp_path / "outer" / "inner")}
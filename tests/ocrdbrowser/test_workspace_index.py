@@ -0,0 +1,220 @@
+import os
+import random
+import shutil
+from pathlib import Path
+from typing import Callable
+
+import pytest
+
+from ocrdbrowser._index import WorkspaceIndex
+from ocrdbrowser._inotify import InotifyWatcher
+from ocrdbrowser._walk import WorkspaceWalker
+
+
+def create_workspace(path: Path) -> str:
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "mets.xml").touch()
+    return str(path)
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    create_workspace(tmp_path / "first")
+    create_workspace(tmp_path / "first" / ".backup" / "old")
+    return tmp_path
+
+
+skip_if_no_inotify = pytest.mark.skipif(
+    InotifyWatcher.create() is None, reason="inotify is not available"
+)
+
+
+def test__index__lists_workspaces_without_backups(root: Path) -> None:
+    sut = WorkspaceIndex(root)
+
+    assert sut.workspaces() == [str(root / "first")]
+
+
+@skip_if_no_inotify
+def test__nested_workspace_created__is_picked_up_without_rescan(root: Path) -> None:
+    sut = WorkspaceIndex(root)
+    sut.workspaces()
+
+    nested = create_workspace(root / "some" / "deeply" / "nested")
+
+    assert nested in sut.workspaces()
+
+
+@skip_if_no_inotify
+def test__workspace_removed__is_dropped_from_index(root: Path) -> None:
+    create_workspace(root / "tree" / "second")
+    sut = WorkspaceIndex(root)
+    sut.workspaces()
+
+    shutil.rmtree(root / "tree")
+    (root / "first" / "mets.xml").unlink()
+
+    assert sut.workspaces() == []
+
+
+@skip_if_no_inotify
+def test__workspace_moved__is_listed_under_new_path(root: Path) -> None:
+    sut = WorkspaceIndex(root)
+    sut.workspaces()
+
+    (root / "first").rename(root / "renamed")
+
+    assert sut.workspaces() == [str(root / "renamed")]
+
+
+@skip_if_no_inotify
+def test__directory_moved_twice_before_listing__keeps_watching(root: Path) -> None:
+    sut = WorkspaceIndex(root)
+    sut.workspaces()
+    (root / "a").mkdir()
+    sut.workspaces()
+
+    (root / "a").rename(root / "b")
+    (root / "b").rename(root / "c")
+    sut.workspaces()
+    moved = create_workspace(root / "c")
+
+    assert sut.workspaces() == [moved, str(root / "first")]
+
+
+@skip_if_no_inotify
+def test__directory_above_workspace_becoming_workspace__hides_workspaces_below(
+    root: Path,
+) -> None:
+    create_workspace(root / "a" / "w")
+    sut = WorkspaceIndex(root)
+    sut.workspaces()
+
+    outer = create_workspace(root / "a")
+    create_workspace(root / "a" / "x")
+
+    assert sut.workspaces() == [outer, str(root / "first")]
+
+
+@skip_if_no_inotify
+def test__mets_removed_from_workspace__reveals_workspaces_below(root: Path) -> None:
+    create_workspace(root / "a")
+    sut = WorkspaceIndex(root)
+    sut.workspaces()
+    inner = create_workspace(root / "a" / "w")
+    sut.workspaces()
+
+    (root / "a" / "mets.xml").unlink()
+    sut.workspaces()
+    added_later = create_workspace(root / "a" / "v")
+
+    assert sut.workspaces() == [added_later, inner, str(root / "first")]
+
+
+def change_randomly(rng: random.Random, root: Path) -> None:
+    directories = [Path(directory) for directory, _, _ in os.walk(root)]
+    directory = rng.choice(directories)
+    change = rng.randrange(5)
+    if change == 0:
+        (directory / rng.choice("abc")).mkdir(exist_ok=True)
+    elif change == 1:
+        (directory / "mets.xml").touch()
+    elif change == 2:
+        (directory / "mets.xml").unlink(missing_ok=True)
+    elif directory != root and change == 3:
+        shutil.rmtree(directory)
+    elif directory != root:
+        target = rng.choice(directories) / rng.choice("xyz")
+        if not target.is_relative_to(directory) and not target.exists():
+            directory.rename(target)
+
+
+@skip_if_no_inotify
+@pytest.mark.parametrize("seed", range(5))
+@pytest.mark.parametrize("stop_at_workspace", [True, False])
+def test__after_random_changes_between_listings__index_matches_a_fresh_walk(
+    root: Path, seed: int, stop_at_workspace: bool
+) -> None:
+    rng = random.Random(seed)
+    walker = WorkspaceWalker(stop_at_workspace=stop_at_workspace)
+    sut = WorkspaceIndex(root, walker=walker)
+    sut.workspaces()
+
+    try:
+        for _ in range(100):
+            for _ in range(rng.randint(1, 3)):
+                change_randomly(rng, root)
+
+            assert sut.workspaces() == sorted(walker.walk(str(root)))
+    finally:
+        sut.close()
+
+
+def test__without_watcher__changes_are_picked_up_by_periodic_rescan(
+    root: Path,
+) -> None:
+    sut = WorkspaceIndex(root, rescan_interval=0, watcher_factory=lambda: None)
+    sut.workspaces()
+
+    second = create_workspace(root / "second")
+
+    assert sut.workspaces() == [str(root / "first"), second]
+
+
+class CountingWalker(WorkspaceWalker):
+    def __init__(self) -> None:
+        super().__init__()
+        self.walks = 0
+
+    def walk(
+        self, root: str, on_directory: Callable[[str], None] | None = None
+    ) -> list[str]:
+        self.walks += 1
+        return super().walk(root, on_directory)
+
+
+def test__started_with_unchanged_snapshot__does_not_walk_the_tree(
+    root: Path, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    snapshot = tmp_path_factory.mktemp("index") / "index.json.gz"
+    WorkspaceIndex(root, snapshot=snapshot).workspaces()
+    walker = CountingWalker()
+
+    sut = WorkspaceIndex(root, snapshot=snapshot, walker=walker)
+    sut.start()
+    sut.wait()
+
+    assert sut.workspaces() == [str(root / "first")]
+    assert walker.walks == 0
+
+
+def test__validating_snapshot__picks_up_changes_in_modified_directories(
+    root: Path, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    snapshot = tmp_path_factory.mktemp("index") / "index.json.gz"
+    create_workspace(root / "tree" / "second")
+    WorkspaceIndex(root, snapshot=snapshot).workspaces()
+
+    shutil.rmtree(root / "tree")
+    third = create_workspace(root / "some" / "third")
+
+    sut = WorkspaceIndex(root, snapshot=snapshot, watcher_factory=lambda: None)
+    sut.start()
+    sut.wait()
+
+    assert sut.workspaces() == [str(root / "first"), third]
+
+
+def test__snapshot_of_other_root__is_not_used(
+    root: Path, tmp_path_factory: pytest.TempPathFactory
+) -> None:
+    snapshot = tmp_path_factory.mktemp("index") / "index.json.gz"
+    other = tmp_path_factory.mktemp("other")
+    create_workspace(other / "elsewhere")
+    WorkspaceIndex(other, snapshot=snapshot).workspaces()
+
+    sut = WorkspaceIndex(root, snapshot=snapshot)
+    sut.start()
+    sut.wait()
+
+    assert sut.workspaces() == [str(root / "first")]
@@ -0,0 +1,59 @@
+from pathlib import Path
+
+import pytest
+
+from ocrdbrowser._walk import WorkspaceWalker
+
+
+def create_workspace(path: Path) -> str:
+    path.mkdir(parents=True, exist_ok=True)
+    (path / "mets.xml").touch()
+    return str(path)
+
+
+@pytest.fixture
+def root(tmp_path: Path) -> Path:
+    create_workspace(tmp_path / "first")
+    create_workspace(tmp_path / "first" / "OCR-D-IMG" / "inner")
+    create_workspace(tmp_path / "nested" / "second")
+    create_workspace(tmp_path / "first" / ".backup" / "old")
+    create_workspace(tmp_path / "tmp-123" / "scratch")
+    return tmp_path
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test__walker__stops_descending_at_workspaces(root: Path, workers: int) -> None:
+    sut = WorkspaceWalker(workers=workers)
+
+    assert sorted(sut.walk(str(root))) == [
+        str(root / "first"),
+        str(root / "nested" / "second"),
+        str(root / "tmp-123" / "scratch"),
+    ]
+
+
+def test__walker_not_stopping_at_workspaces__finds_nested_workspaces(
+    root: Path,
+) -> None:
+    sut = WorkspaceWalker(stop_at_workspace=False)
+
+    assert str(root / "first" / "OCR-D-IMG" / "inner") in sut.walk(str(root))
+
+
+def test__walker__skips_directories_matching_ignore_patterns(root: Path) -> None:
+    sut = WorkspaceWalker(ignore=(".backup", "tmp-*"), stop_at_workspace=False)
+
+    found = sut.walk(str(root))
+
+    assert str(root / "first" / ".backup" / "old") not in found
+    assert str(root / "tmp-123" / "scratch") not in found
+
+
+def test__walker__reports_every_visited_directory(root: Path) -> None:
+    visited: list[str] = []
+    sut = WorkspaceWalker()
+
+    sut.walk(str(root), on_directory=visited.append)
+
+    assert str(root / "nested") in visited
+    assert str(root / "first" / "OCR-D-IMG") not in visited
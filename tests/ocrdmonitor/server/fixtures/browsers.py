@@ -0,0 +1,43 @@
+from tests.testdoubles import BrowserSpy, InMemoryBrowserProcessRepository
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def running_browsers(
+    *browsers_or_hosts: BrowserSpy | str,
+) -> tuple[InMemoryBrowserProcessRepository, list[BrowserSpy]]:
+    """
+    A repository containing the given browsers,
+    hosts are turned into running BrowserSpies at http://<host>
+    """
+    browsers = {
+        browser.address(): browser
+        for browser in (
+            BrowserSpy("owner", f"/ws/{item}", f"http://{item}", running=True)
+            if isinstance(item, str)
+            else item
+            for item in browsers_or_hosts
+        )
+    }
+
+    def restore(
+        owner: str,
+        workspace: str,
+        address: str,
+        process_id: str,
+        hibernating: bool = False,
+        host: str | None = None,
+    ) -> BrowserSpy:
+        return browsers[address]
+
+    repository = InMemoryBrowserProcessRepository(restoring_factory=restore)
+    for browser in browsers.values():
+        await repository.insert(browser)
+
+    return repository, list(browsers.values())
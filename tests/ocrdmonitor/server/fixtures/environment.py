@@ -40,13 +40,19 @@ class DevEnvironment:
     _factory: BrowserTestDoubleFactory
 
     _app: TestClient = field(init=False)
+    repository_requests: int = field(init=False, default=0)
 
     def __post_init__(self) -> None:
         self._app = TestClient(create_app(self))
 
     async def repositories(self) -> Repositories:
+        self.repository_requests += 1
         return self._repositories
 
+    async def close(self) -> None:
+        # the repositories are closed by the fixture
+        pass
+
     def browser_factory(self) -> OcrdBrowserFactory:
         return self._factory
 
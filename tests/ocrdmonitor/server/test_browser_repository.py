@@ -0,0 +1,145 @@
+from typing import AsyncIterator
+
+import pytest
+import pytest_asyncio
+
+from ocrdmonitor.database._browserprocessrepository import (
+    BrowserProcess,
+    migrate_browser_index,
+)
+from ocrdmonitor.protocols import BrowserProcessRepository
+from tests import markers
+from tests.ocrdmonitor.server.fixtures.environment import RepositoryInitializer
+from tests.ocrdmonitor.server.fixtures.repository import (
+    inmemory_repository,
+    mongodb_repository,
+)
+from tests.testdoubles import BrowserSpy
+
+
+@pytest_asyncio.fixture(
+    params=[
+        inmemory_repository,
+        pytest.param(
+            mongodb_repository,
+            marks=(pytest.mark.integration, markers.skip_if_no_docker),
+        ),
+    ]
+)
+async def repository(
+    request: pytest.FixtureRequest,
+) -> AsyncIterator[BrowserProcessRepository]:
+    initializer: RepositoryInitializer = request.param
+    async with initializer(BrowserSpy) as repositories:
+        yield repositories.browser_processes
+
+
+@pytest.mark.asyncio
+async def test__find_containing__resolves_paths_inside_the_workspace(
+    repository: BrowserProcessRepository,
+) -> None:
+    await repository.insert(BrowserSpy("owner", "/ws/a", "http://a"))
+
+    found = await repository.find_containing(owner="owner", path="/ws/a/static/app.js")
+
+    assert found is not None and found.address() == "http://a"
+
+
+@pytest.mark.asyncio
+async def test__find_containing__ignores_sibling_workspaces_with_the_same_prefix(
+    repository: BrowserProcessRepository,
+) -> None:
+    await repository.insert(BrowserSpy("owner", "/ws/a", "http://a"))
+
+    assert await repository.find_containing(owner="owner", path="/ws/ab") is None
+    assert await repository.find_containing(owner="other", path="/ws/a") is None
+
+
+@pytest.mark.asyncio
+async def test__find_containing__prefers_the_deepest_workspace(
+    repository: BrowserProcessRepository,
+) -> None:
+    await repository.insert(BrowserSpy("owner", "/ws", "http://outer", "1"))
+    await repository.insert(BrowserSpy("owner", "/ws/nested", "http://nested", "2"))
+
+    found = await repository.find_containing(owner="owner", path="/ws/nested/page")
+
+    assert found is not None and found.address() == "http://nested"
+
+
+@pytest.mark.asyncio
+async def test__find_containing__does_not_return_deleted_browsers(
+    repository: BrowserProcessRepository,
+) -> None:
+    browser = BrowserSpy("owner", "/ws/a", "http://a")
+    await repository.insert(browser)
+    await repository.find_containing(owner="owner", path="/ws/a")
+
+    await repository.delete(browser)
+
+    assert await repository.find_containing(owner="owner", path="/ws/a") is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@markers.skip_if_no_docker
+async def test__find_containing__finds_deeper_workspaces_recorded_by_other_workers() -> (
+    None
+):
+    async with mongodb_repository(BrowserSpy) as repositories:
+        repository = repositories.browser_processes
+        await repository.insert(BrowserSpy("owner", "/ws", "http://outer", "1"))
+        await repository.find_containing(owner="owner", path="/ws/nested/page")
+        # recorded by another worker process, bypassing this repository's cache
+        await BrowserProcess.get_motor_collection().insert_one(
+            {
+                "owner": "owner",
+                "workspace": "/ws/nested",
+                "address": "http://nested",
+                "process_id": "2",
+                "hibernating": False,
+                "host": None,
+            }
+        )
+
+        found = await repository.find_containing(owner="owner", path="/ws/nested/page")
+
+    assert found is not None and found.address() == "http://nested"
+
+
+@pytest.mark.asyncio
+@pytest.mark.integration
+@markers.skip_if_no_docker
+async def test__migrating_legacy_index__stops_the_dropped_duplicate_browsers() -> None:
+    restored: list[BrowserSpy] = []
+
+    def restore(
+        owner: str,
+        workspace: str,
+        address: str,
+        process_id: str,
+        hibernating: bool = False,
+        host: str | None = None,
+    ) -> BrowserSpy:
+        browser = BrowserSpy(owner, workspace, address, process_id, running=True)
+        restored.append(browser)
+        return browser
+
+    async with mongodb_repository(BrowserSpy):
+        collection = BrowserProcess.get_motor_collection().database["Legacy"]
+        await collection.create_index([("owner", 1), ("workspace", 1)])
+        await collection.insert_many(
+            [
+                {"owner": "owner", "workspace": "/ws", "address": a, "process_id": a}
+                for a in ("http://kept", "http://duplicate")
+            ]
+        )
+
+        await migrate_browser_index(collection, restore)
+
+        remaining = [record["address"] async for record in collection.find()]
+
+    assert remaining == ["http://kept"]
+    assert [(browser.address(), browser.is_running) for browser in restored] == [
+        ("http://duplicate", False)
+    ]
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from ocrdbrowser import ChannelClosed
+from ocrdmonitor.server.workspaces._browsercommunication import (
+    _etag_matches,
+    _get_redirect_url,
+    _tunnel,
+)
+from tests.testdoubles import BrowserSpy
+
+
+class QueueChannel:
+    def __init__(self) -> None:
+        self.inbox: asyncio.Queue[bytes | None] = asyncio.Queue()
+        self.outbox: asyncio.Queue[bytes] = asyncio.Queue()
+
+    async def receive_bytes(self) -> bytes:
+        data = await self.inbox.get()
+        if data is None:
+            raise ChannelClosed()
+
+        return data
+
+    async def send_bytes(self, data: bytes) -> None:
+        await self.outbox.put(data)
+
+    def close(self) -> None:
+        self.inbox.put_nowait(None)
+
+
+@pytest.mark.asyncio
+async def test__tunnel__forwards_data_in_both_directions() -> None:
+    browser = QueueChannel()
+    websocket = QueueChannel()
+    tunnel = asyncio.create_task(_tunnel(browser, websocket))
+
+    browser.inbox.put_nowait(b"from browser")
+    websocket.inbox.put_nowait(b"from websocket")
+
+    assert await asyncio.wait_for(websocket.outbox.get(), 1) == b"from browser"
+    assert await asyncio.wait_for(browser.outbox.get(), 1) == b"from websocket"
+
+    tunnel.cancel()
+
+
+@pytest.mark.asyncio
+async def test__tunnel__when_one_side_closes__stops_both_directions() -> None:
+    browser = QueueChannel()
+    websocket = QueueChannel()
+    tunnel = asyncio.create_task(_tunnel(browser, websocket))
+
+    browser.close()
+
+    with pytest.raises(ChannelClosed):
+        await asyncio.wait_for(tunnel, 1)
+
+
+@pytest.mark.parametrize(
+    ("workspace", "path", "expected"),
+    [
+        ("/data/ws", "/data/ws", ""),
+        ("/data/ws", "/data/ws/static/broadway.js", "/static/broadway.js"),
+        ("/data/ws/nested", "/data/ws/nested/socket", "/socket"),
+        ("/data/my ws", "/data/my ws/static/app.js", "/static/app.js"),
+        # the former longest common substring also matched inside the asset path
+        ("/data/static", "/data/static/static/static.js", "/static/static.js"),
+        # difflib's autojunk heuristic spoiled the former match for long paths
+        ("/data" + "/nested" * 40, "/data" + "/nested" * 40 + "/app.js", "/app.js"),
+    ],
+)
+def test__redirect_url__is_the_path_relative_to_the_browser_workspace(
+    workspace: str, path: str, expected: str
+) -> None:
+    browser = BrowserSpy(workspace=workspace)
+
+    assert _get_redirect_url(browser, path) == expected
+
+
+def test__redirect_url__for_a_path_outside_the_workspace__raises() -> None:
+    browser = BrowserSpy(workspace="/data/ws")
+
+    with pytest.raises(ValueError):
+        _get_redirect_url(browser, "/data/wsx/static/app.js")
+
+
+@pytest.mark.parametrize(
+    ("if_none_match", "matches"),
+    [
+        ('"abc"', True),
+        ('"other", "abc"', True),
+        ('"other","abc"', True),
+        ('W/"abc"', True),
+        ('"other",W/"abc"', True),
+        ("*", True),
+        ('"other"', False),
+        ("", False),
+    ],
+)
+def test__etag__is_matched_weakly_against_all_listed_tags(
+    if_none_match: str, matches: bool
+) -> None:
+    assert _etag_matches('"abc"', if_none_match) is matches
@@ -0,0 +1,69 @@
+import pytest
+
+from ocrdbrowser import NoPortsAvailableError, OcrdBrowser
+from ocrdmonitor.server.workspaces import ActivityTracker, CapacityManager
+from tests.ocrdmonitor.server.fixtures.browsers import FakeClock, running_browsers
+from tests.testdoubles import BrowserSpy
+
+
+class ExhaustedFactory:
+    """Raises NoPortsAvailableError until a browser has been stopped"""
+
+    def __init__(self, *running: BrowserSpy) -> None:
+        self.running = list(running)
+
+    async def __call__(self, owner: str, workspace_path: str) -> OcrdBrowser:
+        if all(browser.is_running for browser in self.running):
+            raise NoPortsAvailableError()
+
+        browser = BrowserSpy(owner, workspace_path, "http://new", running=True)
+        self.running.append(browser)
+        return browser
+
+
+@pytest.mark.asyncio
+async def test__exhausted_ports__evicts_the_least_recently_used_idle_browser() -> None:
+    clock = FakeClock()
+    activity = ActivityTracker(clock)
+    repository, (older, newer) = await running_browsers("older", "newer")
+    clock.now = 100
+    activity.touch(older)
+    clock.now = 200
+    activity.touch(newer)
+    clock.now = 1000
+    sut = CapacityManager(activity, min_idle_age=60)
+
+    browser = await sut.launch(ExhaustedFactory(older, newer), repository, "me", "/ws")
+
+    assert browser.owner() == "me"
+    assert not older.is_running
+    assert newer.is_running
+    assert sut.evictions == 1
+
+
+@pytest.mark.asyncio
+async def test__exhausted_ports_without_idle_browsers__raises() -> None:
+    clock = FakeClock()
+    activity = ActivityTracker(clock)
+    repository, (busy,) = await running_browsers("busy")
+    clock.now = 100
+    activity.touch(busy)
+    sut = CapacityManager(activity, min_idle_age=60)
+
+    with pytest.raises(NoPortsAvailableError):
+        await sut.launch(ExhaustedFactory(busy), repository, "me", "/ws")
+
+    assert sut.evictions == 0
+    assert sut.exhausted == 1
+
+
+def test__idle_browsers__are_sorted_least_recently_used_first() -> None:
+    clock = FakeClock()
+    sut = ActivityTracker(clock)
+    first, second, third = (BrowserSpy(address=f"http://{i}") for i in range(3))
+    for browser in (second, first, third):
+        clock.now += 10
+        sut.touch(browser)
+    clock.now = 100
+
+    assert sut.idle_browsers([first, second, third], min_idle=75) == [second, first]
@@ -0,0 +1,117 @@
+import asyncio
+
+import pytest
+
+from ocrdbrowser import OcrdBrowserClient
+from ocrdmonitor.server.workspaces import HealthSweep
+from tests.ocrdmonitor.server.fixtures.browsers import running_browsers
+from tests.testdoubles import BrowserClientStub, BrowserSpy
+
+
+class DeadBrowser(BrowserSpy):
+    def __init__(self, owner: str, workspace: str, address: str) -> None:
+        super().__init__(owner, workspace, address, running=True)
+        self.pinged = False
+
+        def ping(resource: str) -> bytes:
+            self.pinged = True
+            return b""
+
+        self.configure_client(response_factory=ping)
+
+    async def is_alive(self) -> bool:
+        return False
+
+
+class HangingBrowser(BrowserSpy):
+    checking = 0
+    most_checked_at_once = 0
+
+    def __init__(self, owner: str, workspace: str, address: str) -> None:
+        super().__init__(owner, workspace, address, running=True)
+
+    async def is_alive(self) -> bool:
+        cls = HangingBrowser
+        cls.checking += 1
+        cls.most_checked_at_once = max(cls.most_checked_at_once, cls.checking)
+        try:
+            await asyncio.sleep(10)
+        finally:
+            cls.checking -= 1
+        return True
+
+
+class SlowlyAnsweringClient(BrowserClientStub):
+    def __init__(self, slow_pings: list[bool]) -> None:
+        super().__init__()
+        self.slow_pings = slow_pings
+
+    async def get(self, resource: str, timeout: float | None = None) -> bytes:
+        if self.slow_pings.pop(0):
+            await asyncio.sleep(10)
+
+        return await super().get(resource, timeout)
+
+
+class SlowlyAnsweringBrowser(BrowserSpy):
+    def __init__(self, slow_pings: list[bool]) -> None:
+        super().__init__("owner", "/ws/slow", "http://slow", running=True)
+        self._slow_client = SlowlyAnsweringClient(slow_pings)
+
+    def client(self) -> OcrdBrowserClient:
+        return self._slow_client
+
+
+@pytest.mark.asyncio
+async def test__sweep__removes_dead_browsers_without_pinging_them() -> None:
+    dead = DeadBrowser("owner", "/ws/dead", "http://dead")
+    repository, (alive, _) = await running_browsers("alive", dead)
+    sut = HealthSweep(interval=60, concurrency=4, timeout=1)
+
+    removed = await sut.sweep(repository)
+
+    assert [browser.address() for browser in removed] == ["http://dead"]
+    assert not dead.pinged
+    assert [browser.address() for browser in await repository.find()] == [
+        alive.address()
+    ]
+
+
+@pytest.mark.asyncio
+async def test__sweep__removes_unresponsive_browsers_after_the_timeout() -> None:
+    repository, _ = await running_browsers(
+        *(HangingBrowser("owner", f"/ws/{i}", f"http://{i}") for i in range(4))
+    )
+    sut = HealthSweep(interval=60, concurrency=2, timeout=0.05, failures=2)
+
+    async with asyncio.timeout(2):
+        removed_first = await sut.sweep(repository)
+        removed = await sut.sweep(repository)
+
+    assert removed_first == []
+    assert len(removed) == 4
+    assert HangingBrowser.most_checked_at_once == 2
+    assert sut.removed == 4
+
+
+@pytest.mark.asyncio
+async def test__sweep__keeps_browsers_that_answer_slowly_now_and_then() -> None:
+    slow = SlowlyAnsweringBrowser(slow_pings=[True, False, True, True])
+    repository, _ = await running_browsers(slow)
+    sut = HealthSweep(interval=60, concurrency=4, timeout=0.05, failures=2)
+
+    removed = [await sut.sweep(repository) for _ in range(3)]
+
+    assert removed == [[], [], []]
+    assert await repository.find() == [slow]
+
+
+@pytest.mark.asyncio
+async def test__sweep__removes_browsers_after_consecutive_slow_answers() -> None:
+    slow = SlowlyAnsweringBrowser(slow_pings=[False, True, True])
+    repository, _ = await running_browsers(slow)
+    sut = HealthSweep(interval=60, concurrency=4, timeout=0.05, failures=2)
+
+    removed = [await sut.sweep(repository) for _ in range(3)]
+
+    assert removed == [[], [], [slow]]
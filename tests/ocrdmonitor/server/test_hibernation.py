@@ -0,0 +1,133 @@
+import asyncio
+
+import pytest
+
+from ocrdmonitor.server.workspaces import (
+    ActivityTracker,
+    HealthSweep,
+    Hibernator,
+    IdleReaper,
+)
+from tests.ocrdmonitor.server.fixtures.browsers import FakeClock, running_browsers
+from tests.testdoubles import (
+    BrowserSpy,
+    InMemoryBrowserProcessRepository,
+    unreachable_browser,
+)
+
+
+class SlowlyResumingBrowser(BrowserSpy):
+    async def resume(self) -> None:
+        await asyncio.sleep(0.05)
+        await super().resume()
+
+
+@pytest.mark.asyncio
+async def test__hibernate_idle__suspends_idle_browsers_and_records_it() -> None:
+    clock = FakeClock()
+    activity = ActivityTracker(clock)
+    repository = InMemoryBrowserProcessRepository()
+    await repository.insert(BrowserSpy("owner", "/ws/idle", "http://idle"))
+    clock.now = 700
+    sut = Hibernator(activity, hibernate_after=600)
+
+    hibernated = await sut.hibernate_idle(repository, await repository.find())
+
+    (restored,) = await repository.find()
+    assert [browser.address() for browser in hibernated] == ["http://idle"]
+    assert isinstance(restored, BrowserSpy) and restored.is_hibernating()
+    assert sut.hibernated == 1
+
+
+@pytest.mark.asyncio
+async def test__hibernate_idle__keeps_recently_active_browsers_running() -> None:
+    clock = FakeClock()
+    activity = ActivityTracker(clock)
+    repository, (active,) = await running_browsers("active")
+    clock.now = 500
+    activity.touch(active)
+    clock.now = 700
+    sut = Hibernator(activity, hibernate_after=600)
+
+    await sut.hibernate_idle(repository, await repository.find())
+
+    assert not active.is_hibernating()
+
+
+@pytest.mark.asyncio
+async def test__wake__resumes_a_hibernating_browser_once_for_concurrent_requests() -> None:
+    browser = SlowlyResumingBrowser("owner", "/ws/asleep", "http://asleep")
+    browser.hibernating = True
+    repository, _ = await running_browsers(browser)
+    sut = Hibernator(ActivityTracker())
+
+    await asyncio.gather(*(sut.wake(repository, browser) for _ in range(5)))
+
+    assert not browser.is_hibernating()
+    assert browser.resumed == 1
+    assert sut.resumed == 1
+
+
+@pytest.mark.asyncio
+async def test__wake_soon__resumes_browsers_hibernated_behind_an_open_connection() -> (
+    None
+):
+    clock = FakeClock()
+    activity = ActivityTracker(clock)
+    repository, (browser,) = await running_browsers("connected")
+    clock.now = 700
+    sut = Hibernator(activity, hibernate_after=600)
+    await sut.hibernate_idle(repository, await repository.find())
+
+    sut.wake_soon(repository, browser)
+    async with asyncio.timeout(5):
+        while browser.is_hibernating():
+            await asyncio.sleep(0.01)
+
+    assert browser.resumed == 1
+
+
+@pytest.mark.asyncio
+async def test__reap__hibernates_idle_browsers_that_are_not_stopped() -> None:
+    clock = FakeClock()
+    activity = ActivityTracker(clock)
+    repository, (stale, idle) = await running_browsers("stale", "idle")
+    clock.now = 3000
+    activity.touch(idle)
+    clock.now = 4000
+    hibernator = Hibernator(activity, hibernate_after=600)
+    sut = IdleReaper(activity, idle_timeout=3600, interval=60, hibernator=hibernator)
+
+    await sut.reap(repository)
+
+    assert not stale.is_running and not stale.is_hibernating()
+    assert idle.is_running and idle.is_hibernating()
+
+
+@pytest.mark.asyncio
+async def test__reap_in_dry_run__does_not_hibernate() -> None:
+    clock = FakeClock()
+    activity = ActivityTracker(clock)
+    repository, (idle,) = await running_browsers("idle")
+    clock.now = 700
+    hibernator = Hibernator(activity, hibernate_after=600)
+    sut = IdleReaper(
+        activity, idle_timeout=3600, interval=60, dry_run=True, hibernator=hibernator
+    )
+
+    await sut.reap(repository)
+
+    assert not idle.is_hibernating()
+
+
+@pytest.mark.asyncio
+async def test__health_sweep__keeps_hibernating_browsers_without_pinging_them() -> None:
+    asleep = unreachable_browser("owner", "/ws/asleep", "http://asleep")
+    asleep.hibernating = True
+    repository, _ = await running_browsers(asleep)
+    sut = HealthSweep(interval=60, concurrency=4, timeout=1)
+
+    removed = await sut.sweep(repository)
+
+    assert removed == []
+    assert len(await repository.find()) == 1
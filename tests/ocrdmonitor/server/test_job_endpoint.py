@@ -68,6 +68,53 @@ async def test__given_a_running_ocrd_job__the_job_endpoint_lists_it_with_resourc
         assert_lists_running_job(job, response)
 
 
+@pytest.mark.asyncio
+async def test__jobs_api__pages_through_completed_jobs_most_recent_first(
+    repository_fixture: Fixture,
+) -> None:
+    async with repository_fixture as env:
+        for hour in range(3):
+            job = replace(
+                completed_ocrd_job(0),
+                task_id=str(hour),
+                time_terminated=datetime(2023, 4, 12, hour=hour),
+            )
+            await env._repositories.ocrd_jobs.insert(job)
+
+        first = env.app.get("/jobs/api", params={"state": "completed", "limit": 2})
+        second = env.app.get(
+            "/jobs/api",
+            params={
+                "state": "completed",
+                "limit": 2,
+                "cursor": first.json()["next_cursor"],
+            },
+        )
+
+        assert [job["task_id"] for job in first.json()["jobs"]] == ["2", "1"]
+        assert [job["task_id"] for job in second.json()["jobs"]] == ["0"]
+        assert second.json()["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test__jobs_api__lists_running_jobs_oldest_first(
+    repository_fixture: Fixture,
+) -> None:
+    async with repository_fixture as env:
+        for pid in (2, 1):
+            job = replace(
+                running_ocrd_job(pid), time_created=datetime(2023, 4, 12, hour=pid)
+            )
+            await env._repositories.ocrd_jobs.insert(job)
+        await env._repositories.ocrd_jobs.insert(completed_ocrd_job(0))
+
+        response = env.app.get("/jobs/api", params={"state": "running"})
+
+        jobs = response.json()["jobs"]
+        assert [job["pid"] for job in jobs] == [1, 2]
+        assert jobs[0]["workflow_url"].endswith("/workflows/detail/ocr-workflow-default.sh")
+
+
 @pytest.mark.asyncio
 @pytest.mark.parametrize(
     argnames=["status_code", "message", "httpx_mock_status_code"],
@@ -0,0 +1,92 @@
+import asyncio
+from dataclasses import replace
+
+import pytest
+
+from ocrdmonitor.server.jobfeed import JobEvent, JobFeed
+from tests.ocrdmonitor.server.test_job_endpoint import (
+    completed_ocrd_job,
+    running_ocrd_job,
+)
+from tests.testdoubles import InMemoryJobRepository
+
+
+@pytest.mark.asyncio
+async def test__poll__publishes_started_and_terminated_jobs_since_the_last_poll() -> None:
+    finished = completed_ocrd_job(0)
+    jobs = [finished]
+    repository = InMemoryJobRepository(jobs)
+    sut = JobFeed(interval=60)
+
+    first = await sut.poll(repository)
+    running = replace(running_ocrd_job(1234), task_id="running")
+    jobs.append(running)
+    second = await sut.poll(repository)
+    jobs[1] = replace(running, pid=None, return_code=1)
+    third = await sut.poll(repository)
+
+    assert first == []
+    assert second == [JobEvent("started", running)]
+    assert third == [JobEvent("terminated", jobs[1])]
+
+
+@pytest.mark.asyncio
+async def test__subscribers__share_the_events_of_a_single_poll() -> None:
+    jobs = [completed_ocrd_job(0)]
+    repository = InMemoryJobRepository(jobs)
+    sut = JobFeed(interval=60)
+    await sut.poll(repository)
+    started = replace(running_ocrd_job(1234), task_id="started")
+    jobs.append(started)
+
+    async with sut.subscribe() as first, sut.subscribe() as second:
+        await sut.poll(repository)
+
+        assert first.get_nowait() == second.get_nowait() == JobEvent("started", started)
+    assert sut.polls == 2
+    assert sut.subscribers == 0
+
+
+@pytest.mark.asyncio
+async def test__started_feed__polls_while_subscribed() -> None:
+    jobs = [completed_ocrd_job(0)]
+    repository = InMemoryJobRepository(jobs)
+    sut = JobFeed(interval=0.01)
+    sut.start(repository)
+
+    try:
+        async with sut.subscribe() as events:
+            while sut.polls == 0:
+                await asyncio.sleep(0.01)
+            started = replace(running_ocrd_job(1234), task_id="started")
+            jobs.append(started)
+
+            async with asyncio.timeout(5):
+                event = await events.get()
+    finally:
+        await sut.stop()
+
+    assert event == JobEvent("started", started)
+
+
+@pytest.mark.asyncio
+async def test__subscribing_after_a_change__still_publishes_it() -> None:
+    jobs = [completed_ocrd_job(0)]
+    repository = InMemoryJobRepository(jobs)
+    sut = JobFeed(interval=0.01)
+    sut.start(repository)
+
+    try:
+        while sut.polls == 0:
+            await asyncio.sleep(0.01)
+        # e.g. between rendering the page and connecting to the event stream
+        started = replace(running_ocrd_job(1234), task_id="started")
+        jobs.append(started)
+
+        async with sut.subscribe() as events:
+            async with asyncio.timeout(5):
+                event = await events.get()
+    finally:
+        await sut.stop()
+
+    assert event == JobEvent("started", started)
@@ -0,0 +1,57 @@
+import asyncio
+
+import pytest
+
+from ocrdmonitor.server.workspaces import ActivityTracker, IdleReaper
+from tests.ocrdmonitor.server.fixtures.browsers import FakeClock, running_browsers
+
+
+@pytest.mark.asyncio
+async def test__reap__stops_and_removes_browsers_idle_past_the_timeout() -> None:
+    clock = FakeClock()
+    activity = ActivityTracker(clock)
+    repository, (idle, active) = await running_browsers("idle", "active")
+    clock.now = 3000
+    activity.touch(active)
+    clock.now = 4000
+    sut = IdleReaper(activity, idle_timeout=3600, interval=60)
+
+    reaped = await sut.reap(repository)
+
+    assert reaped == [idle]
+    assert not idle.is_running
+    assert active.is_running
+    assert list(await repository.find()) == [active]
+    assert sut.reaped == 1
+
+
+@pytest.mark.asyncio
+async def test__reap_in_dry_run__only_counts_idle_browsers() -> None:
+    clock = FakeClock()
+    activity = ActivityTracker(clock)
+    repository, (idle,) = await running_browsers("idle")
+    clock.now = 4000
+    sut = IdleReaper(activity, idle_timeout=3600, interval=60, dry_run=True)
+
+    await sut.reap(repository)
+
+    assert idle.is_running
+    assert len(await repository.find()) == 1
+    assert (sut.reaped, sut.would_reap) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test__started_reaper__sweeps_periodically() -> None:
+    clock = FakeClock()
+    activity = ActivityTracker(clock)
+    repository, (idle,) = await running_browsers("idle")
+    clock.now = 10
+    sut = IdleReaper(activity, idle_timeout=5, interval=0.01)
+
+    sut.start(repository)
+    async with asyncio.timeout(5):
+        while idle.is_running:
+            await asyncio.sleep(0.01)
+    await sut.stop()
+
+    assert sut.sweeps >= 1
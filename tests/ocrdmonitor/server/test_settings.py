@@ -31,6 +31,7 @@ def expected_to_env() -> dict[str, str]:
         return {
             f"OCRD_{setting_name}__{key.upper()}": str(value)
             for key, value in settings.items()
+            if value is not None
         }
 
     return dict(
@@ -49,3 +50,50 @@ def test__can_parse_env() -> None:
     sut = Settings()
 
     assert sut == EXPECTED
+
+
+@patch.dict(
+    os.environ,
+    {
+        **expected_to_env(),
+        "OCRD_BROWSER__MODE": "docker",
+        "OCRD_BROWSER__BROWSER_HOSTS": "tcp://node1:2375, unix:///run/docker.sock",
+    },
+)
+def test__browser_hosts__are_parsed_from_a_comma_separated_list() -> None:
+    sut = Settings()
+
+    assert sut.ocrd_browser.browser_hosts == [
+        "tcp://node1:2375",
+        "unix:///run/docker.sock",
+    ]
+
+
+@patch.dict(
+    os.environ,
+    {
+        **expected_to_env(),
+        "MONITOR_DB_MAX_POOL_SIZE": "20",
+        "MONITOR_DB_SERVER_SELECTION_TIMEOUT": "5",
+    },
+)
+def test__database_pool__is_configured_from_env() -> None:
+    sut = Settings()
+
+    assert sut.monitor_db_max_pool_size == 20
+    assert sut.monitor_db_server_selection_timeout == 5.0
+
+
+@patch.dict(
+    os.environ,
+    {
+        **expected_to_env(),
+        "OCRD_BROWSER__INDEX_STOP_AT_WORKSPACE": "false",
+        "OCRD_BROWSER__INDEX_IGNORE": ".backup, tmp-*",
+    },
+)
+def test__index_walker__is_configured_from_env() -> None:
+    sut = Settings()
+
+    assert sut.ocrd_browser.index_stop_at_workspace is False
+    assert sut.ocrd_browser.index_ignore == [".backup", "tmp-*"]
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 
 from tests.ocrdmonitor.server.fixtures.environment import Fixture
@@ -9,9 +11,11 @@ async def test__browsers_in_db__on_startup__cleans_unreachables_from_db(
     repository_fixture: Fixture,
 ) -> None:
     session_id = "the-owner"
-    reachable = BrowserSpy(owner=session_id, address="http://reachable.com")
+    reachable = BrowserSpy(
+        owner=session_id, workspace="/ws/reachable", address="http://reachable.com"
+    )
     unreachable = unreachable_browser(
-        owner=session_id, address="http://unreachable.com"
+        owner=session_id, workspace="/ws/unreachable", address="http://unreachable.com"
     )
 
     fixture = repository_fixture.with_running_browsers(
@@ -19,4 +23,21 @@ async def test__browsers_in_db__on_startup__cleans_unreachables_from_db(
     ).with_session_id(session_id)
 
     async with fixture as env:
-        assert await env._repositories.browser_processes.count() == 1
+        repository = env._repositories.browser_processes
+        async with asyncio.timeout(5):
+            while await repository.count() != 1:
+                await asyncio.sleep(0.01)
+
+        assert await repository.count() == 1
+
+
+@pytest.mark.asyncio
+async def test__repositories__are_built_once_for_all_requests(
+    repository_fixture: Fixture,
+) -> None:
+    async with repository_fixture as env:
+        for _ in range(3):
+            env.app.get("/jobs/")
+            env.app.get("/workspaces/browse/a_workspace")
+
+        assert env.repository_requests == 1
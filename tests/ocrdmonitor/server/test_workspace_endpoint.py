@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from typing import AsyncIterator
 
 import pytest
@@ -58,6 +59,31 @@ def test__workspaces__shows_the_workspace_names_starting_from_workspace_root(
     assert set(texts) == {"a_workspace", "another workspace", "nested/workspace"}
 
 
+def test__workspaces_api__lists_the_contents_of_a_directory(app: TestClient) -> None:
+    result = app.get("/workspaces/api", params={"parent": ""})
+
+    entries = result.json()["entries"]
+    assert [(e["name"], e["type"]) for e in entries] == [
+        ("a_workspace", "workspace"),
+        ("another workspace", "workspace"),
+        ("nested", "directory"),
+    ]
+    assert entries[0]["url"].endswith("/workspaces/open/a_workspace")
+    assert entries[0]["summary"] == {"pages": 0, "files": 0, "file_groups": {}}
+
+
+def test__workspaces_api__pages_through_search_results(app: TestClient) -> None:
+    first = app.get("/workspaces/api", params={"search": "workspace", "limit": 2})
+    second = app.get(
+        "/workspaces/api",
+        params={"search": "workspace", "limit": 2, "cursor": first.json()["next_cursor"]},
+    )
+
+    paths = [e["path"] for e in first.json()["entries"] + second.json()["entries"]]
+    assert paths == ["a_workspace", "another workspace", "nested/workspace"]
+    assert second.json()["next_cursor"] is None
+
+
 @pytest.mark.asyncio
 async def test__browse_workspace__passes_full_workspace_path_to_ocrdbrowser(
     repository_fixture: Fixture,
@@ -75,6 +101,36 @@ async def test__browse_workspace__passes_full_workspace_path_to_ocrdbrowser(
         assert response.status_code == 200
 
 
+class SlowlyStartingBrowser(BrowserSpy):
+    started = 0
+
+    async def start(self) -> None:
+        SlowlyStartingBrowser.started += 1
+        await asyncio.sleep(0.1)
+        await super().start()
+
+
+@pytest.mark.asyncio
+async def test__browse_workspace__concurrently__launches_a_single_browser(
+    repository_fixture: Fixture,
+) -> None:
+    SlowlyStartingBrowser.started = 0
+    fixture = repository_fixture.with_browser_type(SlowlyStartingBrowser)
+
+    async with fixture as env:
+        env.app.get("/workspaces/open/a_workspace")
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            responses = list(
+                pool.map(
+                    lambda _: env.app.get("/workspaces/browse/a_workspace"), range(4)
+                )
+            )
+
+        assert [r.status_code for r in responses] == [200] * 4
+        assert SlowlyStartingBrowser.started == 1
+        assert await env._repositories.browser_processes.count() == 1
+
+
 def test__browse_workspace__assigns_and_tracks_session_id(
     app: TestClient,
 ) -> None:
@@ -152,6 +208,110 @@ async def test__when_requesting_resource__returns_resource_from_workspace(
         assert actual.content == resource.encode()
 
 
+@pytest.mark.asyncio
+async def test__viewing_a_hibernating_browser__resumes_it_before_forwarding(
+    repository_fixture: Fixture,
+) -> None:
+    session_id = "the-owner"
+    workspace = "a_workspace"
+    browser = BrowserSpy(session_id, str(WORKSPACE_DIR / workspace), hibernating=True)
+
+    fixture = repository_fixture.with_running_browsers(browser).with_session_id(
+        session_id
+    )
+
+    async with fixture as env:
+        actual = view_workspace(env.app, workspace)
+
+    assert_is_browser_response(actual)
+    assert not browser.is_hibernating()
+    assert browser.resumed == 1
+
+
+@pytest.mark.asyncio
+async def test__when_requesting_resource__passes_through_status_and_headers(
+    repository_fixture: Fixture,
+) -> None:
+    session_id = "the-owner"
+    workspace = "a_workspace"
+    headers = {"content-type": "text/javascript", "cache-control": "max-age=3600"}
+    browser = BrowserSpy(session_id, str(WORKSPACE_DIR / workspace))
+    browser.configure_client(response=b"missing", status_code=404, headers=headers)
+
+    fixture = repository_fixture.with_running_browsers(browser).with_session_id(
+        session_id
+    )
+
+    async with fixture as env:
+        actual = view_workspace(env.app, workspace + "/broadway.js")
+
+    assert actual.status_code == 404
+    assert actual.content == b"missing"
+    assert actual.headers["content-type"] == headers["content-type"]
+    assert actual.headers["cache-control"] == headers["cache-control"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    argnames=["method", "status_code"],
+    argvalues=[("HEAD", 200), ("GET", 304)],
+)
+async def test__head_or_not_modified_resource__returns_headers_without_body(
+    repository_fixture: Fixture,
+    method: str,
+    status_code: int,
+) -> None:
+    session_id = "the-owner"
+    workspace = "a_workspace"
+    browser = BrowserSpy(session_id, str(WORKSPACE_DIR / workspace))
+    browser.configure_client(
+        status_code=status_code, headers={"content-type": "image/png"}
+    )
+
+    fixture = repository_fixture.with_running_browsers(browser).with_session_id(
+        session_id
+    )
+
+    async with fixture as env:
+        actual = env.app.request(method, f"/workspaces/view/{workspace}/page.png/")
+
+    assert actual.status_code == status_code
+    assert actual.content == b""
+    assert actual.headers["content-type"] == "image/png"
+
+
+@pytest.mark.asyncio
+async def test__broadway_client_files__are_shared_between_browsers(
+    repository_fixture: Fixture,
+) -> None:
+    session_id = "the-owner"
+    first = BrowserSpy(
+        session_id, str(WORKSPACE_DIR / "a_workspace"), address="http://first"
+    )
+    first.configure_client(response=b"broadway.js")
+    second = BrowserSpy(
+        session_id, str(WORKSPACE_DIR / "another workspace"), address="http://second"
+    )
+    second.configure_client(response=b"never requested")
+
+    fixture = repository_fixture.with_running_browsers(first, second).with_session_id(
+        session_id
+    )
+
+    async with fixture as env:
+        first_response = view_workspace(env.app, "a_workspace/broadway.js")
+        second_response = view_workspace(env.app, "another workspace/broadway.js")
+        revalidated = env.app.get(
+            "/workspaces/view/another workspace/broadway.js/",
+            headers={"if-none-match": second_response.headers["etag"]},
+        )
+        assets = env.app.get("/workspaces/metrics").json()["assets"]
+
+    assert first_response.content == second_response.content == b"broadway.js"
+    assert revalidated.status_code == 304
+    assert assets == {"hits": 2, "misses": 1, "size": len(b"broadway.js")}
+
+
 def test__browsed_workspace_is_ready__when_pinging__returns_ok(
     app: TestClient,
 ) -> None:
@@ -0,0 +1,133 @@
+import asyncio
+import threading
+from pathlib import Path
+
+import pytest
+
+from ocrdmonitor.server.workspaces._workspacelist import (
+    BackgroundWorkspaceLister,
+    WorkspaceList,
+)
+
+ROOT = Path("/workspaces")
+
+
+class BlockingListing:
+    def __init__(self, *spaces: str) -> None:
+        self.spaces = [str(ROOT / space) for space in spaces]
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, root: Path) -> list[str]:
+        self.calls += 1
+        self.release.wait(timeout=5)
+        return list(self.spaces)
+
+
+@pytest.mark.asyncio
+async def test__concurrent_first_requests__share_a_single_listing() -> None:
+    listing = BlockingListing("a", "b")
+    sut = BackgroundWorkspaceLister(ROOT, ttl=60, list_workspaces=listing)
+
+    requests = [asyncio.create_task(sut.get()) for _ in range(5)]
+    await asyncio.sleep(0.05)
+    listing.release.set()
+    results = await asyncio.gather(*requests)
+
+    assert listing.calls == 1
+    assert all(result.workspaces == ["a", "b"] for result in results)
+
+
+@pytest.mark.asyncio
+async def test__refresh__serves_stale_list_while_refreshing_in_background() -> None:
+    listing = BlockingListing("a")
+    listing.release.set()
+    sut = BackgroundWorkspaceLister(ROOT, ttl=60, list_workspaces=listing)
+    await sut.get()
+
+    listing.release.clear()
+    listing.spaces.append(str(ROOT / "new"))
+    stale = await sut.get(refresh=True)
+    assert stale.workspaces == ["a"]
+    assert sut.is_refreshing
+
+    listing.release.set()
+    while sut.is_refreshing:
+        await asyncio.sleep(0.01)
+
+    fresh = await sut.get()
+    assert fresh.workspaces == ["a", "new"]
+    assert listing.calls == 2
+
+
+@pytest.mark.asyncio
+async def test__expired_list__triggers_a_refresh() -> None:
+    listing = BlockingListing("a")
+    listing.release.set()
+    sut = BackgroundWorkspaceLister(ROOT, ttl=0, list_workspaces=listing)
+    await sut.get()
+
+    await asyncio.sleep(0.01)
+    await sut.get()
+    while sut.is_refreshing:
+        await asyncio.sleep(0.01)
+
+    assert listing.calls == 2
+
+
+LISTING = WorkspaceList(
+    sorted(["a", "b/x", "b/x-1", "b/x/inner", "b/y", "c d/e", "c d/f/g"]),
+    updated_at=0,
+)
+
+
+def test__children__groups_directories_with_their_workspace_count() -> None:
+    page = LISTING.children("")
+
+    assert [(e.path, e.is_workspace, e.workspaces) for e in page.entries] == [
+        ("a", True, 1),
+        ("b", False, 4),
+        ("c d", False, 2),
+    ]
+    assert page.next_cursor is None
+
+
+def test__children__tells_apart_workspace_and_directory_of_the_same_name() -> None:
+    page = LISTING.children("b")
+
+    assert [(e.name, e.is_workspace) for e in page.entries] == [
+        ("x", True),
+        ("x-1", True),
+        ("x", False),
+        ("y", True),
+    ]
+
+
+def test__children__pages_through_all_entries_with_the_cursor() -> None:
+    entries = []
+    cursor = None
+    while True:
+        page = LISTING.children("b", cursor, limit=1)
+        entries.extend(page.entries)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert entries == LISTING.children("b").entries
+
+
+def test__find__filters_by_prefix_and_case_insensitive_search() -> None:
+    assert [e.path for e in LISTING.find(prefix="b/x").entries] == [
+        "b/x",
+        "b/x-1",
+        "b/x/inner",
+    ]
+    assert [e.path for e in LISTING.find(search="INN").entries] == ["b/x/inner"]
+
+
+def test__find__resumes_after_cursor() -> None:
+    first = LISTING.find(limit=3)
+    second = LISTING.find(cursor=first.next_cursor, limit=3)
+
+    assert [e.path for e in first.entries] == ["a", "b/x", "b/x-1"]
+    assert [e.path for e in second.entries] == ["b/x/inner", "b/y", "c d/e"]
@@ -6,12 +6,14 @@ from ._browserfactory import (
     IteratingBrowserTestDoubleFactory,
 )
 from ._browserfake import BrowserFake
+from ._dockerfake import DockerDaemonFake, FakeContainer
 from ._inmemoryrepositories import (
     InMemoryBrowserProcessRepository,
     InMemoryJobRepository,
 )
 from ._browserspy import (
     Browser_Heading,
+    BrowserClientStub,
     BrowserSpy,
     browser_with_disconnecting_channel,
     unreachable_browser,
@@ -26,10 +28,13 @@ __all__ = [
     "BackgroundProcess",
     "broadway_fake",
     "Browser_Heading",
+    "BrowserClientStub",
     "BrowserFake",
     "BrowserSpy",
     "BrowserTestDouble",
     "BrowserTestDoubleFactory",
+    "DockerDaemonFake",
+    "FakeContainer",
     "FAKE_HOST_ADDRESS",
     "IteratingBrowserTestDoubleFactory",
     "InMemoryBrowserProcessRepository",
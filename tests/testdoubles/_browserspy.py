@@ -1,10 +1,11 @@
 from __future__ import annotations
 
+import asyncio
 from contextlib import asynccontextmanager
 from textwrap import dedent
-from typing import AsyncGenerator, Callable, Type
+from typing import AsyncGenerator, AsyncIterator, Callable, Mapping, Type
 
-from ocrdbrowser import Channel, ChannelClosed, OcrdBrowserClient
+from ocrdbrowser import Channel, ChannelClosed, OcrdBrowserClient, OcrdBrowserResponse
 
 Browser_Heading = "OCRD BROWSER"
 
@@ -23,6 +24,8 @@ class ChannelDummy:
         pass
 
     async def receive_bytes(self) -> bytes:
+        # an idle browser never sends anything, so we block until cancelled
+        await asyncio.Event().wait()
         return bytes()
 
 
@@ -34,18 +37,38 @@ class DisconnectingChannel:
         raise ChannelClosed()
 
 
+class BrowserResponseStub:
+    def __init__(
+        self, content: bytes, status_code: int, headers: Mapping[str, str]
+    ) -> None:
+        self.content = content
+        self.status_code = status_code
+        self.headers = headers
+        self.is_closed = False
+
+    async def aiter_raw(self) -> AsyncIterator[bytes]:
+        yield self.content
+
+    async def aclose(self) -> None:
+        self.is_closed = True
+
+
 class BrowserClientStub:
     def __init__(
         self,
         response: bytes | Type[Exception] = b"",
         channel: Channel | None = None,
         response_factory: Callable[[str], bytes] | None = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
     ) -> None:
         self.channel = channel or ChannelDummy()
         self.response = response or html_template.encode()
         self.response_factory = response_factory
+        self.status_code = status_code
+        self.headers = headers or {"content-type": "text/html; charset=utf-8"}
 
-    async def get(self, resource: str) -> bytes:
+    async def get(self, resource: str, timeout: float | None = None) -> bytes:
         if self.response_factory is not None:
             return self.response_factory(resource)
 
@@ -54,6 +77,15 @@ class BrowserClientStub:
 
         return self.response
 
+    async def stream(
+        self,
+        resource: str,
+        method: str = "GET",
+        headers: Mapping[str, str] | None = None,
+    ) -> OcrdBrowserResponse:
+        content = await self.get(resource)
+        return BrowserResponseStub(content, self.status_code, self.headers)
+
     @asynccontextmanager
     async def open_channel(self) -> AsyncGenerator[Channel, None]:
         yield self.channel
@@ -66,11 +98,16 @@ class BrowserSpy:
         workspace: str = "",
         address: str = "http://unreachable.example.com",
         process_id: str = "1234",
+        hibernating: bool = False,
+        host: str | None = None,
         running: bool = False,
     ) -> None:
         self._address = address
         self._process_id = process_id
         self.is_running = running
+        self.hibernating = hibernating
+        self.host_name = host
+        self.resumed = 0
         self.owner_name = owner
         self.workspace_path = workspace
         self._client = BrowserClientStub()
@@ -80,8 +117,12 @@ class BrowserSpy:
         response: bytes | Type[Exception] = b"",
         channel: Channel | None = None,
         response_factory: Callable[[str], bytes] | None = None,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
     ) -> None:
-        self._client = BrowserClientStub(response, channel, response_factory)
+        self._client = BrowserClientStub(
+            response, channel, response_factory, status_code, headers
+        )
 
     def set_owner_and_workspace(self, owner: str, workspace: str) -> None:
         self.owner_name = owner
@@ -99,6 +140,9 @@ class BrowserSpy:
     def owner(self) -> str:
         return self.owner_name
 
+    def host(self) -> str | None:
+        return self.host_name
+
     def client(self) -> OcrdBrowserClient:
         return self._client
 
@@ -108,6 +152,16 @@ class BrowserSpy:
     async def stop(self) -> None:
         self.is_running = False
 
+    def is_hibernating(self) -> bool:
+        return self.hibernating
+
+    async def hibernate(self) -> None:
+        self.hibernating = True
+
+    async def resume(self) -> None:
+        self.hibernating = False
+        self.resumed += 1
+
     def __repr__(self) -> str:
         return dedent(
             f"""
@@ -127,7 +181,7 @@ def browser_with_disconnecting_channel(
     process_id: str = "1234",
 ) -> BrowserSpy:
     spy = BrowserSpy(owner, workspace, address, process_id)
-    spy.configure_client(response=b"Disconnected", channel=DisconnectingChannel())
+    spy.configure_client(channel=DisconnectingChannel())
     return spy
 
 
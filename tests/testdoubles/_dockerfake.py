@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import uuid
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Type
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+
+class FakeContainer:
+    def __init__(self, name: str, config: dict[str, Any]) -> None:
+        self.id = uuid.uuid4().hex + uuid.uuid4().hex
+        self.name = name
+        self.config = config
+        self.server: asyncio.Server | None = None
+        self.paused = False
+
+    @property
+    def host_port(self) -> int:
+        bindings = self.config["HostConfig"]["PortBindings"]
+        return int(next(iter(bindings.values()))[0]["HostPort"])
+
+    @property
+    def running(self) -> bool:
+        return self.server is not None
+
+    async def start(self) -> None:
+        # the container "publishes" its port by answering HTTP requests on it
+        self.server = await asyncio.start_server(
+            _answer, "127.0.0.1", self.host_port
+        )
+
+    async def stop(self) -> None:
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+            self.server = None
+
+
+async def _answer(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+    try:
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\ncontent-length: 0\r\n\r\n")
+        await writer.drain()
+    except (asyncio.IncompleteReadError, ConnectionError):
+        pass
+    finally:
+        writer.close()
+
+
+def _not_found(container_id: str) -> Response:
+    return JSONResponse(
+        {"message": f"No such container: {container_id}"}, status_code=404
+    )
+
+
+class DockerDaemonFake:
+    """
+    A minimal Docker Engine API served on a unix socket.
+    Started containers listen on their published port on localhost.
+    """
+
+    def __init__(self, socket: Path, memory: int = 8 * 1024**3) -> None:
+        self.socket = str(socket)
+        self.memory = memory
+        self.containers: dict[str, FakeContainer] = {}
+        self.requests: list[str] = []
+        self._server = uvicorn.Server(
+            uvicorn.Config(self._create_app(), uds=self.socket, log_level="warning")
+        )
+        self._task: asyncio.Task[None] | None = None
+
+    async def __aenter__(self) -> "DockerDaemonFake":
+        self._task = asyncio.create_task(self._server.serve())
+        while not self._server.started:
+            await asyncio.sleep(0.01)
+
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: Type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        for container in self.containers.values():
+            await container.stop()
+
+        self._server.should_exit = True
+        if self._task is not None:
+            await self._task
+
+    def running(self) -> list[FakeContainer]:
+        return [c for c in self.containers.values() if c.running]
+
+    def _find(self, container_id: str) -> FakeContainer | None:
+        for container in self.containers.values():
+            if container.id.startswith(container_id) or container.name == container_id:
+                return container
+
+        return None
+
+    async def _remove(self, container: FakeContainer) -> None:
+        await container.stop()
+        self.containers.pop(container.id, None)
+
+    def _create_app(self) -> FastAPI:
+        app = FastAPI()
+
+        @app.middleware("http")
+        async def record(request: Request, call_next: Any) -> Response:
+            self.requests.append(f"{request.method} {request.url.path}")
+            response: Response = await call_next(request)
+            return response
+
+        @app.get("/{version}/info")
+        async def info() -> Response:
+            return JSONResponse(
+                {"MemTotal": self.memory, "ContainersRunning": len(self.running())}
+            )
+
+        @app.post("/{version}/containers/create")
+        async def create(name: str, request: Request) -> Response:
+            if any(c.name == name for c in self.containers.values()):
+                return JSONResponse({"message": "Conflict"}, status_code=409)
+
+            container = FakeContainer(name, await request.json())
+            self.containers[container.id] = container
+            return JSONResponse({"Id": container.id, "Warnings": []}, status_code=201)
+
+        @app.post("/{version}/containers/{container_id}/start")
+        async def start(container_id: str) -> Response:
+            container = self._find(container_id)
+            if container is None:
+                return _not_found(container_id)
+
+            try:
+                await container.start()
+            except OSError:
+                return JSONResponse(
+                    {
+                        "message": "driver failed programming external connectivity: "
+                        f"Bind for 0.0.0.0:{container.host_port} failed: "
+                        "port is already allocated"
+                    },
+                    status_code=500,
+                )
+
+            return Response(status_code=204)
+
+        @app.post("/{version}/containers/{container_id}/stop")
+        @app.post("/{version}/containers/{container_id}/kill")
+        async def stop(container_id: str) -> Response:
+            container = self._find(container_id)
+            if container is None:
+                return _not_found(container_id)
+
+            if container.config["HostConfig"]["AutoRemove"]:
+                await self._remove(container)
+            else:
+                await container.stop()
+
+            return Response(status_code=204)
+
+        @app.post("/{version}/containers/{container_id}/pause")
+        @app.post("/{version}/containers/{container_id}/unpause")
+        async def pause(container_id: str, request: Request) -> Response:
+            container = self._find(container_id)
+            if container is None:
+                return _not_found(container_id)
+
+            pausing = request.url.path.endswith("/pause")
+            if container.paused == pausing or not container.running:
+                return JSONResponse({"message": "Conflict"}, status_code=409)
+
+            container.paused = pausing
+            return Response(status_code=204)
+
+        @app.delete("/{version}/containers/{container_id}")
+        async def remove(container_id: str) -> Response:
+            container = self._find(container_id)
+            if container is None:
+                return _not_found(container_id)
+
+            await self._remove(container)
+            return Response(status_code=204)
+
+        @app.get("/{version}/containers/{container_id}/json")
+        async def inspect(container_id: str) -> Response:
+            container = self._find(container_id)
+            if container is None:
+                return _not_found(container_id)
+
+            return JSONResponse(
+                {
+                    "Id": container.id,
+                    "Name": "/" + container.name,
+                    "State": {
+                        "Running": container.running,
+                        "Paused": container.paused,
+                    },
+                }
+            )
+
+        @app.get("/{version}/containers/json")
+        async def containers(filters: str = "{}", all: bool = False) -> Response:
+            ids = json.loads(filters).get("id", [])
+            listed = [
+                {"Id": c.id, "Names": ["/" + c.name]}
+                for c in self.containers.values()
+                if (all or c.running) and (not ids or any(c.id.startswith(i) for i in ids))
+            ]
+            return JSONResponse(listed)
+
+        return app
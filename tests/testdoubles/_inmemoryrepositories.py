@@ -1,7 +1,7 @@
 from typing import Collection, NamedTuple
 
-from ocrdbrowser import OcrdBrowser
-from ocrdmonitor.protocols import BrowserRestoringFactory, OcrdJob
+from ocrdbrowser import OcrdBrowser, PlacedBrowser
+from ocrdmonitor.protocols import BrowserRestoringFactory, JobPage, OcrdJob
 
 from ._browserspy import BrowserSpy
 
@@ -18,19 +18,30 @@ class InMemoryBrowserProcessRepository:
         self, restoring_factory: BrowserRestoringFactory | None = None
     ) -> None:
         self._processes: list[BrowserEntry] = []
+        self._hibernating: set[BrowserEntry] = set()
+        self._hosts: dict[BrowserEntry, str | None] = {}
         self.restoring_factory: BrowserRestoringFactory = (
             restoring_factory or BrowserSpy
         )
 
-    async def insert(self, browser: OcrdBrowser) -> None:
+    async def insert(self, browser: OcrdBrowser) -> bool:
         entry = BrowserEntry(
             browser.owner(),
             browser.workspace(),
             browser.address(),
             browser.process_id(),
         )
+        if any(
+            (process.owner, process.workspace) == (entry.owner, entry.workspace)
+            for process in self._processes
+        ):
+            return False
 
         self._processes.append(entry)
+        self._hosts[entry] = (
+            browser.host() if isinstance(browser, PlacedBrowser) else None
+        )
+        return True
 
     async def delete(self, browser: OcrdBrowser) -> None:
         entry = BrowserEntry(
@@ -41,6 +52,23 @@ class InMemoryBrowserProcessRepository:
         )
 
         self._processes.remove(entry)
+        self._hibernating.discard(entry)
+        self._hosts.pop(entry, None)
+
+    async def set_hibernating(self, browser: OcrdBrowser, hibernating: bool) -> None:
+        entry = BrowserEntry(
+            browser.owner(),
+            browser.workspace(),
+            browser.address(),
+            browser.process_id(),
+        )
+        if entry not in self._processes:
+            return
+
+        if hibernating:
+            self._hibernating.add(entry)
+        else:
+            self._hibernating.discard(entry)
 
     async def find(
         self,
@@ -64,6 +92,8 @@ class InMemoryBrowserProcessRepository:
                 owner=browser.owner,
                 workspace=browser.workspace,
                 address=browser.address,
+                hibernating=browser in self._hibernating,
+                host=self._hosts.get(browser),
             )
             for browser in self._processes
             if match(browser)
@@ -73,6 +103,14 @@ class InMemoryBrowserProcessRepository:
         results = await self.find(owner=owner, workspace=workspace)
         return next(iter(results), None)
 
+    async def find_containing(self, *, owner: str, path: str) -> OcrdBrowser | None:
+        containing = [
+            browser
+            for browser in await self.find(owner=owner)
+            if path == browser.workspace() or path.startswith(browser.workspace() + "/")
+        ]
+        return max(containing, key=lambda browser: len(browser.workspace()), default=None)
+
     async def count(self) -> int:
         return len(self._processes)
 
@@ -86,3 +124,29 @@ class InMemoryJobRepository:
 
     async def find_all(self) -> list[OcrdJob]:
         return list(self._jobs)
+
+    async def find_running(
+        self, *, cursor: str | None = None, limit: int = 100
+    ) -> JobPage:
+        running = sorted(
+            (job for job in self._jobs if job.is_running),
+            key=lambda job: (job.time_created is not None, job.time_created or 0),
+        )
+        return _page(running, cursor, limit)
+
+    async def find_completed(
+        self, *, cursor: str | None = None, limit: int = 100
+    ) -> JobPage:
+        completed = sorted(
+            (job for job in self._jobs if job.is_completed),
+            key=lambda job: (job.time_terminated is not None, job.time_terminated or 0),
+            reverse=True,
+        )
+        return _page(completed, cursor, limit)
+
+
+def _page(jobs: list[OcrdJob], cursor: str | None, limit: int) -> JobPage:
+    # the cursor is simply the offset of the next page
+    start = int(cursor or 0)
+    end = start + limit
+    return JobPage(jobs[start:end], str(end) if end < len(jobs) else None)
@@ -48,7 +48,13 @@ class RestoringRegistryBrowserFactory:
         self._registry = browser_registry
 
     def __call__(
-        self, owner: str, workspace: str, address: str, process_id: str
+        self,
+        owner: str,
+        workspace: str,
+        address: str,
+        process_id: str,
+        hibernating: bool = False,
+        host: str | None = None,
     ) -> BrowserTestDouble:
         browser = self._registry[address]
         return browser